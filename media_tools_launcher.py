@@ -804,10 +804,8 @@ class MediaToolsLauncher:
                 if not script_path.exists():
                     raise FileNotFoundError(f"Script not found: {script_path}")
                 
-                # Change to the tool directory before running
-                original_cwd = os.getcwd()
+                # Run inside the tool directory (via cwd=, the launcher's own CWD is left alone)
                 tool_dir = script_path.parent
-                os.chdir(str(tool_dir))
                 
                 # Use virtual environment python if available
                 venv_python = current_dir / "venv" / "Scripts" / "python.exe"
@@ -820,12 +818,11 @@ class MediaToolsLauncher:
                 
                 # Launch without waiting for completion (non-blocking)
                 process = subprocess.Popen([python_exe, str(script_path.name)], 
+                                         cwd=str(tool_dir),
                                          stdout=subprocess.PIPE, 
                                          stderr=subprocess.PIPE,
                                          creationflags=subprocess.CREATE_NEW_CONSOLE if os.name == 'nt' else 0)
                 
-                os.chdir(original_cwd)
-                
                 # Show success message
                 def show_success():
                     self.show_snackbar(f"✅ {app_name.replace('_', ' ').title()} launched successfully!", ft.Colors.GREEN)
@@ -1071,12 +1068,8 @@ if __name__ == "__main__":
             current_dir = Path(__file__).parent
             batch_path = current_dir / "yt-batch-downloader" / "batch_downloader_gui.py"
             if batch_path.exists():
-                import os
-                original_cwd = os.getcwd()
-                os.chdir(str(batch_path.parent))
                 import subprocess
-                subprocess.run([sys.executable, "batch_downloader_gui.py"])
-                os.chdir(original_cwd)
+                subprocess.run([sys.executable, "batch_downloader_gui.py"], cwd=str(batch_path.parent))
             else:
                 print("❌ YouTube Batch Downloader GUI file tidak ditemukan")
         except Exception as e:
@@ -1087,12 +1080,8 @@ if __name__ == "__main__":
             current_dir = Path(__file__).parent
             playlist_path = current_dir / "yt-playlist-downloader" / "playlist_downloader_gui.py"
             if playlist_path.exists():
-                import os
-                original_cwd = os.getcwd()
-                os.chdir(str(playlist_path.parent))
                 import subprocess
-                subprocess.run([sys.executable, "playlist_downloader_gui.py"])
-                os.chdir(original_cwd)
+                subprocess.run([sys.executable, "playlist_downloader_gui.py"], cwd=str(playlist_path.parent))
             else:
                 print("❌ YouTube Playlist Downloader GUI file tidak ditemukan")
         except Exception as e:
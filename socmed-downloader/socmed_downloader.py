@@ -1,8 +1,28 @@
 import yt_dlp
+import contextlib
 import os
 import sys
 import re
 
+# The bandwidth cap shared with the other tools lives in the sibling
+# yt-batch-downloader folder, added to sys.path here (not by the launcher)
+_BATCH_DOWNLOADER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "yt-batch-downloader")
+if _BATCH_DOWNLOADER_DIR not in sys.path:
+    sys.path.append(_BATCH_DOWNLOADER_DIR)
+
+try:
+    from bandwidth import governor, set_bandwidth_limit
+except ImportError:
+    # Folder ini dipakai sendiri (tanpa yt-batch-downloader): tanpa batas bandwidth
+    class _NoBandwidthLimit:
+        def ydl_job(self, ydl):
+            return contextlib.nullcontext()
+
+    governor = _NoBandwidthLimit()
+
+    def set_bandwidth_limit(total_rate):
+        print("⚠️  Batas bandwidth butuh folder yt-batch-downloader, diabaikan")
+
 # --- KONFIGURASI BROWSER UNTUK FB/IG ---
 # Jika gagal download FB/IG karena minta login,
 # ubah nilai ini menjadi nama browser yang sedang kamu pakai login.
@@ -11,6 +31,16 @@ import re
 BROWSER_COOKIES = None 
 # Contoh jika pakai Chrome: BROWSER_COOKIES = 'chrome'
 
+# --- BATAS BANDWIDTH ---
+# Total kecepatan download untuk semua download yang berjalan, supaya
+# uplink tidak habis. Contoh: '5M' atau '500K'. None = tanpa batas
+# (bisa juga lewat environment variable MEDIA_TOOLS_BANDWIDTH_LIMIT).
+BANDWIDTH_LIMIT = None
+
+# File tersimpan di folder tempat skrip berada
+# (dipakai lewat opsi 'paths' yt-dlp, tanpa mengubah working directory)
+DOWNLOAD_FOLDER = os.path.dirname(os.path.abspath(__file__))
+
 
 def is_instagram_url(url):
     """Check if URL is from Instagram"""
@@ -97,6 +127,8 @@ def batch_download():
     if not file_path:
         print("❌ Path file kosong!")
         return
+    # Relative paths are relative to the script folder (where downloads go too)
+    file_path = os.path.join(DOWNLOAD_FOLDER, os.path.expanduser(file_path))
     
     try:
         from batch_reader import read_batch_file
@@ -153,7 +185,7 @@ def batch_download():
                 # Check if Instagram URL with image format - use instaloader
                 if format_type == 'image' and is_instagram_url(url):
                     print(f"[{i}/{len(links)}] Instagram image detected - using Instaloader")
-                    if download_instagram_images(url, os.getcwd()):
+                    if download_instagram_images(url, DOWNLOAD_FOLDER):
                         print(f"✅ [{i}/{len(links)}] Sukses!")
                         success_count += 1
                         continue
@@ -162,6 +194,7 @@ def batch_download():
                 
                 # Base options
                 ydl_opts = {
+                    'paths': {'home': DOWNLOAD_FOLDER},
                     'outtmpl': '%(title)s.%(ext)s',
                     'progress_hooks': [progress_hook],
                     'ignoreerrors': True,
@@ -211,7 +244,8 @@ def batch_download():
                     info = ydl.extract_info(url, download=False)
                     title = info.get('title', 'Unknown')
                     print(f"[Downloading] {title}")
-                    ydl.download([url])
+                    with governor.ydl_job(ydl):
+                        ydl.download([url])
                 
                 print(f"✅ [{i}/{len(links)}] Sukses!")
                 success_count += 1
@@ -281,6 +315,9 @@ def run_downloader():
 
         # === Settingan Inti yt-dlp ===
         ydl_opts = {
+            # Folder output (absolut, tidak tergantung working directory)
+            'paths': {'home': DOWNLOAD_FOLDER},
+            
             # Nama file output: Judul Asli.Ekstensi
             'outtmpl': '%(title)s.%(ext)s', 
             
@@ -314,7 +351,7 @@ def run_downloader():
             # Check if Instagram URL - use instaloader
             if is_instagram_url(url):
                 print("[Info] Instagram detected - using Instaloader for images")
-                success = download_instagram_images(url, os.getcwd())
+                success = download_instagram_images(url, DOWNLOAD_FOLDER)
                 if success:
                     continue
                 else:
@@ -365,8 +402,9 @@ def run_downloader():
                 print(f"[Target Detect] Situs: {site} | Judul: {judul}")
                 print("Sedang mendownload...")
                 
-                # Lakukan download
-                ydl.download([url])
+                # Lakukan download (dengan jatah dari batas bandwidth total)
+                with governor.ydl_job(ydl):
+                    ydl.download([url])
                 
             print(f"\n✅ SUKSES! File tersimpan di folder ini.")
             
@@ -377,6 +415,6 @@ def run_downloader():
 
 # Agar skrip hanya jalan jika dieksekusi langsung, bukan di-import
 if __name__ == "__main__":
-    # Memastikan file tersimpan di folder tempat skrip berada
-    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    if BANDWIDTH_LIMIT:
+        set_bandwidth_limit(BANDWIDTH_LIMIT)
     run_downloader()
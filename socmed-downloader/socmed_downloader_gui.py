@@ -1,5 +1,6 @@
 import flet as ft
 import yt_dlp
+import contextlib
 import os
 import sys
 import threading
@@ -7,6 +8,22 @@ import time
 import re
 from pathlib import Path
 
+# The bandwidth cap shared with the other tools lives in the sibling
+# yt-batch-downloader folder, added to sys.path here (not by the launcher)
+_BATCH_DOWNLOADER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "yt-batch-downloader")
+if _BATCH_DOWNLOADER_DIR not in sys.path:
+    sys.path.append(_BATCH_DOWNLOADER_DIR)
+
+try:
+    from bandwidth import governor
+except ImportError:
+    # Folder ini dipakai sendiri (tanpa yt-batch-downloader): tanpa batas bandwidth
+    class _NoBandwidthLimit:
+        def ydl_job(self, ydl):
+            return contextlib.nullcontext()
+
+    governor = _NoBandwidthLimit()
+
 
 def is_instagram_url(url):
     """Check if URL is from Instagram"""
@@ -858,11 +875,9 @@ class SocMedDownloaderGUI:
                 self.page.update()
                 return
             
-            # Change to download folder
-            os.chdir(self.download_folder)
-            
-            # Base options
+            # Base options (output folder per job, no chdir)
             ydl_opts = {
+                'paths': {'home': self.download_folder},
                 'outtmpl': '%(title)s.%(ext)s',
                 'progress_hooks': [self.progress_hook],
                 'ignoreerrors': True,
@@ -954,7 +969,8 @@ class SocMedDownloaderGUI:
                     "⏬ Downloading...",
                     ft.Colors.BLUE_700
                 )
-                ydl.download([url])
+                with governor.ydl_job(ydl):
+                    ydl.download([url])
             
             # Success
             self.progress_bar.value = 1.0
@@ -1028,9 +1044,6 @@ class SocMedDownloaderGUI:
                 self.page.update()
                 return
             
-            # Change to download folder
-            os.chdir(self.download_folder)
-            
             # Process each link
             total = len(links)
             success_count = 0
@@ -1060,8 +1073,9 @@ class SocMedDownloaderGUI:
                         else:
                             self.log_output(f"[{i}/{total}] ⚠️ Falling back to yt-dlp...")
                     
-                    # Base options
+                    # Base options (output folder per job, no chdir)
                     ydl_opts = {
+                        'paths': {'home': self.download_folder},
                         'outtmpl': '%(title)s.%(ext)s',
                         'progress_hooks': [self.progress_hook],
                         'ignoreerrors': True,
@@ -1117,7 +1131,7 @@ class SocMedDownloaderGUI:
                         ydl_opts['cookiesfrombrowser'] = (cookies_choice,)
                     
                     # Download
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    with yt_dlp.YoutubeDL(ydl_opts) as ydl, governor.ydl_job(ydl):
                         ydl.download([url])
                     
                     success_count += 1
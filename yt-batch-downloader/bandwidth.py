@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Bandwidth Governor
+Batas bandwidth total untuk semua download yt-dlp yang berjalan di proses ini.
+Total rate dibagi ke job yang aktif dan dibagi ulang setiap ada job yang
+mulai atau selesai, jadi beberapa batch/playlist/socmed job sekaligus tidak
+menghabiskan seluruh uplink. Jumlah semua jatah tidak pernah melebihi total;
+job baru menunggu kalau sisa jatah sudah habis.
+
+Catatan: download fragmented (DASH/HLS) di dalam proses memakai rate saat
+fragment download dimulai. FragmentFD yt-dlp menyalin params ke downloader
+fragment-nya, jadi pembagian ulang baru berlaku untuk download berikutnya.
+"""
+
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Callable, Union
+
+# Total limit for the whole process, e.g. "5M" (bytes per second, like --limit-rate)
+BANDWIDTH_ENV_VAR = "MEDIA_TOOLS_BANDWIDTH_LIMIT"
+
+# No job is throttled below this, even when many run at once (bytes/s)
+MIN_JOB_RATE = 32 * 1024
+
+_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+_RATE_RE = re.compile(r'^([\d.]+)\s*([KMG]?)I?B?(?:/S)?$')
+
+
+def parse_rate(value: Union[str, int, float, None]) -> Optional[int]:
+    """
+    Parse a rate like yt-dlp's --limit-rate ("500K", "4.2M", 1048576)
+
+    Returns:
+        Bytes per second, or None for empty/zero (= unlimited)
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value) if value > 0 else None
+
+    text = value.strip().upper()
+    if not text:
+        return None
+    match = _RATE_RE.match(text)
+    try:
+        rate = int(float(match.group(1)) * _UNITS[match.group(2)])
+    except (AttributeError, ValueError):
+        raise ValueError(f"Format bandwidth tidak valid: {value}")
+    return rate if rate > 0 else None
+
+
+def format_rate(rate: Optional[int]) -> str:
+    """Human readable rate for console output"""
+    if not rate:
+        return "tanpa batas"
+    if rate >= 1024 ** 2:
+        return f"{rate / 1024 ** 2:.1f} MB/s"
+    return f"{rate / 1024:.0f} KB/s"
+
+
+class BandwidthGovernor:
+    """
+    Divides a total download rate among the active jobs (thread-safe)
+
+    Jobs that can change their limit while running (in-process YoutubeDL)
+    register an apply callback and are rebalanced live. Jobs that cannot
+    (a yt-dlp subprocess) get a fixed share of the still unallocated budget
+    when they start, sized by the expected concurrency (see expect()); the
+    live jobs split whatever the fixed jobs leave. A job that would push the
+    sum over total_rate waits in register() until a running job finishes.
+    Lowering the total does not shrink fixed shares that were already handed
+    out; it applies to jobs started afterwards.
+    """
+
+    def __init__(self, total_rate: Optional[int] = None):
+        self.total_rate = total_rate
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        # Concurrent jobs announced by the running pools (see expect())
+        self._expected = 0
+        self._next_token = 0
+        # token -> apply callback (None for fixed-rate jobs)
+        self._jobs: Dict[int, Optional[Callable[[Optional[int]], None]]] = {}
+        # token -> current allocation
+        self._allocations: Dict[int, Optional[int]] = {}
+
+    def set_total_rate(self, total_rate: Union[str, int, None]):
+        """Change the total limit (None/0 = unlimited) and rebalance running jobs"""
+        with self._lock:
+            self.total_rate = parse_rate(total_rate)
+            # Fixed jobs keep the share they started with, unless the cap is lifted
+            if self.total_rate is None:
+                for token in self._allocations:
+                    self._allocations[token] = None
+            self._rebalance()
+            self._released.notify_all()
+
+    @contextmanager
+    def expect(self, jobs: int):
+        """
+        Announce a pool of up to jobs concurrent downloads for a with-block
+
+        Fixed-rate jobs then get total_rate / (expected jobs) each instead of
+        the whole remaining budget, so the pool's later jobs are not starved.
+        """
+        with self._lock:
+            self._expected += jobs
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._expected -= jobs
+
+    def _min_rate(self) -> int:
+        """Smallest share a job is started with (caller holds the lock)"""
+        return min(MIN_JOB_RATE, self.total_rate)
+
+    def _fixed_total(self) -> int:
+        """Bandwidth held by fixed-rate jobs (caller holds the lock)"""
+        return sum(rate or 0 for token, rate in self._allocations.items()
+                   if self._jobs.get(token) is None)
+
+    def _live_count(self) -> int:
+        return sum(1 for apply in self._jobs.values() if apply is not None)
+
+    def _fixed_share(self) -> Optional[int]:
+        """
+        Share for a new fixed-rate job, None if the budget is used up
+        (caller holds the lock)
+        """
+        # Every live job keeps at least the minimum rate
+        available = self.total_rate - self._fixed_total() - self._min_rate() * self._live_count()
+        if available < self._min_rate():
+            return None
+        slots = max(1, self._expected, len(self._jobs) + 1)
+        return max(self._min_rate(), min(available, self.total_rate // slots))
+
+    def _live_fits(self) -> bool:
+        """Whether one more live job keeps every live share at the minimum (lock held)"""
+        return (self.total_rate - self._fixed_total()
+                >= self._min_rate() * (self._live_count() + 1))
+
+    def register(self, apply: Optional[Callable[[Optional[int]], None]] = None) -> int:
+        """
+        Add an active job
+
+        Args:
+            apply: Called with the job's new rate (bytes/s or None) whenever
+                   it changes. Omit for jobs whose limit is fixed at start.
+
+        Returns:
+            Token for allocation() and unregister()
+        """
+        with self._lock:
+            share = None
+            while self.total_rate:
+                if apply is None:
+                    share = self._fixed_share()
+                    if share is not None:
+                        break
+                elif self._live_fits():
+                    break
+                # Budget used up: wait for a running job to give its share back
+                self._released.wait()
+            if not self.total_rate:
+                share = None
+            token = self._next_token
+            self._next_token += 1
+            self._jobs[token] = apply
+            self._allocations[token] = share if apply is None else None
+            self._rebalance()
+            return token
+
+    def unregister(self, token: int):
+        """Remove a finished job, its bandwidth goes to the remaining live jobs"""
+        with self._lock:
+            self._jobs.pop(token, None)
+            self._allocations.pop(token, None)
+            self._rebalance()
+            self._released.notify_all()
+
+    def allocation(self, token: int) -> Optional[int]:
+        """Current rate of a job (None = unlimited)"""
+        with self._lock:
+            return self._allocations.get(token)
+
+    def active_jobs(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def _rebalance(self):
+        """Split the total among live jobs (caller holds the lock)"""
+        live = [token for token, apply in self._jobs.items() if apply is not None]
+        if not live:
+            return
+
+        if self.total_rate:
+            share = max(self._min_rate(), (self.total_rate - self._fixed_total()) // len(live))
+        else:
+            share = None
+
+        for token in live:
+            if self._allocations.get(token) != share or share is None:
+                self._allocations[token] = share
+                try:
+                    self._jobs[token](share)
+                except Exception as e:
+                    print(f"⚠️  Gagal mengubah batas bandwidth job: {e}")
+
+    @contextmanager
+    def job(self, apply: Optional[Callable[[Optional[int]], None]] = None):
+        """Register a job for the duration of a with-block, yields its starting rate"""
+        token = self.register(apply)
+        try:
+            yield self.allocation(token)
+        finally:
+            self.unregister(token)
+
+    def ydl_job(self, ydl):
+        """
+        Govern a yt_dlp.YoutubeDL instance for the duration of a with-block
+
+        yt-dlp reads params['ratelimit'] on every chunk, so changing it
+        rebalances a download that is already running.
+        """
+        user_limit = ydl.params.get('ratelimit')
+
+        def apply(rate):
+            if rate and user_limit:
+                rate = min(rate, user_limit)
+            if rate or user_limit:
+                ydl.params['ratelimit'] = rate or user_limit
+            else:
+                ydl.params.pop('ratelimit', None)
+
+        @contextmanager
+        def governed():
+            try:
+                with self.job(apply) as rate:
+                    yield rate
+            finally:
+                apply(None)
+        return governed()
+
+
+# Process-wide governor shared by BatchDownloader, PlaylistDownloader and socmed
+governor = BandwidthGovernor(parse_rate(os.environ.get(BANDWIDTH_ENV_VAR)))
+
+
+def set_bandwidth_limit(total_rate: Union[str, int, None]):
+    """Set the process-wide bandwidth limit ("5M", bytes/s, or None = unlimited)"""
+    governor.set_total_rate(total_rate)
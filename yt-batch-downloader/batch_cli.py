@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Batch Downloader CLI (headless)
+Versi non-interaktif dari batch_downloader.py untuk cron, supervisor, atau
+tooling lain. Semua opsi lewat argumen; stdout hanya berisi event JSON per
+baris (NDJSON), log biasa ke stderr. Exit code menunjukkan hasil batch.
+
+Contoh:
+    python batch_cli.py -o ~/Downloads/yt -a urls.txt -j 4
+    python batch_cli.py -o music --audio --audio-format native URL1 URL2
+    python batch_cli.py -o ~/Downloads/yt --resume --retry-rounds 2
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from typing import Optional, Dict, Any, List
+
+# Exit codes
+EXIT_OK = 0          # Every item succeeded (or was already in the archive)
+EXIT_PARTIAL = 1     # Some items failed
+EXIT_USAGE = 2       # Invalid arguments (also used by argparse)
+EXIT_FAILED = 3      # Nothing succeeded
+EXIT_SETUP = 4       # yt-dlp missing, folder/archive/URL file not usable
+EXIT_INTERRUPTED = 130
+
+
+class EventWriter:
+    """Write one JSON object per line to a stream (thread-safe)"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Dict[str, Any]):
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+    def emit(self, event: str, **fields):
+        self({'event': event, 'time': time.time(), **fields})
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Headless YouTube batch downloader (NDJSON events on stdout)",
+        epilog=f"Exit codes: {EXIT_OK}=ok, {EXIT_PARTIAL}=sebagian gagal, {EXIT_USAGE}=argumen salah, "
+               f"{EXIT_FAILED}=semua gagal, {EXIT_SETUP}=setup error, {EXIT_INTERRUPTED}=dihentikan")
+    parser.add_argument('urls', nargs='*', help="URL video")
+    parser.add_argument('-a', '--url-file', '--batch-file',
+                        help="File berisi satu URL per baris ('-' = stdin), seperti -a/--batch-file yt-dlp")
+    parser.add_argument('-o', '--output', required=True, help="Folder download")
+
+    fmt = parser.add_argument_group("format")
+    fmt.add_argument('--audio', action='store_true', help="Download audio saja")
+    fmt.add_argument('-q', '--quality', default="best", help="Kualitas video: best, 720p, 480p, ...")
+    fmt.add_argument('--audio-format', default="mp3",
+                     help="mp3, m4a, opus, ... atau native (tanpa re-encode)")
+    fmt.add_argument('--audio-quality', default="0", help="0 (terbaik) - 9")
+    fmt.add_argument('--transcode-policy', default="compatible", choices=["compatible", "always"])
+    fmt.add_argument('-t', '--template', default="%(title)s.%(ext)s", help="Template nama file")
+    fmt.add_argument('--auto-numbering', action='store_true', help="Tambah nomor urut di nama file")
+    fmt.add_argument('--no-thumbnail', action='store_true', help="Jangan embed thumbnail")
+    fmt.add_argument('--no-metadata', action='store_true', help="Jangan tambah metadata")
+
+    run = parser.add_argument_group("eksekusi")
+    run.add_argument('-j', '--workers', type=int, default=None,
+                     help="Download paralel (default: otomatis, 1 = berurutan)")
+    run.add_argument('--engine', default="auto", choices=["auto", "inprocess", "subprocess"])
+    run.add_argument('--fragments', default="auto", help="--concurrent-fragments: auto atau angka")
+    run.add_argument('--limit-rate', default=None, help="Batas bandwidth total, mis. 5M")
+    run.add_argument('--schedule', default="fifo", help="fifo, shortest, largest, round-robin")
+    run.add_argument('--stop-on-error', action='store_true', help="Berhenti di error pertama")
+
+    retry = parser.add_argument_group("retry")
+    retry.add_argument('--retry-rounds', type=int, default=0,
+                       help="Ulangi item yang gagal (error sementara) sebanyak N putaran setelah batch")
+    retry.add_argument('--retry-delay', type=float, default=30,
+                       help="Jeda sebelum putaran retry pertama (detik, dobel tiap putaran)")
+    retry.add_argument('--transient-retries', type=int, default=None,
+                       help="Retry langsung di dalam batch untuk error sementara (default: 2)")
+    retry.add_argument('--retry-backoff', type=float, default=None,
+                       help="Backoff awal retry di dalam batch (detik, dobel tiap retry)")
+    retry.add_argument('--retry-permanent', action='store_true',
+                       help="Coba lagi item yang sebelumnya gagal permanen (private, dihapus, ...)")
+    retry.add_argument('--stall-rate', default=None,
+                       help="Batas throughput minimum, mis. 20K (0 = watchdog mati)")
+    retry.add_argument('--stall-timeout', type=float, default=None,
+                       help="Detik di bawah --stall-rate sebelum job diantrikan ulang")
+
+    state = parser.add_argument_group("state")
+    state.add_argument('--archive', default=None, help="File download archive (default: di folder output)")
+    state.add_argument('--no-archive', action='store_true', help="Jangan skip/rekam download di archive")
+    state.add_argument('--no-journal', action='store_true', help="Tanpa job journal (tidak bisa di-resume)")
+    state.add_argument('--resume', action='store_true',
+                       help="Lanjutkan batch yang terputus di folder output (journal)")
+
+    log = parser.add_argument_group("output")
+    log.add_argument('--log-file', default=None, help="Tulis log ke file, bukan stderr")
+    log.add_argument('--quiet', action='store_true', help="Buang log, hanya event JSON")
+    return parser
+
+
+def batch_options(args) -> Dict[str, Any]:
+    """Options dict of batch_download_videos / batch_download_audio"""
+    options = {
+        'output_template': args.template,
+        'auto_numbering': args.auto_numbering,
+        'continue_on_error': not args.stop_on_error,
+        'embed_thumbnail': not args.no_thumbnail,
+        'embed_metadata': not args.no_metadata,
+    }
+    if args.audio:
+        options.update(audio_format=args.audio_format, audio_quality=args.audio_quality,
+                       transcode_policy=args.transcode_policy)
+    else:
+        options['quality'] = args.quality
+    return options
+
+
+def configure(downloader, args) -> bool:
+    """Apply the CLI settings, False if one of them is invalid"""
+    if not downloader.set_download_folder(args.output):
+        return False
+    if args.archive and not args.no_archive and not downloader.set_archive(args.archive):
+        return False
+    if args.transient_retries is not None:
+        downloader.max_transient_retries = max(0, args.transient_retries)
+    if args.retry_backoff is not None:
+        downloader.retry_backoff = max(0.0, args.retry_backoff)
+    downloader.skip_permanent_failures = not args.retry_permanent
+    settings = [downloader.set_fragment_concurrency(args.fragments),
+                downloader.set_schedule_policy(args.schedule)]
+    if args.limit_rate:
+        settings.append(downloader.set_bandwidth_limit(args.limit_rate))
+    if args.stall_rate is not None or args.stall_timeout is not None:
+        settings.append(downloader.set_stall_detection(
+            args.stall_rate if args.stall_rate is not None else downloader.stall_min_rate,
+            args.stall_timeout))
+    return all(settings)
+
+
+def run_batch(downloader, args, mode: str) -> Dict[str, int]:
+    """First pass: resume the journal, stream the URL file, or download the given URLs"""
+    if args.resume:
+        return downloader.resume_batch(max_workers=args.workers)
+
+    options = batch_options(args)
+    # A plain URL file can be streamed: downloads start while it is still being read
+    if args.url_file and args.url_file != '-' and not args.urls and downloader.schedule_policy == 'fifo':
+        return downloader.batch_download_from_file(args.url_file, mode, max_workers=args.workers,
+                                                   **options)
+
+    downloader.clear_url_list()
+    if args.url_file == '-':
+        downloader.ingest_urls(sys.stdin)
+    elif args.url_file:
+        downloader.add_urls_from_file(args.url_file)
+    downloader.add_urls_from_list(args.urls)
+
+    if mode == "audio":
+        return downloader.batch_download_audio(max_workers=args.workers, **options)
+    return downloader.batch_download_videos(max_workers=args.workers, **options)
+
+
+def retry_failed(downloader, args, mode: str):
+    """Run the failed items again (same numbers when the batch has a journal)"""
+    if downloader.use_journal and downloader.get_resumable_batch(include_failed=True):
+        # The journal still knows the items that succeeded, so the totals stay complete
+        downloader.resume_batch(retry_failed=True, max_workers=args.workers)
+        return
+
+    failed = downloader.retryable_failures()
+    permanent = [url for url in downloader.failed_downloads if url not in failed]
+    succeeded = list(downloader.successful_downloads)
+    skipped = list(downloader.skipped_downloads)
+    downloader.clear_url_list()
+    downloader.add_urls_from_list(failed)
+    options = batch_options(args)
+    if mode == "audio":
+        downloader.batch_download_audio(max_workers=args.workers, **options)
+    else:
+        downloader.batch_download_videos(max_workers=args.workers, **options)
+    downloader.successful_downloads[:0] = succeeded
+    downloader.skipped_downloads[:0] = skipped
+    downloader.failed_downloads[:0] = permanent
+
+
+def exit_code(succeeded: int, failed: int) -> int:
+    if failed == 0:
+        return EXIT_OK
+    return EXIT_PARTIAL if succeeded else EXIT_FAILED
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not (args.urls or args.url_file or args.resume):
+        parser.error("berikan URL, --url-file atau --resume")
+    if args.retry_rounds < 0:
+        parser.error("--retry-rounds harus >= 0")
+
+    # stdout carries only events; everything the downloader prints goes to the log
+    events = EventWriter(sys.stdout)
+    if args.quiet:
+        log = open(os.devnull, 'w', encoding='utf-8')
+    elif args.log_file:
+        log = open(args.log_file, 'a', encoding='utf-8')
+    else:
+        log = sys.stderr
+    sys.stdout = log
+
+    try:
+        from batch_downloader import BatchDownloader
+
+        downloader = BatchDownloader(engine=args.engine, use_archive=not args.no_archive,
+                                     use_journal=not args.no_journal)
+        if not downloader.yt_dlp_available:
+            events.emit('error', message="yt-dlp tidak tersedia")
+            return EXIT_SETUP
+        if not configure(downloader, args):
+            events.emit('error', message="konfigurasi tidak valid, lihat log")
+            return EXIT_SETUP
+        if args.url_file and args.url_file != '-' and not os.path.isfile(args.url_file):
+            events.emit('error', message=f"file tidak ditemukan: {args.url_file}")
+            return EXIT_SETUP
+
+        mode = "audio" if args.audio else "video"
+        if args.resume:
+            pending = downloader.get_resumable_batch()
+            if pending is None:
+                events.emit('error', message="tidak ada batch yang bisa dilanjutkan")
+                return EXIT_SETUP
+            mode = pending['mode']
+
+        downloader.event_callback = events
+        started = time.time()
+        events.emit('batch_started', mode=mode, folder=str(downloader.download_folder))
+
+        run_batch(downloader, args, mode)
+        for round_number in range(1, args.retry_rounds + 1):
+            if not downloader.retryable_failures():
+                # Nothing left but permanent failures (private, removed, geo-blocked...)
+                break
+            delay = args.retry_delay * 2 ** (round_number - 1)
+            events.emit('retry_round', round=round_number, failed=len(downloader.failed_downloads),
+                        delay=delay)
+            time.sleep(delay)
+            retry_failed(downloader, args, mode)
+
+        succeeded = len(downloader.successful_downloads)
+        failed = len(downloader.failed_downloads)
+        code = exit_code(succeeded, failed)
+        events.emit('batch_finished', success=succeeded, failed=failed,
+                    skipped=len(downloader.skipped_downloads),
+                    elapsed=round(time.time() - started, 3), exit_code=code,
+                    failed_urls={url: downloader.download_errors.get(url, '')
+                                 for url in downloader.failed_downloads},
+                    permanent_failures=[url for url in downloader.failed_downloads
+                                        if url not in downloader.retryable_failures()])
+        return code
+    except KeyboardInterrupt:
+        events.emit('interrupted')
+        return EXIT_INTERRUPTED
+    finally:
+        sys.stdout = events.stream
+        if log is not sys.stderr:
+            log.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
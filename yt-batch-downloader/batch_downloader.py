@@ -17,17 +17,170 @@ import os
 import subprocess
 import sys
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Iterable
 import json
 import time
+import queue
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ytdlp_engine import create_engine, InProcessEngine, option_value, replace_option
+from postprocess_stage import PostProcessStage, split_postprocess_args
+from rate_limiter import AdaptiveRateLimiter, rate_key
+from download_archive import DownloadArchive, ARCHIVE_FILENAME
+from url_utils import parse_video_key, UrlList
+from metadata_cache import MetadataCache, summarize_info, DEFAULT_TTL
+from fragment_tuner import (AUTO as AUTO_FRAGMENTS, FragmentThroughput, fragment_args,
+                            parse_fragment_setting, tuner as fragment_tuner)
+from bandwidth import set_bandwidth_limit, governor, format_rate, parse_rate
+from job_journal import JobJournal, JOURNAL_FILENAME, QUEUED, RUNNING, DONE, FAILED
+from stall_watchdog import StallWatchdog, DEFAULT_MIN_RATE, DEFAULT_STALL_TIMEOUT
+from scheduler import FIFO, POLICIES, parse_policy, order_items
+from failure_classifier import classify_failure, is_permanent, backoff_delay, describe as describe_failure
+
+# Upper bound for the automatic worker count. Downloads are network bound,
+# so more workers than this mostly just fight over the same uplink.
+MAX_AUTO_WORKERS = 4
+
+# Streamed URL files are journaled and queued in chunks of this many URLs
+# (or whatever was read within STREAM_CHUNK_SECONDS)
+STREAM_CHUNK_SIZE = 500
+STREAM_CHUNK_SECONDS = 0.5
+
+
+# Audio format that keeps the source stream (opus/m4a/ogg): remuxed, never re-encoded
+NATIVE_AUDIO = "native"
+
+# Transcode policies for a fixed audio format
+TRANSCODE_ALWAYS = "always"          # Best source stream, converted to the target format
+TRANSCODE_COMPATIBLE = "compatible"  # Prefer a source stream the target can hold as-is
+
+# Source codecs (yt-dlp acodec prefixes) each --audio-format keeps without re-encoding
+AUDIO_FORMAT_CODECS = {
+    'm4a': ('mp4a', 'aac'),
+    'aac': ('mp4a', 'aac'),
+    'opus': ('opus',),
+    'vorbis': ('vorbis',),
+    'mp3': ('mp3',),
+    'flac': ('flac',),
+    'alac': ('alac',),
+}
+
+
+def audio_format_selector(audio_format: str, transcode_policy: str = TRANSCODE_COMPATIBLE) -> str:
+    """
+    yt-dlp -f selector for an audio download
+    
+    With the compatible policy a stream whose codec the target format can hold
+    is preferred; yt-dlp then only copies it into the new container. Any other
+    stream is still transcoded, so the selector never fails.
+    """
+    codecs = AUDIO_FORMAT_CODECS.get(audio_format)
+    if audio_format == NATIVE_AUDIO or transcode_policy != TRANSCODE_COMPATIBLE or not codecs:
+        return 'bestaudio/best'
+    compatible = '/'.join(f'bestaudio[acodec^={codec}]' for codec in codecs)
+    return f'{compatible}/bestaudio/best'
+
+
+# Options of batch_download_videos / batch_download_audio (as stored in the job journal)
+VIDEO_BATCH_DEFAULTS = {
+    'quality': "best",
+    'output_template': "%(title)s.%(ext)s",
+    'auto_numbering': False,
+    'continue_on_error': True,
+    'embed_thumbnail': True,
+    'embed_metadata': True,
+}
+AUDIO_BATCH_DEFAULTS = {
+    'audio_format': "mp3",
+    'audio_quality': "0",
+    'transcode_policy': TRANSCODE_COMPATIBLE,
+    'output_template': "%(title)s.%(ext)s",
+    'auto_numbering': False,
+    'continue_on_error': True,
+    'embed_thumbnail': True,
+    'embed_metadata': True,
+}
+
+
+def default_worker_count() -> int:
+    """Pick a default number of parallel downloads based on CPU cores"""
+    return max(1, min(MAX_AUTO_WORKERS, os.cpu_count() or 1))
+
 
 class BatchDownloader:
-    def __init__(self):
+    def __init__(self, engine: str = "auto", use_archive: bool = True, use_journal: bool = True):
+        """
+        Args:
+            engine: yt-dlp engine - "inprocess" (reuse one YoutubeDL per worker),
+                    "subprocess" (one python process per URL) or "auto"
+            use_archive: Skip videos already recorded in the download archive
+            use_journal: Keep a crash-safe job journal so a batch can be resumed
+        """
         self.download_folder = None
+        self.use_archive = use_archive
+        self.use_journal = use_journal
+        # Journal of the running batch (None outside a batch)
+        self.journal = None
+        self.archive = None
+        self._archive_is_default = False
         self.yt_dlp_available = self._check_yt_dlp()
-        self.url_list = []
+        self.engine_name = engine
+        self.engine = create_engine(engine)
+        # Ordered, indexed by canonical (extractor, video_id)
+        self.url_list = UrlList()
         self.failed_downloads = []
         self.successful_downloads = []
+        # URLs skipped because the archive already has them (also counted as successful)
+        self.skipped_downloads = []
+        # Last yt-dlp error message per failed URL
+        self.download_errors: Dict[str, str] = {}
+        # --concurrent-fragments: "auto" (tuned from observed throughput) or a fixed count
+        self.fragment_concurrency = AUTO_FRAGMENTS
+        # Paces new downloads per host, shared by every worker of a batch
+        self.rate_limiter = AdaptiveRateLimiter()
+        # On-disk video metadata cache (opened on first use)
+        self.metadata_ttl = DEFAULT_TTL
+        self._metadata_cache = None
+        # Run ffmpeg post-processing (thumbnail, metadata, audio conversion) of a
+        # batch in a separate CPU-sized pool, overlapping with the next downloads
+        self.pipeline_postprocessing = True
+        self._pp_stage = None
+        # In-process when yt_dlp is importable (one YoutubeDL per pool thread)
+        self._pp_engine = None
+        # Fetch the video and audio stream of a bv+ba format at the same time and
+        # merge once both are on disk. None = only with the in-process engine
+        # (the subprocess engine pays extra yt-dlp start-ups per item)
+        self.parallel_streams: Optional[bool] = None
+        # Called with an event dict for every item transition of a batch
+        # (queued/started/progress/skipped/requeued/done/failed), see _emit
+        self.event_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+        # URL -> final file of successful downloads (when yt-dlp reported it)
+        self.download_paths: Dict[str, str] = {}
+        # Order of the batch queue (see scheduler.POLICIES)
+        self.schedule_policy = FIFO
+        # Stall watchdog: jobs below stall_min_rate (bytes/s) for stall_timeout seconds
+        # are killed and requeued at the back of the batch (None = disabled)
+        self.stall_min_rate = DEFAULT_MIN_RATE
+        self.stall_timeout = DEFAULT_STALL_TIMEOUT
+        self.max_stall_requeues = 2
+        # URL -> classification of its last failure (see failure_classifier),
+        # kept across clear_url_list so a new run still knows permanent failures
+        self.failure_classes: Dict[str, Dict[str, str]] = {}
+        # Transient failures are retried within the batch after an exponential
+        # backoff (retry_backoff, 2x, 4x ... seconds); permanent ones are not
+        self.max_transient_retries = 2
+        self.retry_backoff = 5.0
+        # Skip URLs that failed permanently before (archive or this session);
+        # after permanent_failure_ttl seconds such a URL is tried once more
+        self.skip_permanent_failures = True
+        self.permanent_failure_ttl = 30 * 24 * 3600
+        # Per worker thread state (e.g. whether an item went to the post-processing stage)
+        self._thread_state = threading.local()
+        # Guards the result lists when several workers download in parallel
+        self._lock = threading.Lock()
     
     def _check_yt_dlp(self) -> bool:
         """Check if yt-dlp is installed and available"""
@@ -48,6 +201,9 @@ class BatchDownloader:
             if result.returncode == 0:
                 print("yt-dlp berhasil diinstall/update!")
                 self.yt_dlp_available = True
+                # Pick up the in-process engine if yt_dlp was missing at start-up
+                if self.engine.name != "inprocess":
+                    self.engine = create_engine(self.engine_name)
                 return True
             else:
                 print(f"Error installing yt-dlp: {result.stderr}")
@@ -64,27 +220,139 @@ class BatchDownloader:
         try:
             self.download_folder = Path(folder_path)
             self.download_folder.mkdir(parents=True, exist_ok=True)
+            # Default archive lives in the download folder
+            if self.use_archive and (self.archive is None or self._archive_is_default):
+                self.set_archive(self.download_folder / ARCHIVE_FILENAME)
+                self._archive_is_default = True
             return True
         except Exception as e:
             print(f"Error creating folder: {e}")
             return False
     
+    def set_archive(self, archive_path) -> bool:
+        """Use a specific SQLite download archive file"""
+        try:
+            new_archive = DownloadArchive(archive_path)
+        except Exception as e:
+            print(f"Error opening archive: {e}")
+            return False
+        if self.archive is not None:
+            self.archive.close()
+        self.archive = new_archive
+        self._archive_is_default = False
+        return True
+    
+    def import_ytdlp_archive(self, archive_file: str, archive_format: str = "video:best") -> int:
+        """Import a yt-dlp --download-archive text file into the download archive"""
+        if self.archive is None:
+            print("Download archive belum di-set!")
+            return 0
+        try:
+            count = self.archive.import_ytdlp_archive(archive_file, archive_format)
+            print(f"✅ {count} entry diimport dari {archive_file}")
+            return count
+        except Exception as e:
+            print(f"Error importing archive: {e}")
+            return 0
+    
+    def _is_archived(self, url: str, archive_format: str) -> bool:
+        """Check the archive without recording anything"""
+        if not self.use_archive or self.archive is None:
+            return False
+        key = parse_video_key(url)
+        return key is not None and self.archive.is_downloaded(key[0], key[1], archive_format)
+    
+    def _check_archive(self, url: str, archive_format: str) -> bool:
+        """Return True (and mark the URL done) if the archive already has it"""
+        if not self._is_archived(url, archive_format):
+            return False
+        
+        print(f"⏭️  Sudah ada di archive, skip: {url}")
+        with self._lock:
+            self.successful_downloads.append(url)
+            self.skipped_downloads.append(url)
+        return True
+    
+    def _known_permanent_failure(self, url: str) -> Optional[Dict[str, Any]]:
+        """Earlier permanent failure of a URL (this session or the archive), if still valid"""
+        failure = self.failure_classes.get(url)
+        if is_permanent(failure):
+            return failure
+        if not self.use_archive or self.archive is None:
+            return None
+        key = parse_video_key(url)
+        if key is None:
+            return None
+        failure = self.archive.get_failure(key[0], key[1])
+        if not is_permanent(failure):
+            return None
+        if time.time() - (failure['last_attempt'] or 0) > self.permanent_failure_ttl:
+            return None
+        return failure
+    
+    def _check_permanent_failure(self, url: str) -> bool:
+        """Return True (and mark the URL failed) if it failed permanently before"""
+        if not self.skip_permanent_failures:
+            return False
+        failure = self._known_permanent_failure(url)
+        if failure is None:
+            return False
+        
+        print(f"⛔ Gagal permanen sebelumnya ({describe_failure(failure)}), skip: {url}")
+        with self._lock:
+            self.failed_downloads.append(url)
+            self.download_errors[url] = failure.get('error') or describe_failure(failure)
+            self.failure_classes[url] = {'category': failure['category'], 'reason': failure['reason']}
+        return True
+    
+    def _record_failure_class(self, url: str, error: str) -> Dict[str, str]:
+        """Classify a failed download and persist the class in the archive"""
+        failure = classify_failure(error)
+        with self._lock:
+            self.failure_classes[url] = failure
+        key = parse_video_key(url)
+        if self.use_archive and self.archive is not None and key is not None:
+            try:
+                self.archive.record_failure(key[0], key[1], failure['category'], failure['reason'], error)
+            except Exception as e:
+                print(f"⚠️  Gagal menyimpan failure ke archive: {e}")
+        return failure
+    
+    def retryable_failures(self) -> List[str]:
+        """Failed URLs worth another try (everything except permanent failures)"""
+        return [url for url in self.failed_downloads if not is_permanent(self.failure_classes.get(url))]
+    
+    def _record_archive(self, url: str, archive_format: str, filepath: Optional[str]):
+        """Store a finished download in the archive"""
+        if not self.use_archive or self.archive is None:
+            return
+        key = parse_video_key(url)
+        if key is None:
+            return
+        try:
+            self.archive.record(key[0], key[1], archive_format, filepath)
+        except Exception as e:
+            print(f"⚠️  Gagal menyimpan ke archive: {e}")
+    
     def add_url(self, url: str) -> bool:
         """Add a YouTube URL to the download list"""
         url = url.strip()
         if not url:
             return False
         
-        # Basic YouTube URL validation
-        if not ('youtube.com/watch' in url or 'youtu.be/' in url):
+        # Basic YouTube URL validation (parsed locally, no network)
+        if parse_video_key(url) is None:
             print(f"⚠️  URL mungkin bukan video YouTube: {url}")
         
-        if url not in self.url_list:
-            self.url_list.append(url)
+        # Hash lookup on the canonical video ID, so youtu.be/X and watch?v=X&t=30 collapse
+        if self.url_list.add(url):
             return True
-        else:
+        existing = self.url_list.get(url)
+        if existing == url:
             print(f"⚠️  URL sudah ada dalam list: {url}")
-            return False
+        else:
+            print(f"⚠️  Video sudah ada dalam list sebagai {existing}: {url}")
+        return False
     
     def add_urls_from_list(self, urls: List[str]) -> int:
         """Add multiple URLs to the download list"""
@@ -94,63 +362,492 @@ class BatchDownloader:
                 added_count += 1
         return added_count
     
+    def ingest_urls(self, urls: Iterable[str], on_added: Optional[Callable[[int, str], None]] = None,
+                    stop_event: Optional[threading.Event] = None) -> Dict[str, int]:
+        """
+        Validate and dedup URLs in a single lazy pass, without a warning per line
+        
+        Args:
+            urls: Any iterable of lines (an open file is read lazily)
+            on_added: Called with (item_number, url) for every new URL
+            stop_event: Stop reading when set
+        
+        Returns:
+            Counts: 'added', 'duplicates', 'non_youtube' (added anyway, like add_url)
+        """
+        stats = {'added': 0, 'duplicates': 0, 'non_youtube': 0}
+        for line in urls:
+            if stop_event is not None and stop_event.is_set():
+                break
+            url = line.strip()
+            if not url:
+                continue
+            if parse_video_key(url) is None:
+                stats['non_youtube'] += 1
+            with self._lock:
+                added = self.url_list.add(url)
+                item_number = len(self.url_list)
+            if not added:
+                stats['duplicates'] += 1
+                continue
+            stats['added'] += 1
+            if on_added:
+                on_added(item_number, url)
+        return stats
+    
+    def _print_ingest_summary(self, stats: Dict[str, int]):
+        """One summary line instead of a warning per URL"""
+        print(f"📥 {stats['added']} URL ditambahkan"
+              + (f", {stats['duplicates']} duplikat dilewati" if stats['duplicates'] else "")
+              + (f", {stats['non_youtube']} mungkin bukan video YouTube" if stats['non_youtube'] else ""))
+    
     def add_urls_from_file(self, file_path: str) -> int:
-        """Add URLs from a text file (one URL per line)"""
+        """Add URLs from a text file (one URL per line), streamed line by line"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                urls = [line.strip() for line in f.readlines() if line.strip()]
-            return self.add_urls_from_list(urls)
+                stats = self.ingest_urls(f)
         except Exception as e:
             print(f"Error reading file: {e}")
             return 0
+        self._print_ingest_summary(stats)
+        return stats['added']
     
     def clear_url_list(self):
         """Clear the URL list"""
         self.url_list.clear()
         self.failed_downloads.clear()
         self.successful_downloads.clear()
+        self.skipped_downloads.clear()
+        self.download_errors.clear()
+        self.download_paths.clear()
+    
+    def set_bandwidth_limit(self, total_rate) -> bool:
+        """
+        Cap the total download rate of this process ("5M", "500K", bytes/s, None = unlimited)
+        
+        The cap is shared by every running download (batch workers, playlist and
+        socmed jobs in the same process) and rebalanced as jobs start and finish.
+        """
+        try:
+            set_bandwidth_limit(total_rate)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return False
+        print(f"📶 Batas bandwidth total: {format_rate(governor.total_rate)}")
+        return True
+    
+    def set_stall_detection(self, min_rate, timeout: Optional[float] = None) -> bool:
+        """
+        Configure the stall watchdog
+        
+        Args:
+            min_rate: Throughput floor ("50K", bytes/s, None/0 = disable the watchdog)
+            timeout: Seconds below the floor before the job is killed and requeued
+        """
+        try:
+            self.stall_min_rate = parse_rate(min_rate)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return False
+        if timeout is not None:
+            self.stall_timeout = timeout
+        if self.stall_min_rate:
+            print(f"🐌 Stall detection: < {format_rate(self.stall_min_rate)} selama {self.stall_timeout:.0f} detik")
+        else:
+            print("🐌 Stall detection: nonaktif")
+        return True
+    
+    def set_schedule_policy(self, policy) -> bool:
+        """Set the batch queue order: "fifo", "shortest", "largest" or "round-robin" """
+        try:
+            self.schedule_policy = parse_policy(policy)
+            return True
+        except ValueError as e:
+            print(f"❌ {e}")
+            return False
+    
+    def set_fragment_concurrency(self, value) -> bool:
+        """Set --concurrent-fragments: "auto" or a fixed number of parallel fragments"""
+        try:
+            self.fragment_concurrency = parse_fragment_setting(value)
+            return True
+        except ValueError as e:
+            print(f"❌ {e}")
+            return False
+    
+    def get_rate_summary(self) -> str:
+        """Current request rate per host, for progress displays"""
+        rates = self.rate_limiter.rates()
+        return ", ".join(f"{host}: {rate * 60:.1f}/min" for host, rate in rates.items())
+    
+    @property
+    def metadata_cache(self) -> Optional[MetadataCache]:
+        """Metadata cache, created on first use (None if it cannot be opened)"""
+        if self._metadata_cache is None:
+            try:
+                self._metadata_cache = MetadataCache(ttl=self.metadata_ttl)
+            except Exception as e:
+                print(f"⚠️  Metadata cache tidak tersedia: {e}")
+                return None
+        return self._metadata_cache
+    
+    def get_cached_info(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return cached metadata of a URL without any network call"""
+        cache = self.metadata_cache
+        return cache.get(url) if cache else None
     
-    def get_video_info(self, url: str) -> Optional[Dict[str, Any]]:
-        """Get video information without downloading"""
+    def get_video_info(self, url: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Get video information without downloading
+        
+        Args:
+            url: YouTube video URL
+            use_cache: Return fresh cached metadata instead of extracting again
+        
+        Returns:
+            Dict with title, duration, uploader, view_count, filesize and formats
+        """
+        if use_cache:
+            cached = self.get_cached_info(url)
+            if cached:
+                return cached
+        
         if not self.yt_dlp_available:
             print("yt-dlp tidak tersedia.")
             return None
         
+        args = [
+            '--no-playlist',
+            '--extractor-args', 'youtube:player_client=default',  # Suppress JS runtime warning
+        ]
+        
+        info = self.engine.extract_info(args, url, timeout=30)
+        if not info:
+            return None
+        
+        metadata = summarize_info(info)
+        cache = self.metadata_cache
+        if cache:
+            cache.put(url, metadata)
+        return metadata
+    
+    def prefetch_metadata(self, urls: Optional[List[str]] = None,
+                          max_workers: Optional[int] = None,
+                          progress_callback=None) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolve metadata for many URLs concurrently and store it in the cache
+        
+        Args:
+            urls: URLs to resolve (default: the whole URL list)
+            max_workers: Number of parallel lookups (None = auto)
+            progress_callback: Function callback (current, total, percentage, title)
+        
+        Returns:
+            Dict mapping URL to metadata (URLs that failed are left out)
+        """
+        urls = list(self.url_list if urls is None else urls)
+        results: Dict[str, Dict[str, Any]] = {}
+        if not urls:
+            return results
+        
+        # Cached entries are served without touching the network
+        missing = []
+        for url in urls:
+            cached = self.get_cached_info(url)
+            if cached:
+                results[url] = cached
+            else:
+                missing.append(url)
+        
+        print(f"🔎 Prefetch metadata: {len(results)} dari cache, {len(missing)} perlu diambil")
+        pending = queue.Queue()
+        for url in missing:
+            pending.put(url)
+        done = [len(results)]
+        
+        def worker():
+            try:
+                while True:
+                    try:
+                        url = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    
+                    host = rate_key(url)
+                    self.rate_limiter.acquire(host)
+                    info = self.get_video_info(url, use_cache=False)
+                    self.rate_limiter.report(host, info is not None)
+                    
+                    with self._lock:
+                        done[0] += 1
+                        current = done[0]
+                        if info:
+                            results[url] = info
+                    if progress_callback:
+                        title = info['title'] if info else url[:50]
+                        progress_callback(current, len(urls), current / len(urls) * 100, title)
+            finally:
+                self.engine.close()
+        
+        if missing:
+            workers = max(1, min(max_workers or default_worker_count() * 2, len(missing)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for _ in range(workers):
+                    executor.submit(worker)
+        
+        return results
+    
+    def estimate_total_size(self, urls: Optional[List[str]] = None) -> int:
+        """Sum of known file sizes (bytes) from cached metadata"""
+        total = 0
+        for url in (self.url_list if urls is None else urls):
+            info = self.get_cached_info(url)
+            if info and info.get('filesize'):
+                total += info['filesize']
+        return total
+    
+    def _apply_numbering(self, output_template: str, item_number: Optional[int]) -> str:
+        """Prefix the output template with a zero-padded item number"""
+        if item_number is None:
+            with self._lock:
+                item_number = len(self.successful_downloads) + 1
+        if "%(title)s" in output_template:
+            return output_template.replace("%(title)s", f"{item_number:02d} - %(title)s")
+        return f"{item_number:02d} - " + output_template
+    
+    def _fetch(self, args: List[str], url: str, progress_hook=None) -> Dict[str, Any]:
+        """Run yt-dlp through the selected engine, return the engine result"""
+        if self._use_parallel_streams(args):
+            result = self._fetch_streams(args, url, progress_hook)
+            if result is not None:
+                return result
+        return self._run_engine(args, url, progress_hook)
+    
+    def _use_parallel_streams(self, args: List[str]) -> bool:
+        """Whether the format of a download can be fetched as parallel streams"""
+        selector = option_value(args, '-f') or ''
+        if '+' not in selector or '--load-info-json' in args:
+            return False
+        if self.parallel_streams is None:
+            return self.engine.name == InProcessEngine.name
+        return self.parallel_streams
+    
+    def _fetch_streams(self, args: List[str], url: str, progress_hook=None) -> Optional[Dict[str, Any]]:
+        """
+        Download the video and audio stream of a merged format concurrently
+        
+        yt-dlp downloads the streams of "bv+ba" one after the other. Here the
+        format is resolved once (info dict saved to a temp file), both streams
+        are fetched at the same time into the files yt-dlp itself would use
+        (<name>.f<format_id>.<ext>), and a last run from the saved info dict
+        finds them on disk and goes straight to the ffmpeg merge. Every stream
+        is a separate job for the bandwidth governor, so --limit-rate still
+        holds for the item as a whole.
+        
+        Returns None when the format does not resolve to separate streams (the
+        caller then downloads normally).
+        """
+        work_dir = tempfile.mkdtemp(prefix="yt_streams_")
+        info_json = os.path.join(work_dir, "info.json")
         try:
-            cmd = [
-                sys.executable, '-m', 'yt_dlp',
-                '--dump-json',
-                '--no-playlist',
-                '--extractor-args', 'youtube:player_client=default',  # Suppress JS runtime warning
-                url
-            ]
+            # Network options only: thumbnails, metadata and PP-stage prints belong to the last run
+            base_args = self._strip_fetch_outputs(split_postprocess_args(args)[0])
+            probe = self.engine.download(
+                base_args + ['--skip-download', '--print-to-file', 'video:%()j', info_json], url)
+            if not probe['success']:
+                return probe
+            try:
+                with open(info_json, 'r', encoding='utf-8') as f:
+                    info = json.loads(f.readline())
+            except (OSError, ValueError):
+                return None
+            formats = info.get('requested_formats') or []
+            filename = info.get('filename')
+            if len(formats) != 2 or not filename or filename == '-':
+                return None
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            results: Dict[str, Dict[str, Any]] = {}
             
-            if result.returncode == 0:
+            def fetch_stream(fmt: Dict[str, Any]):
+                path = self._stream_path(filename, info.get('ext'), fmt)
+                stream_args = replace_option(replace_option(base_args, '-f', str(fmt['format_id'])),
+                                             '-o', path.replace('%', '%%'))
+                results[fmt['format_id']] = self._run_engine(
+                    stream_args + ['--load-info-json', info_json], url, progress_hook)
+            
+            def fetch_in_thread(fmt: Dict[str, Any]):
                 try:
-                    info = json.loads(result.stdout.strip())
-                    return {
-                        'title': info.get('title', 'Unknown'),
-                        'duration': info.get('duration', 0),
-                        'uploader': info.get('uploader', 'Unknown'),
-                        'view_count': info.get('view_count', 0)
-                    }
-                except json.JSONDecodeError:
-                    return None
+                    fetch_stream(fmt)
+                finally:
+                    # The helper thread ends here, release its in-process YoutubeDL
+                    self.engine.close()
+            
+            # Audio in a helper thread, video on the worker thread
+            helper = threading.Thread(target=fetch_in_thread, args=(formats[1],), daemon=True)
+            helper.start()
+            fetch_stream(formats[0])
+            helper.join()
+            
+            for fmt in formats:
+                result = results.get(fmt['format_id'])
+                if result is None:
+                    return {'success': False, 'error': f"ERROR: stream {fmt['format_id']} gagal",
+                            'filepath': None, 'stalled': False}
+                if not result['success']:
+                    # Finished streams stay on disk, a retry only fetches the missing one
+                    return result
+            
+            merged = '+'.join(str(fmt['format_id']) for fmt in formats)
+            print(f"🔗 Video + audio selesai ({merged}), merge: {url}")
+            return self._run_engine(replace_option(args, '-f', merged) + ['--load-info-json', info_json],
+                                    url, progress_hook)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    
+    @staticmethod
+    def _strip_fetch_outputs(args: List[str]) -> List[str]:
+        """Drop --write-thumbnail and --print-to-file from a yt-dlp argument list"""
+        result = []
+        i = 0
+        while i < len(args):
+            if args[i] == '--print-to-file':
+                i += 3
+                continue
+            if args[i] != '--write-thumbnail':
+                result.append(args[i])
+            i += 1
+        return result
+    
+    @staticmethod
+    def _stream_path(filename: str, merged_ext: Optional[str], fmt: Dict[str, Any]) -> str:
+        """File name yt-dlp uses for one stream of a merged format (see YoutubeDL.process_info)"""
+        root, ext = os.path.splitext(filename)
+        if ext[1:] not in (merged_ext, fmt.get('ext')):
+            root = filename
+        return f"{root}.f{fmt['format_id']}.{fmt.get('ext')}"
+    
+    def _run_engine(self, args: List[str], url: str, progress_hook=None) -> Dict[str, Any]:
+        """One engine download with fragment tuning and the stall watchdog"""
+        # Fragment concurrency for DASH/HLS formats, fixed or tuned per host
+        host = rate_key(url)
+        fragment_opts = fragment_args(self.fragment_concurrency, host)
+        observer = FragmentThroughput() if self.fragment_concurrency == AUTO_FRAGMENTS else None
+        
+        hooks = [hook for hook in (observer, progress_hook) if hook]
+        
+        def combined_hook(status):
+            for hook in hooks:
+                hook(status)
+        
+        watchdog = StallWatchdog(self.stall_min_rate, self.stall_timeout) if self.stall_min_rate else None
+        result = self.engine.download(args + fragment_opts, url, combined_hook if hooks else None,
+                                      watchdog=watchdog)
+        
+        if observer is not None:
+            level = int(fragment_opts[1]) if fragment_opts else 1
+            fragment_tuner.report(host, level, observer.throughput)
+        return result
+    
+    def _finish_download(self, url: str, archive_format: str, result: Dict[str, Any]) -> bool:
+        """Record the final result of a URL (archive + result lists)"""
+        if result.get('stalled') and getattr(self._thread_state, 'requeue_stalled', False):
+            # Not a result yet: the batch puts the item back in the queue
+            self._thread_state.stalled = True
+            return False
+        
+        if result['success']:
+            self._record_archive(url, archive_format, result.get('filepath'))
+        else:
+            failure = self._record_failure_class(url, result['error'])
+            print(f"🏷️  Error {describe_failure(failure)}")
+            if (not is_permanent(failure) and not result.get('stalled')
+                    and getattr(self._thread_state, 'retry_transient', False)):
+                # Not a result yet either: the batch retries it after a backoff
+                with self._lock:
+                    self.download_errors[url] = result['error']
+                self._thread_state.retry = True
+                return False
+        
+        with self._lock:
+            if result['success']:
+                self.successful_downloads.append(url)
+                self.download_errors.pop(url, None)
+                self.failure_classes.pop(url, None)
+                if result.get('filepath'):
+                    self.download_paths[url] = result['filepath']
             else:
-                return None
-                
-        except subprocess.TimeoutExpired:
-            return None
-        except Exception as e:
-            return None
+                self.failed_downloads.append(url)
+                self.download_errors[url] = result['error']
+        return result['success']
+    
+    def _run_yt_dlp(self, args: List[str], url: str, archive_format: str = "",
+                    progress_hook=None) -> bool:
+        """Run yt-dlp through the selected engine and record the result"""
+        return self._finish_download(url, archive_format, self._fetch(args, url, progress_hook))
+    
+    def _download(self, args: List[str], url: str, archive_format: str,
+                  progress_hook=None, on_done: Optional[Callable[[bool], None]] = None) -> bool:
+        """
+        Download a URL, handing post-processing to the batch's post-processing stage
+        
+        Without a stage (or without post-processing flags) this is a plain
+        _run_yt_dlp. Otherwise only the network part runs here: the info dict is
+        saved and the ffmpeg work (thumbnail, metadata, audio conversion) is
+        queued for the post-processing pool, which calls on_done with the final
+        result. Returns whether the network fetch succeeded.
+        """
+        stage = self._pp_stage
+        network_args, pp_args = split_postprocess_args(args)
+        if stage is None or on_done is None or not pp_args:
+            return self._run_yt_dlp(args, url, archive_format, progress_hook)
+        
+        info_json = stage.info_json_path()
+        fetch_args = network_args + ['--print-to-file', 'after_move:%()j', info_json]
+        if '--embed-thumbnail' in pp_args:
+            # Fetch the thumbnail now, the post-processing run finds it on disk
+            fetch_args.append('--write-thumbnail')
+        
+        result = self._fetch(fetch_args, url, progress_hook)
+        if not result['success']:
+            self._finish_download(url, archive_format, result)
+            return False
+        if not os.path.exists(info_json):
+            # No saved info dict: let a full run find the file and post-process it
+            return self._run_yt_dlp(args, url, archive_format)
+        
+        print(f"🧩 Download selesai, post-processing diantrikan: {url}")
+        self._thread_state.deferred = True
+        stage.submit({
+            'url': url,
+            'args': args,
+            'info_json': info_json,
+            'archive_format': archive_format,
+            'on_done': on_done,
+        })
+        return True
+    
+    def _postprocess_job(self, job: Dict[str, Any]):
+        """Run the post-processors of one downloaded item (post-processing pool)"""
+        result = self._pp_engine.postprocess(job['args'], job['info_json'])
+        try:
+            os.remove(job['info_json'])
+        except OSError:
+            pass
+        job['on_done'](self._finish_download(job['url'], job['archive_format'], result))
+    
+    def _record_failure(self, url: str):
+        """Mark a URL as failed (thread-safe)"""
+        with self._lock:
+            self.failed_downloads.append(url)
     
     def download_single_video(self, url: str, quality: str = "best", 
                              output_template: str = "%(title)s.%(ext)s",
                              auto_numbering: bool = False,
                              embed_thumbnail: bool = True,
-                             embed_metadata: bool = True) -> bool:
+                             embed_metadata: bool = True,
+                             item_number: Optional[int] = None,
+                             progress_hook=None,
+                             on_done: Optional[Callable[[bool], None]] = None) -> bool:
         """
         Download a single video
         
@@ -161,6 +858,11 @@ class BatchDownloader:
             auto_numbering: Add number prefix to filename
             embed_thumbnail: Embed YouTube thumbnail (disable for faster download)
             embed_metadata: Add metadata like title, artist, date (disable for faster download)
+            item_number: Number used by auto_numbering (default: next success count)
+            progress_hook: Called with yt-dlp progress dicts while downloading
+            on_done: Inside a batch with a post-processing stage, called with the
+                     final result once post-processing finished (the return value
+                     then only reports the network fetch)
         """
         if not self.yt_dlp_available:
             print("yt-dlp tidak tersedia!")
@@ -170,18 +872,14 @@ class BatchDownloader:
             print("Download folder belum di-set!")
             return False
         
+        archive_format = f"video:{quality}"
+        if self._check_archive(url, archive_format):
+            return True
+        
         try:
-            # Change to download directory
-            original_cwd = os.getcwd()
-            os.chdir(self.download_folder)
-            
             # Add numbering if requested
             if auto_numbering:
-                current_number = len(self.successful_downloads) + 1
-                if "%(title)s" in output_template:
-                    output_template = output_template.replace("%(title)s", f"{current_number:02d} - %(title)s")
-                else:
-                    output_template = f"{current_number:02d} - " + output_template
+                output_template = self._apply_numbering(output_template, item_number)
             
             # Build command based on quality
             if quality == "best":
@@ -193,9 +891,9 @@ class BatchDownloader:
             else:
                 format_selector = quality
             
-            cmd = [
-                sys.executable, '-m', 'yt_dlp',
+            args = [
                 '-f', format_selector,
+                '-P', str(self.download_folder),  # Output folder (no chdir, safe for parallel jobs)
                 '-o', output_template,
                 '--no-playlist',
                 '--extractor-args', 'youtube:player_client=default',  # Suppress JS runtime warning
@@ -203,58 +901,48 @@ class BatchDownloader:
             
             # Add optional features (can be disabled for faster/lighter downloads)
             if embed_thumbnail:
-                cmd.append('--embed-thumbnail')  # Embed thumbnail as cover art
+                args.append('--embed-thumbnail')  # Embed thumbnail as cover art
             if embed_metadata:
-                cmd.append('--add-metadata')     # Add metadata (title, artist, etc.)
-            
-            cmd.append(url)
+                args.append('--add-metadata')     # Add metadata (title, artist, etc.)
             
             print(f"📥 Downloading: {url}")
             
-            # Run the download command
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, 
-                                     text=True, universal_newlines=True)
-            
-            for line in process.stdout:
-                print(line.strip())
-            
-            process.wait()
-            
-            if process.returncode == 0:
-                self.successful_downloads.append(url)
-                return True
-            else:
-                self.failed_downloads.append(url)
-                return False
+            return self._download(args, url, archive_format, progress_hook, on_done)
                 
         except Exception as e:
             print(f"Error downloading {url}: {e}")
-            self.failed_downloads.append(url)
+            self._record_failure(url)
             return False
-        finally:
-            # Return to original directory
-            try:
-                os.chdir(original_cwd)
-            except:
-                pass
     
     def download_single_audio(self, url: str, audio_format: str = "mp3",
                              audio_quality: str = "0",
                              output_template: str = "%(title)s.%(ext)s",
                              auto_numbering: bool = False,
                              embed_thumbnail: bool = True,
-                             embed_metadata: bool = True) -> bool:
+                             embed_metadata: bool = True,
+                             item_number: Optional[int] = None,
+                             progress_hook=None,
+                             on_done: Optional[Callable[[bool], None]] = None,
+                             transcode_policy: str = TRANSCODE_COMPATIBLE) -> bool:
         """
         Download audio only from a single video
         
         Args:
             url: YouTube video URL
-            audio_format: Audio format ("mp3", "m4a", "wav", etc.)
-            audio_quality: Audio quality (0=best, 9=worst)
+            audio_format: Audio format ("mp3", "m4a", "wav", etc.) or "native"
+                          (source stream as opus/m4a/ogg, no re-encoding)
+            audio_quality: Audio quality (0=best, 9=worst, ignored for "native")
             output_template: Output filename template
             auto_numbering: Add number prefix to filename
             embed_thumbnail: Embed YouTube thumbnail as album art (disable for faster download)
             embed_metadata: Add metadata like title, artist, date (disable for faster download)
+            item_number: Number used by auto_numbering (default: next success count)
+            progress_hook: Called with yt-dlp progress dicts while downloading
+            on_done: Inside a batch with a post-processing stage, called with the
+                     final result once post-processing finished (the return value
+                     then only reports the network fetch)
+            transcode_policy: "compatible" (only transcode when audio_format cannot
+                              hold the source codec) or "always" (best source, always converted)
         """
         if not self.yt_dlp_available:
             print("yt-dlp tidak tersedia!")
@@ -264,24 +952,24 @@ class BatchDownloader:
             print("Download folder belum di-set!")
             return False
         
+        archive_format = f"audio:{audio_format}"
+        if self._check_archive(url, archive_format):
+            return True
+        
         try:
-            # Change to download directory
-            original_cwd = os.getcwd()
-            os.chdir(self.download_folder)
-            
             # Add numbering if requested
             if auto_numbering:
-                current_number = len(self.successful_downloads) + 1
-                if "%(title)s" in output_template:
-                    output_template = output_template.replace("%(title)s", f"{current_number:02d} - %(title)s")
-                else:
-                    output_template = f"{current_number:02d} - " + output_template
+                output_template = self._apply_numbering(output_template, item_number)
             
-            cmd = [
-                sys.executable, '-m', 'yt_dlp',  # Use python -m yt_dlp instead of yt-dlp command
-                '-x',  # Extract audio
-                '--audio-format', audio_format,
-                '--audio-quality', audio_quality,
+            # Explicit source stream, also used by the split fetch of the post-processing stage
+            args = ['-f', audio_format_selector(audio_format, transcode_policy), '-x']
+            if audio_format == NATIVE_AUDIO:
+                # "best" keeps the codec: only remuxed into its own container
+                args += ['--audio-format', 'best']
+            else:
+                args += ['--audio-format', audio_format, '--audio-quality', audio_quality]
+            args += [
+                '-P', str(self.download_folder),  # Output folder (no chdir, safe for parallel jobs)
                 '-o', output_template,
                 '--no-playlist',
                 '--extractor-args', 'youtube:player_client=default',  # Suppress JS runtime warning
@@ -289,40 +977,497 @@ class BatchDownloader:
             
             # Add optional features (can be disabled for faster/lighter downloads)
             if embed_thumbnail:
-                cmd.append('--embed-thumbnail')  # Embed thumbnail as album art (MP3 cover)
+                args.append('--embed-thumbnail')  # Embed thumbnail as album art (MP3 cover)
             if embed_metadata:
-                cmd.append('--add-metadata')     # Add metadata (title, artist, album, etc.)
-            
-            cmd.append(url)
+                args.append('--add-metadata')     # Add metadata (title, artist, album, etc.)
             
             print(f"🎵 Downloading audio: {url}")
             
-            # Run the download command
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, 
-                                     text=True, universal_newlines=True)
+            return self._download(args, url, archive_format, progress_hook, on_done)
+                
+        except Exception as e:
+            print(f"Error downloading audio from {url}: {e}")
+            self._record_failure(url)
+            return False
+    
+    def _emit(self, event: str, **fields):
+        """Send a batch event to event_callback (no-op without a callback)"""
+        callback = self.event_callback
+        if callback is None:
+            return
+        try:
+            callback({'event': event, 'time': time.time(), **fields})
+        except Exception as e:
+            print(f"⚠️  Event callback error: {e}")
+    
+    def _run_batch(self, download_fn: Callable[..., bool], icon: str,
+                   continue_on_error: bool, max_workers: Optional[int],
+                   progress_callback=None, archive_format: str = "",
+                   items: Optional[List[tuple]] = None,
+                   source: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Dispatch every URL in the list to a pool of download workers
+        
+        Args:
+            download_fn: Function (url, item_number, progress_hook, on_done) -> fetch success
+            icon: Emoji used in console output
+            continue_on_error: Keep dispatching new URLs after a failure
+            max_workers: Number of parallel downloads (None = auto, 1 = sequential)
+            progress_callback: Function callback (current, total, percentage, title)
+            archive_format: Archive format key, archived URLs are skipped without any network call
+            items: (item_number, url) pairs to process (default: the whole URL list)
+            source: Lines to stream into the list while downloading (e.g. an open file);
+                    workers start on the first URLs before the rest is read
+        """
+        pending = queue.Queue()
+        stop_event = threading.Event()
+        source_done = threading.Event()
+        journal = self.journal
+        producer = None
+        
+        # Items are numbered by their position in the list, so auto numbering
+        # stays deterministic no matter which worker finishes first
+        if source is not None:
+            if self.schedule_policy != FIFO:
+                # The whole list is not known yet, so it cannot be reordered
+                print("📋 Scheduler: URL dibaca sambil download, urutan tetap FIFO")
+            workers = max(1, max_workers or default_worker_count())
+            started = [len(self.url_list)]
+            producer = threading.Thread(target=self._produce_items,
+                                        args=(source, pending, stop_event, source_done),
+                                        daemon=True)
+            producer.start()
+        else:
+            if items is None:
+                items = list(enumerate(self.url_list, 1))
+            items = self._schedule(items, archive_format)
+            for item in items:
+                self._emit('queued', item=item[0], url=item[1])
+                pending.put(item)
+            source_done.set()
+            workers = max(1, min(max_workers or default_worker_count(), len(items)))
+            started = [len(self.url_list) - len(items)]
+        
+        # item number -> times requeued after a stall / retried after a transient error
+        stall_requeues = {}
+        retries = {}
+        # Items waiting for their backoff before going back into the queue
+        delayed = [0]
+        # item number -> start time and bytes per stream, for events
+        item_stats = {}
+        
+        def item_hook(i, url):
+            """
+            Progress hook of one item: journals every .part file (so a crash leaves
+            a trail to resume from) and feeds progress events
+            """
+            seen = set()
+            stats = item_stats[i]
+            last_event = [0.0]
             
-            for line in process.stdout:
-                print(line.strip())
+            def hook(status):
+                tmpfilename = status.get('tmpfilename')
+                if journal and tmpfilename and tmpfilename not in seen:
+                    seen.add(tmpfilename)
+                    journal.mark(i, url, RUNNING, partial=tmpfilename)
+                if status.get('downloaded_bytes'):
+                    stats['streams'][tmpfilename or status.get('filename') or ''] = status['downloaded_bytes']
+                now = time.time()
+                if self.event_callback and status.get('status') == 'downloading' and now - last_event[0] >= 1:
+                    last_event[0] = now
+                    self._emit('progress', item=i, url=url, downloaded_bytes=status.get('downloaded_bytes'),
+                               total_bytes=status.get('total_bytes') or status.get('total_bytes_estimate'),
+                               speed=status.get('speed'))
+            return hook
+        
+        def worker():
+            try:
+                work()
+            finally:
+                # Release the in-process YoutubeDL instances of this thread
+                self.engine.close()
+                # Downloads outside a batch (same thread) are never requeued
+                self._thread_state.requeue_stalled = False
+                self._thread_state.retry_transient = False
+        
+        def work():
+            while not stop_event.is_set():
+                try:
+                    i, url = pending.get(timeout=0.2)
+                except queue.Empty:
+                    if source_done.is_set() and pending.empty() and not delayed[0]:
+                        return
+                    continue
+                
+                try:
+                    process(i, url)
+                except Exception as e:
+                    # A failing callback, journal write or engine must not take the
+                    # worker down with its item unfinished
+                    print(f"❌ [{i}] Error tak terduga: {e}")
+                    with self._lock:
+                        self.download_errors[url] = str(e)
+                    self._record_failure(url)
+                    finish(i, url, len(self.url_list), False)
+        
+        def process(i, url):
+            """Download one queued item"""
+            with self._lock:
+                started[0] += 1
+                current = started[0]
+                # Grows while a source is still being read
+                total = len(self.url_list)
             
-            process.wait()
+            print(f"\n{icon} [{i}/{total}] Processing: {url}")
             
-            if process.returncode == 0:
-                self.successful_downloads.append(url)
-                return True
+            # Update progress if callback provided
+            if progress_callback:
+                percentage = (current / total) * 100
+                progress_callback(current, total, percentage, f"Processing: {url[:50]}...")
+            
+            if self._check_archive(url, archive_format):
+                if journal:
+                    journal.mark(i, url, DONE)
+                self._emit('skipped', item=i, url=url, reason='archive')
+                return
+            if self._check_permanent_failure(url):
+                if journal:
+                    journal.mark(i, url, FAILED, error=self.download_errors.get(url, ''))
+                self._emit('skipped', item=i, url=url, reason='permanent_failure',
+                           failure=self.failure_classes.get(url))
+                return
+            
+            # Wait for this host's rate limiter instead of a fixed sleep
+            host = rate_key(url)
+            self.rate_limiter.acquire(host)
+            
+            if journal:
+                journal.mark(i, url, RUNNING)
+            item_stats.setdefault(i, {'started': time.time(), 'streams': {}})
+            self._emit('started', item=i, url=url,
+                       attempt=stall_requeues.get(i, 0) + retries.get(i, 0) + 1)
+            
+            self._thread_state.deferred = False
+            self._thread_state.stalled = False
+            self._thread_state.retry = False
+            self._thread_state.requeue_stalled = stall_requeues.get(i, 0) < self.max_stall_requeues
+            self._thread_state.retry_transient = retries.get(i, 0) < self.max_transient_retries
+            on_done = lambda success, i=i, url=url, total=total: finish(i, url, total, success)
+            fetched = download_fn(url, i, item_hook(i, url), on_done)
+            
+            if self._thread_state.stalled:
+                # Fresh connection later, the .part file is resumed from where it stopped
+                with self._lock:
+                    stall_requeues[i] = stall_requeues.get(i, 0) + 1
+                    started[0] -= 1
+                if journal:
+                    journal.mark(i, url, QUEUED)
+                print(f"🔁 [{i}/{total}] Diantrikan ulang di akhir antrian "
+                      f"({stall_requeues[i]}/{self.max_stall_requeues})")
+                self._emit('requeued', item=i, url=url, reason='stalled')
+                pending.put((i, url))
+                return
+            
+            if self.rate_limiter.report(host, fetched, self.download_errors.get(url)):
+                rate = self.rate_limiter.current_rate(host)
+                print(f"🐢 {host} membatasi request, rate diturunkan ke {rate * 60:.1f}/menit")
+            
+            if self._thread_state.retry:
+                with self._lock:
+                    retries[i] = retries.get(i, 0) + 1
+                    started[0] -= 1
+                delay = backoff_delay(retries[i], self.retry_backoff)
+                if journal:
+                    journal.mark(i, url, QUEUED)
+                print(f"🔁 [{i}/{total}] Retry {retries[i]}/{self.max_transient_retries} "
+                      f"dalam {delay:.0f} detik")
+                self._emit('requeued', item=i, url=url, reason='transient_error', delay=delay,
+                           failure=self.failure_classes.get(url))
+                retry_later(i, url, delay)
+                return
+            
+            # Items handed to the post-processing stage finish later, from that pool
+            if not self._thread_state.deferred:
+                finish(i, url, total, fetched)
+        
+        def retry_later(i, url, delay):
+            """Put an item back into the queue once its backoff has passed"""
+            def requeue():
+                pending.put((i, url))
+                with self._lock:
+                    delayed[0] -= 1
+            with self._lock:
+                delayed[0] += 1
+            timer = threading.Timer(delay, requeue)
+            timer.daemon = True
+            timer.start()
+        
+        def finish(i, url, total, success):
+            """Final state of an item (called by a worker or the post-processing pool)"""
+            if journal:
+                if success:
+                    journal.mark(i, url, DONE)
+                else:
+                    journal.mark(i, url, FAILED, error=self.download_errors.get(url, ''))
+            
+            stats = item_stats.get(i, {'started': time.time(), 'streams': {}})
+            fields = {
+                'item': i,
+                'url': url,
+                'elapsed': round(time.time() - stats['started'], 3),
+                'bytes': int(sum(stats['streams'].values())),
+            }
+            if success:
+                self._emit('done', filepath=self.download_paths.get(url), **fields)
+                print(f"✅ [{i}/{total}] Download berhasil!")
             else:
-                self.failed_downloads.append(url)
-                return False
-                
+                self._emit('failed', error=self.download_errors.get(url, ''),
+                           failure=self.failure_classes.get(url), **fields)
+                print(f"❌ [{i}/{total}] Download gagal!")
+                if not continue_on_error and not stop_event.is_set():
+                    print("⏹️  Menghentikan batch download karena ada error.")
+                    stop_event.set()
+        
+        if self.pipeline_postprocessing:
+            if self._pp_engine is None or self._pp_engine.name != InProcessEngine.name:
+                self._pp_engine = create_engine()
+            self._pp_stage = PostProcessStage(self._postprocess_job,
+                                              on_worker_exit=self._pp_engine.close)
+        try:
+            # Subprocess downloads get total bandwidth / workers each, not all of what is left
+            with governor.expect(workers):
+                if workers == 1:
+                    worker()
+                else:
+                    print(f"⚡ Parallel mode: {workers} downloads sekaligus")
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        futures = [executor.submit(worker) for _ in range(workers)]
+                    # Errors outside an item (e.g. in finish) surface here instead of vanishing
+                    for future in futures:
+                        future.result()
+        finally:
+            if self._pp_stage is not None:
+                if self._pp_stage.pending():
+                    print(f"\n🧩 Menunggu post-processing {self._pp_stage.pending()} item...")
+                self._pp_stage.close()
+                self._pp_stage = None
+        
+        if producer is not None:
+            stop_event.set()
+            producer.join()
+        
+        return {
+            "success": len(self.successful_downloads),
+            "failed": len(self.failed_downloads)
+        }
+    
+    def _schedule(self, items: List[tuple], archive_format: str = "") -> List[tuple]:
+        """Order batch items by the scheduler policy, prefetching the metadata it needs"""
+        if self.schedule_policy == FIFO or len(items) < 2:
+            return items
+        
+        print(f"📋 Scheduler: {POLICIES[self.schedule_policy]}")
+        # Archived items are skipped anyway, no need to look them up
+        urls = [url for _, url in items
+                if not self._is_archived(url, archive_format)
+                and not (self.skip_permanent_failures and self._known_permanent_failure(url))]
+        infos = self.prefetch_metadata(urls)
+        return order_items(items, self.schedule_policy, infos.get)
+    
+    def _produce_items(self, source: Iterable[str], pending: queue.Queue,
+                       stop_event: threading.Event, source_done: threading.Event):
+        """Feed new URLs from a source into the download queue (runs in its own thread)"""
+        # Journal URLs in chunks (one fsync each) but always before they are queued,
+        # so a resumed batch knows every item that may have started
+        chunk = []
+        chunk_started = [0.0]
+        
+        def flush():
+            if self.journal:
+                self.journal.add_urls([url for _, url in chunk])
+            for item in chunk:
+                pending.put(item)
+            chunk.clear()
+        
+        def on_added(item_number, url):
+            if not chunk:
+                chunk_started[0] = time.time()
+            chunk.append((item_number, url))
+            self._emit('queued', item=item_number, url=url)
+            if len(chunk) >= STREAM_CHUNK_SIZE or time.time() - chunk_started[0] > STREAM_CHUNK_SECONDS:
+                flush()
+        
+        try:
+            stats = self.ingest_urls(source, on_added, stop_event)
+            flush()
+            self._print_ingest_summary(stats)
         except Exception as e:
-            print(f"Error downloading audio from {url}: {e}")
-            self.failed_downloads.append(url)
-            return False
+            print(f"Error reading file: {e}")
+            flush()
         finally:
-            # Return to original directory
+            source_done.set()
+    
+    def _print_batch_summary(self, title: str):
+        """Print the result summary of a batch run"""
+        print("\n" + "=" * 60)
+        print(f"📊 {title}")
+        print(f"✅ Berhasil: {len(self.successful_downloads)}")
+        if self.skipped_downloads:
+            print(f"⏭️  Skip (sudah di archive): {len(self.skipped_downloads)}")
+        print(f"❌ Gagal: {len(self.failed_downloads)}")
+        
+        if self.failed_downloads:
+            print("\n❌ URL yang gagal:")
+            for url in self.failed_downloads:
+                print(f"  - {url}")
+    
+    def _journal_path(self, journal_path=None) -> Optional[Path]:
+        """Journal file of a batch (default: inside the download folder)"""
+        if journal_path:
+            return Path(journal_path)
+        if self.download_folder:
+            return self.download_folder / JOURNAL_FILENAME
+        return None
+    
+    def _execute_batch(self, mode: str, options: Dict[str, Any], progress_callback=None,
+                       max_workers: Optional[int] = None,
+                       items: Optional[List[tuple]] = None,
+                       source: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Run a video/audio batch described by a journal-able options dict"""
+        if mode == "audio":
+            def download_fn(url, item_number, progress_hook, on_done):
+                return self.download_single_audio(url, options['audio_format'], options['audio_quality'],
+                                                  options['output_template'], options['auto_numbering'],
+                                                  options['embed_thumbnail'], options['embed_metadata'],
+                                                  item_number, progress_hook, on_done,
+                                                  options.get('transcode_policy', TRANSCODE_COMPATIBLE))
+            icon = "🎵"
+            archive_format = f"audio:{options['audio_format']}"
+            title = "Batch Download Audio Selesai!"
+        else:
+            def download_fn(url, item_number, progress_hook, on_done):
+                return self.download_single_video(url, options['quality'], options['output_template'],
+                                                  options['auto_numbering'], options['embed_thumbnail'],
+                                                  options['embed_metadata'], item_number, progress_hook,
+                                                  on_done)
+            icon = "📹"
+            archive_format = f"video:{options['quality']}"
+            title = "Batch Download Selesai!"
+        
+        try:
+            result = self._run_batch(download_fn, icon, options['continue_on_error'], max_workers,
+                                     progress_callback, archive_format=archive_format, items=items,
+                                     source=source)
+        finally:
+            if self.journal:
+                self.journal.close()
+                self.journal = None
+        self._print_batch_summary(title)
+        return result
+    
+    def _start_batch(self, mode: str, options: Dict[str, Any], progress_callback=None,
+                     max_workers: Optional[int] = None,
+                     source: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Reset the results, open a fresh journal and run the URL list (or a streamed source)"""
+        self.successful_downloads.clear()
+        self.failed_downloads.clear()
+        self.skipped_downloads.clear()
+        
+        journal_path = self._journal_path() if self.use_journal else None
+        if journal_path:
             try:
-                os.chdir(original_cwd)
-            except:
-                pass
+                self.journal = JobJournal(journal_path)
+                self.journal.start_batch(mode, options, list(self.url_list))
+            except OSError as e:
+                print(f"⚠️  Gagal membuat job journal, batch tidak bisa di-resume: {e}")
+                self.journal = None
+        
+        return self._execute_batch(mode, options, progress_callback, max_workers, source=source)
+    
+    def get_resumable_batch(self, journal_path=None,
+                            include_failed: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Read the journal of an interrupted batch
+        
+        Args:
+            journal_path: Journal file (default: journal in the download folder)
+            include_failed: Also count items that failed as pending (retry)
+        
+        Returns:
+            Journal state (see JobJournal.load) plus 'pending' (items that never
+            finished, queued/running), or None if there is no journal or nothing
+            left to do. A batch that finished with failures is not interrupted.
+        """
+        path = self._journal_path(journal_path)
+        if path is None:
+            return None
+        try:
+            batch = JobJournal.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️  Job journal tidak bisa dibaca: {e}")
+            return None
+        if batch is None:
+            return None
+        pending_states = (QUEUED, RUNNING, FAILED) if include_failed else (QUEUED, RUNNING)
+        batch['pending'] = [i for i, item in batch['items'].items() if item['state'] in pending_states]
+        return batch if batch['pending'] else None
+    
+    def resume_batch(self, journal_path=None, retry_failed: bool = False,
+                     progress_callback=None, max_workers: Optional[int] = None) -> Dict[str, int]:
+        """
+        Continue an interrupted batch from its job journal
+        
+        Only items that never finished (queued/running) are queued again, under their
+        original numbers and options, so yt-dlp continues their .part files instead
+        of starting from zero. Items already done are counted as successful.
+        
+        Args:
+            journal_path: Journal file (default: journal in the download folder)
+            retry_failed: Also re-queue items that failed in the previous run
+            progress_callback: Function callback (current, total, percentage, title)
+            max_workers: Number of parallel downloads (None = auto, 1 = sequential)
+        
+        Returns:
+            Dict with success and failure counts
+        """
+        path = self._journal_path(journal_path)
+        batch = self.get_resumable_batch(path, include_failed=retry_failed)
+        if batch is None:
+            print("Tidak ada batch yang perlu dilanjutkan.")
+            return {"success": 0, "failed": 0}
+        
+        self.clear_url_list()
+        self.url_list.extend(batch['urls'])
+        
+        resume_states = (QUEUED, RUNNING, FAILED) if retry_failed else (QUEUED, RUNNING)
+        items = []
+        for i, item in sorted(batch['items'].items()):
+            if item['state'] == DONE:
+                self.successful_downloads.append(item['url'])
+            elif item['state'] in resume_states:
+                items.append((i, item['url']))
+            else:
+                self.failed_downloads.append(item['url'])
+                self.download_errors[item['url']] = item.get('error', '')
+        
+        partial_count = sum(len(batch['items'][i]['partial_files']) for i, _ in items)
+        print(f"🔁 Melanjutkan batch: {len(items)} dari {len(batch['urls'])} item belum selesai"
+              + (f" ({partial_count} file .part dilanjutkan)" if partial_count else ""))
+        print("=" * 60)
+        
+        if not items:
+            self._print_batch_summary("Batch Download Selesai!")
+            return {"success": len(self.successful_downloads), "failed": len(self.failed_downloads)}
+        
+        try:
+            # Keep appending to the same journal, earlier transitions stay valid
+            self.journal = JobJournal(path)
+        except OSError as e:
+            print(f"⚠️  Gagal membuka job journal: {e}")
+            self.journal = None
+        
+        return self._execute_batch(batch['mode'], batch['options'], progress_callback,
+                                   max_workers, items=items)
     
     def batch_download_videos(self, quality: str = "best", 
                              output_template: str = "%(title)s.%(ext)s",
@@ -330,7 +1475,8 @@ class BatchDownloader:
                              continue_on_error: bool = True,
                              embed_thumbnail: bool = True,
                              embed_metadata: bool = True,
-                             progress_callback=None) -> Dict[str, int]:
+                             progress_callback=None,
+                             max_workers: Optional[int] = None) -> Dict[str, int]:
         """
         Download all videos in the URL list
         
@@ -342,6 +1488,7 @@ class BatchDownloader:
             embed_thumbnail: Embed YouTube thumbnail (disable for faster download)
             embed_metadata: Add metadata like title, artist, date (disable for faster download)
             progress_callback: Function callback untuk update progress (current, total, percentage, title)
+            max_workers: Number of parallel downloads (None = auto based on CPU cores, 1 = sequential)
         
         Returns:
             Dict with success and failure counts
@@ -353,46 +1500,15 @@ class BatchDownloader:
         print(f"🚀 Memulai batch download {len(self.url_list)} video...")
         print("=" * 60)
         
-        self.successful_downloads.clear()
-        self.failed_downloads.clear()
-        
-        for i, url in enumerate(self.url_list, 1):
-            print(f"\n📹 [{i}/{len(self.url_list)}] Processing: {url}")
-            
-            # Update progress if callback provided
-            if progress_callback:
-                percentage = (i / len(self.url_list)) * 100
-                progress_callback(i, len(self.url_list), percentage, f"Processing: {url[:50]}...")
-            
-            success = self.download_single_video(url, quality, output_template, auto_numbering, 
-                                                embed_thumbnail, embed_metadata)
-            
-            if success:
-                print(f"✅ [{i}/{len(self.url_list)}] Download berhasil!")
-            else:
-                print(f"❌ [{i}/{len(self.url_list)}] Download gagal!")
-                if not continue_on_error:
-                    print("⏹️  Menghentikan batch download karena ada error.")
-                    break
-            
-            # Small delay between downloads
-            if i < len(self.url_list):
-                time.sleep(2)
-        
-        print("\n" + "=" * 60)
-        print(f"📊 Batch Download Selesai!")
-        print(f"✅ Berhasil: {len(self.successful_downloads)}")
-        print(f"❌ Gagal: {len(self.failed_downloads)}")
-        
-        if self.failed_downloads:
-            print("\n❌ URL yang gagal:")
-            for url in self.failed_downloads:
-                print(f"  - {url}")
-        
-        return {
-            "success": len(self.successful_downloads),
-            "failed": len(self.failed_downloads)
+        options = {
+            'quality': quality,
+            'output_template': output_template,
+            'auto_numbering': auto_numbering,
+            'continue_on_error': continue_on_error,
+            'embed_thumbnail': embed_thumbnail,
+            'embed_metadata': embed_metadata,
         }
+        return self._start_batch("video", options, progress_callback, max_workers)
     
     def batch_download_audio(self, audio_format: str = "mp3", audio_quality: str = "0",
                             output_template: str = "%(title)s.%(ext)s",
@@ -400,12 +1516,14 @@ class BatchDownloader:
                             continue_on_error: bool = True,
                             embed_thumbnail: bool = True,
                             embed_metadata: bool = True,
-                            progress_callback=None) -> Dict[str, int]:
+                            progress_callback=None,
+                            max_workers: Optional[int] = None,
+                            transcode_policy: str = TRANSCODE_COMPATIBLE) -> Dict[str, int]:
         """
         Download audio only from all videos in the URL list
         
         Args:
-            audio_format: Audio format ("mp3", "m4a", etc.)
+            audio_format: Audio format ("mp3", "m4a", etc.) or "native" (no re-encoding)
             audio_quality: Audio quality (0=best, 9=worst)
             output_template: Output filename template
             auto_numbering: Add number prefix to filenames
@@ -413,6 +1531,8 @@ class BatchDownloader:
             embed_thumbnail: Embed YouTube thumbnail as album art (disable for faster download)
             embed_metadata: Add metadata like title, artist, date (disable for faster download)
             progress_callback: Function callback untuk update progress (current, total, percentage, title)
+            max_workers: Number of parallel downloads (None = auto based on CPU cores, 1 = sequential)
+            transcode_policy: "compatible" (only transcode when needed) or "always"
         
         Returns:
             Dict with success and failure counts
@@ -424,46 +1544,56 @@ class BatchDownloader:
         print(f"🎵 Memulai batch download audio {len(self.url_list)} video...")
         print("=" * 60)
         
-        self.successful_downloads.clear()
-        self.failed_downloads.clear()
+        options = {
+            'audio_format': audio_format,
+            'audio_quality': audio_quality,
+            'transcode_policy': transcode_policy,
+            'output_template': output_template,
+            'auto_numbering': auto_numbering,
+            'continue_on_error': continue_on_error,
+            'embed_thumbnail': embed_thumbnail,
+            'embed_metadata': embed_metadata,
+        }
+        return self._start_batch("audio", options, progress_callback, max_workers)
+    
+    def batch_download_from_file(self, file_path: str, mode: str = "video",
+                                 progress_callback=None, max_workers: Optional[int] = None,
+                                 **options) -> Dict[str, int]:
+        """
+        Stream a URL file (one URL per line) straight into the download queue
         
-        for i, url in enumerate(self.url_list, 1):
-            print(f"\n🎵 [{i}/{len(self.url_list)}] Processing: {url}")
-            
-            # Update progress if callback provided
-            if progress_callback:
-                percentage = (i / len(self.url_list)) * 100
-                progress_callback(i, len(self.url_list), percentage, f"Processing: {url[:50]}...")
-            
-            success = self.download_single_audio(url, audio_format, audio_quality, output_template, 
-                                                auto_numbering, embed_thumbnail, embed_metadata)
-            
-            if success:
-                print(f"✅ [{i}/{len(self.url_list)}] Download berhasil!")
-            else:
-                print(f"❌ [{i}/{len(self.url_list)}] Download gagal!")
-                if not continue_on_error:
-                    print("⏹️  Menghentikan batch download karena ada error.")
-                    break
-            
-            # Small delay between downloads
-            if i < len(self.url_list):
-                time.sleep(2)
+        The file is read lazily in a background thread, validated and deduped in
+        one pass, and the first downloads start while the rest is still being read.
+        The URL list is replaced by the URLs of the file.
         
-        print("\n" + "=" * 60)
-        print(f"📊 Batch Download Audio Selesai!")
-        print(f"✅ Berhasil: {len(self.successful_downloads)}")
-        print(f"❌ Gagal: {len(self.failed_downloads)}")
+        Args:
+            file_path: Text file with one URL per line
+            mode: "video" or "audio"
+            progress_callback: Function callback (current, total, percentage, title)
+            max_workers: Number of parallel downloads (None = auto, 1 = sequential)
+            **options: Same keyword options as batch_download_videos / batch_download_audio
         
-        if self.failed_downloads:
-            print("\n❌ URL yang gagal:")
-            for url in self.failed_downloads:
-                print(f"  - {url}")
+        Returns:
+            Dict with success and failure counts
+        """
+        defaults = AUDIO_BATCH_DEFAULTS if mode == "audio" else VIDEO_BATCH_DEFAULTS
+        unknown = set(options) - set(defaults)
+        if unknown:
+            raise TypeError(f"Unknown {mode} batch option(s): {', '.join(sorted(unknown))}")
         
-        return {
-            "success": len(self.successful_downloads),
-            "failed": len(self.failed_downloads)
-        }
+        try:
+            source = open(file_path, 'r', encoding='utf-8')
+        except OSError as e:
+            print(f"Error reading file: {e}")
+            return {"success": 0, "failed": 0}
+        
+        print(f"🚀 Memulai batch download dari file {file_path}...")
+        print("=" * 60)
+        
+        self.clear_url_list()
+        with source:
+            return self._start_batch(mode, {**defaults, **options}, progress_callback,
+                                     max_workers, source=source)
 
 
 def main():
@@ -498,7 +1628,20 @@ def main():
             break
         else:
             print("❌ Gagal membuat folder. Coba lagi...")
-    
+
+    # Offer to continue a batch that was interrupted in this folder
+    pending_batch = downloader.get_resumable_batch()
+    if pending_batch:
+        print(f"\n🔁 Ada batch yang belum selesai: {len(pending_batch['pending'])} "
+              f"dari {len(pending_batch['urls'])} item")
+        if input("Lanjutkan batch tersebut? (y/n): ").strip().lower() == 'y':
+            result = downloader.resume_batch()
+            print(f"\n🎉 Batch download selesai!")
+            print(f"📁 File tersimpan di: {downloader.download_folder}")
+            print(f"✅ Berhasil: {result['success']}")
+            print(f"❌ Gagal: {result['failed']}")
+            return
+
     # Add URLs
     print("\n📝 Tambahkan URL YouTube (ketik 'done' untuk selesai):")
     while True:
@@ -527,30 +1670,55 @@ def main():
     else:
         print("❌ File tanpa nomor urut: Title.ext")
     
+    # Parallel downloads option
+    print("\n⚡ Parallel Download:")
+    workers_choice = input(f"Jumlah download sekaligus (Enter = otomatis {default_worker_count()}, 1 = berurutan): ").strip()
+    max_workers = int(workers_choice) if workers_choice.isdigit() and int(workers_choice) > 0 else None
+    
+    # Global bandwidth cap, shared by all parallel downloads
+    while True:
+        limit_choice = input("Batas bandwidth total (mis. 5M, 500K; Enter = tanpa batas): ").strip()
+        if not limit_choice or downloader.set_bandwidth_limit(limit_choice):
+            break
+    
+    # Queue order (uses prefetched duration / file size / uploader)
+    print("\n📋 Urutan antrian:")
+    policies = list(POLICIES)
+    for n, policy in enumerate(policies, 1):
+        print(f"{n}. {POLICIES[policy]}")
+    policy_choice = input(f"Pilihan (1-{len(policies)}, Enter = FIFO): ").strip()
+    if policy_choice.isdigit() and 1 <= int(policy_choice) <= len(policies):
+        downloader.set_schedule_policy(policies[int(policy_choice) - 1])
+    
     # Choose download type
     print("\n🎯 Pilih jenis download:")
     print("1. Video (kualitas terbaik)")
     print("2. Video (720p - hemat kuota)")
     print("3. Video (480p - hemat kuota)")
     print("4. Audio saja (MP3)")
+    print("5. Audio saja (format asli, tanpa re-encode)")
     
     while True:
-        choice = input("Pilihan (1-4): ").strip()
+        choice = input("Pilihan (1-5): ").strip()
         
         if choice == "1":
-            result = downloader.batch_download_videos(quality="best", auto_numbering=auto_numbering)
+            result = downloader.batch_download_videos(quality="best", auto_numbering=auto_numbering, max_workers=max_workers)
             break
         elif choice == "2":
-            result = downloader.batch_download_videos(quality="720p", auto_numbering=auto_numbering)
+            result = downloader.batch_download_videos(quality="720p", auto_numbering=auto_numbering, max_workers=max_workers)
             break
         elif choice == "3":
-            result = downloader.batch_download_videos(quality="480p", auto_numbering=auto_numbering)
+            result = downloader.batch_download_videos(quality="480p", auto_numbering=auto_numbering, max_workers=max_workers)
             break
         elif choice == "4":
-            result = downloader.batch_download_audio(auto_numbering=auto_numbering)
+            result = downloader.batch_download_audio(auto_numbering=auto_numbering, max_workers=max_workers)
+            break
+        elif choice == "5":
+            result = downloader.batch_download_audio(audio_format=NATIVE_AUDIO, auto_numbering=auto_numbering,
+                                                     max_workers=max_workers)
             break
         else:
-            print("Pilihan tidak valid. Masukkan 1-4.")
+            print("Pilihan tidak valid. Masukkan 1-5.")
     
     print(f"\n🎉 Batch download selesai!")
     print(f"📁 File tersimpan di: {downloader.download_folder}")
@@ -559,4 +1727,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1:
+        # Arguments given: headless mode with NDJSON events (see batch_cli.py)
+        from batch_cli import main as cli_main
+        sys.exit(cli_main())
+    main()
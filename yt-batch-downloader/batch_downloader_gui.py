@@ -13,7 +13,8 @@ from pathlib import Path
 import queue
 
 # Import our batch downloader
-from batch_downloader import BatchDownloader
+from batch_downloader import BatchDownloader, default_worker_count
+from failure_classifier import describe as describe_failure
 
 
 class BatchDownloaderGUI:
@@ -35,6 +36,9 @@ class BatchDownloaderGUI:
         self.output_template = tk.StringVar(value="%(title)s.%(ext)s")
         self.auto_numbering = tk.BooleanVar(value=False)
         self.continue_on_error = tk.BooleanVar(value=True)
+        self.fragment_concurrency = tk.StringVar(value="auto")
+        self.parallel_downloads = tk.StringVar(value="auto")
+        self.schedule_policy = tk.StringVar(value="fifo")
         
         # Set default download folder
         self.download_folder.set(os.path.join(os.path.expanduser("~"), "Downloads", "YouTube_Batch"))
@@ -127,6 +131,8 @@ class BatchDownloaderGUI:
         ttk.Button(url_btn_frame, text="📄 Load from File", command=self.load_urls_from_file).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(url_btn_frame, text="💾 Save to File", command=self.save_urls_to_file).pack(side=tk.LEFT, padx=(0, 5))
         ttk.Button(url_btn_frame, text="🗑️ Clear All", command=self.clear_all_urls).pack(side=tk.LEFT, padx=(0, 5))
+        self.fetch_info_btn = ttk.Button(url_btn_frame, text="ℹ️ Fetch Info", command=self.fetch_video_info)
+        self.fetch_info_btn.pack(side=tk.LEFT, padx=(0, 5))
         
         self.url_count_label = ttk.Label(url_btn_frame, text="URLs: 0", font=("Arial", 10, "bold"))
         self.url_count_label.pack(side=tk.RIGHT)
@@ -174,6 +180,8 @@ class BatchDownloaderGUI:
                        variable=self.download_type, value="video_480p").pack(anchor=tk.W)
         ttk.Radiobutton(type_frame, text="🎵 Audio Only (MP3)", 
                        variable=self.download_type, value="audio_mp3").pack(anchor=tk.W)
+        ttk.Radiobutton(type_frame, text="🎵 Audio Only (Native - No Re-encode)", 
+                       variable=self.download_type, value="audio_native").pack(anchor=tk.W)
         
         # Output template
         ttk.Label(options_frame, text="File Naming Template:").grid(row=2, column=0, sticky=tk.W, pady=(10, 5))
@@ -202,6 +210,39 @@ class BatchDownloaderGUI:
                                                          variable=self.continue_on_error)
         self.continue_on_error_checkbox.pack(anchor=tk.W)
         
+        # Videos downloaded at the same time
+        workers_frame = ttk.Frame(options_check_frame)
+        workers_frame.pack(anchor=tk.W, pady=(5, 0))
+        ttk.Label(workers_frame, text="🧵 Parallel Downloads:").pack(side=tk.LEFT)
+        self.workers_combobox = ttk.Combobox(workers_frame, textvariable=self.parallel_downloads,
+                                             values=["auto", "1", "2", "4", "8"],
+                                             state="readonly", width=6)
+        self.workers_combobox.pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Label(workers_frame, text=f"(auto = {default_worker_count()} sekaligus, 1 = berurutan)",
+                  font=("Arial", 8), foreground="gray").pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Concurrent fragments for segmented (DASH/HLS) formats
+        fragment_frame = ttk.Frame(options_check_frame)
+        fragment_frame.pack(anchor=tk.W, pady=(5, 0))
+        ttk.Label(fragment_frame, text="⚡ Concurrent Fragments:").pack(side=tk.LEFT)
+        self.fragment_combobox = ttk.Combobox(fragment_frame, textvariable=self.fragment_concurrency,
+                                              values=["auto", "1", "2", "4", "8", "16"],
+                                              state="readonly", width=6)
+        self.fragment_combobox.pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Label(fragment_frame, text="(auto = tuned from download speed)",
+                  font=("Arial", 8), foreground="gray").pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Queue order, based on prefetched duration / size / uploader
+        schedule_frame = ttk.Frame(options_check_frame)
+        schedule_frame.pack(anchor=tk.W, pady=(5, 0))
+        ttk.Label(schedule_frame, text="📋 Queue Order:").pack(side=tk.LEFT)
+        self.schedule_combobox = ttk.Combobox(schedule_frame, textvariable=self.schedule_policy,
+                                              values=["fifo", "shortest", "largest", "round-robin"],
+                                              state="readonly", width=12)
+        self.schedule_combobox.pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Label(schedule_frame, text="(non-FIFO fetches video info first)",
+                  font=("Arial", 8), foreground="gray").pack(side=tk.LEFT, padx=(5, 0))
+        
         # Help text
         help_text = "Template variables: %(title)s (title), %(ext)s (extension), %(uploader)s (channel)"
         ttk.Label(options_frame, text=help_text, font=("Arial", 8), foreground="gray").grid(row=5, column=0, sticky=tk.W, pady=(5, 0))
@@ -368,11 +409,39 @@ class BatchDownloaderGUI:
                 status = 'Success'
             elif url in self.downloader.failed_downloads:
                 status = 'Failed'
+                failure = self.downloader.failure_classes.get(url)
+                if failure:
+                    status = f"Failed ({describe_failure(failure)})"
+            
+            item_id = self.url_tree.insert('', 'end', text=str(i), values=(url, status))
             
-            self.url_tree.insert('', 'end', text=str(i), values=(url, status))
+            # Show cached title as a child row (no network call)
+            info = self.downloader.get_cached_info(url)
+            if info:
+                duration = int(info.get('duration') or 0)
+                self.url_tree.insert(item_id, 'end', text='',
+                                     values=(f"{info.get('title', 'Unknown')} ({duration // 60}:{duration % 60:02d})", ''))
         
         self.update_url_count()
     
+    def fetch_video_info(self):
+        """Prefetch metadata for every URL in a separate thread"""
+        if not self.downloader.url_list:
+            messagebox.showwarning("Warning", "No URLs to fetch info for!")
+            return
+        
+        def fetch_thread():
+            self.root.after(0, lambda: self.fetch_info_btn.config(state="disabled"))
+            self.log_output(f"🔎 Fetching info for {len(self.downloader.url_list)} URLs...")
+            
+            results = self.downloader.prefetch_metadata(progress_callback=self.update_progress)
+            
+            self.log_output(f"✅ Info available for {len(results)}/{len(self.downloader.url_list)} URLs")
+            self.root.after(0, lambda: self.fetch_info_btn.config(state="normal"))
+            self.root.after(0, self.refresh_url_tree)
+        
+        threading.Thread(target=fetch_thread, daemon=True).start()
+    
     def show_url_context_menu(self, event):
         """Show context menu for URL tree"""
         item = self.url_tree.selection()[0] if self.url_tree.selection() else None
@@ -411,16 +480,28 @@ class BatchDownloaderGUI:
     def update_url_count(self):
         """Update URL count display"""
         count = len(self.downloader.url_list)
-        self.url_count_label.config(text=f"URLs: {count}")
+        text = f"URLs: {count}"
+        
+        # Estimated total size from cached metadata
+        total_size = self.downloader.estimate_total_size() if count else 0
+        if total_size:
+            text += f" (~{total_size / (1024 * 1024):.0f} MB)"
+        self.url_count_label.config(text=text)
     
     def update_progress(self, current, total, percentage, title=""):
         """Update progress display"""
         def update_ui():
             # Update progress label
             if title:
-                self.progress_label.config(text=f"🎵 [{current}/{total}] ({percentage:.1f}%) - {title}")
+                text = f"🎵 [{current}/{total}] ({percentage:.1f}%) - {title}"
             else:
-                self.progress_label.config(text=f"🎵 [{current}/{total}] ({percentage:.1f}%)")
+                text = f"🎵 [{current}/{total}] ({percentage:.1f}%)"
+            
+            # Show adaptive request rate per host
+            rate_summary = self.downloader.get_rate_summary()
+            if rate_summary:
+                text += f"\nRate: {rate_summary}"
+            self.progress_label.config(text=text)
             
             # Update overall progress bar
             self.overall_progress.config(value=percentage)
@@ -478,6 +559,10 @@ class BatchDownloaderGUI:
             self.log_output(f"Type: {self.download_type.get()}")
             self.log_output(f"Folder: {folder}")
             self.log_output(f"Auto Numbering: {'Enabled' if self.auto_numbering.get() else 'Disabled'}")
+            self.log_output(f"Parallel Downloads: {self.parallel_downloads.get()}"
+                            f"{f' ({default_worker_count()})' if self.parallel_downloads.get() == 'auto' else ''}")
+            self.log_output(f"Concurrent Fragments: {self.fragment_concurrency.get()}")
+            self.log_output(f"Queue Order: {self.schedule_policy.get()}")
             self.log_output("="*70)
             
             # Disable UI elements
@@ -489,28 +574,37 @@ class BatchDownloaderGUI:
             template = self.output_template.get() or "%(title)s.%(ext)s"
             auto_numbering = self.auto_numbering.get()
             continue_on_error = self.continue_on_error.get()
+            workers = self.parallel_downloads.get()
+            max_workers = None if workers == "auto" else int(workers)
+            self.downloader.set_fragment_concurrency(self.fragment_concurrency.get())
+            self.downloader.set_schedule_policy(self.schedule_policy.get())
             
             try:
                 if download_type == "video_best":
                     result = self.downloader.batch_download_videos(
                         quality="best", output_template=template, 
                         auto_numbering=auto_numbering, continue_on_error=continue_on_error,
-                        progress_callback=self.update_progress)
+                        progress_callback=self.update_progress, max_workers=max_workers)
                 elif download_type == "video_720p":
                     result = self.downloader.batch_download_videos(
                         quality="720p", output_template=template, 
                         auto_numbering=auto_numbering, continue_on_error=continue_on_error,
-                        progress_callback=self.update_progress)
+                        progress_callback=self.update_progress, max_workers=max_workers)
                 elif download_type == "video_480p":
                     result = self.downloader.batch_download_videos(
                         quality="480p", output_template=template, 
                         auto_numbering=auto_numbering, continue_on_error=continue_on_error,
-                        progress_callback=self.update_progress)
+                        progress_callback=self.update_progress, max_workers=max_workers)
                 elif download_type == "audio_mp3":
                     result = self.downloader.batch_download_audio(
                         audio_format="mp3", output_template=template, 
                         auto_numbering=auto_numbering, continue_on_error=continue_on_error,
-                        progress_callback=self.update_progress)
+                        progress_callback=self.update_progress, max_workers=max_workers)
+                elif download_type == "audio_native":
+                    result = self.downloader.batch_download_audio(
+                        audio_format="native", output_template=template, 
+                        auto_numbering=auto_numbering, continue_on_error=continue_on_error,
+                        progress_callback=self.update_progress, max_workers=max_workers)
                 
                 # Update UI with results
                 self.root.after(0, self.refresh_url_tree)
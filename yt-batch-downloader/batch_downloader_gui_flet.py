@@ -13,7 +13,8 @@ import asyncio
 import time
 
 # Import our batch downloader
-from batch_downloader import BatchDownloader
+from batch_downloader import BatchDownloader, default_worker_count
+from failure_classifier import describe as describe_failure
 
 
 class BatchDownloaderGUI:
@@ -37,6 +38,9 @@ class BatchDownloaderGUI:
         self.continue_on_error = True
         self.embed_thumbnail = True  # NEW: Optional thumbnail embedding
         self.embed_metadata = True   # NEW: Optional metadata embedding
+        self.fragment_concurrency = "auto"  # Parallel DASH/HLS fragments (auto-tuned)
+        self.parallel_downloads = "auto"  # Videos at the same time ("auto" = based on CPU cores)
+        self.schedule_policy = "fifo"  # Queue order (fifo / shortest / largest / round-robin)
         
         # Statistics tracking
         self.start_time = None
@@ -287,10 +291,18 @@ class BatchDownloaderGUI:
             style=ft.ButtonStyle(bgcolor=ft.Colors.RED_100)
         )
         
+        self.fetch_info_btn = ft.ElevatedButton(
+            text="ℹ️ Fetch Info",
+            icon=ft.Icons.INFO_OUTLINE,
+            on_click=self.fetch_video_info,
+            tooltip="Fetch title, duration and size of all URLs (cached)",
+            style=ft.ButtonStyle(bgcolor=ft.Colors.AMBER_100)
+        )
+        
         self.url_count_text = ft.Text("URLs: 0", weight=ft.FontWeight.BOLD, size=14)
         
         button_row = ft.Row([
-            load_btn, save_btn, clear_btn,
+            load_btn, save_btn, clear_btn, self.fetch_info_btn,
             ft.Container(expand=True),  # Spacer
             self.url_count_text
         ])
@@ -331,7 +343,8 @@ class BatchDownloaderGUI:
                 ft.Radio(value="video_best", label="🎬 Video (Best Quality)"),
                 ft.Radio(value="video_720p", label="🎬 Video (720p - Save Bandwidth)"),
                 ft.Radio(value="video_480p", label="🎬 Video (480p - Save Bandwidth)"),
-                ft.Radio(value="audio_mp3", label="🎵 Audio Only (MP3)")
+                ft.Radio(value="audio_mp3", label="🎵 Audio Only (MP3)"),
+                ft.Radio(value="audio_native", label="🎵 Audio Only (Native - No Re-encode)")
             ]),
             value="video_best",
             on_change=self.on_download_type_change
@@ -382,6 +395,54 @@ class BatchDownloaderGUI:
             tooltip="Adds metadata to downloaded files. Disable if you have slow internet."
         )
         
+        # Parallel downloads dropdown
+        workers_dropdown = ft.Dropdown(
+            label="🧵 Parallel Downloads",
+            width=300,
+            options=[
+                ft.dropdown.Option("auto", f"Auto ({default_worker_count()} at once)"),
+                ft.dropdown.Option("1", "1 (sequential)"),
+                ft.dropdown.Option("2", "2"),
+                ft.dropdown.Option("4", "4"),
+                ft.dropdown.Option("8", "8"),
+            ],
+            value=self.parallel_downloads,
+            on_change=self.on_parallel_downloads_change,
+            tooltip="Number of videos downloaded at the same time. Auto is based on CPU cores."
+        )
+        
+        # Concurrent fragments dropdown
+        fragment_dropdown = ft.Dropdown(
+            label="⚡ Concurrent Fragments (DASH/HLS)",
+            width=300,
+            options=[
+                ft.dropdown.Option("auto", "Auto (tuned from speed)"),
+                ft.dropdown.Option("1", "1 (sequential)"),
+                ft.dropdown.Option("2", "2"),
+                ft.dropdown.Option("4", "4"),
+                ft.dropdown.Option("8", "8"),
+                ft.dropdown.Option("16", "16"),
+            ],
+            value=self.fragment_concurrency,
+            on_change=self.on_fragment_concurrency_change,
+            tooltip="Download several fragments of a segmented format at once. Auto ramps up until speed stops improving."
+        )
+        
+        # Queue order dropdown
+        schedule_dropdown = ft.Dropdown(
+            label="📋 Queue Order",
+            width=300,
+            options=[
+                ft.dropdown.Option("fifo", "FIFO (list order)"),
+                ft.dropdown.Option("shortest", "Shortest first"),
+                ft.dropdown.Option("largest", "Largest first"),
+                ft.dropdown.Option("round-robin", "Round-robin by uploader"),
+            ],
+            value=self.schedule_policy,
+            on_change=self.on_schedule_policy_change,
+            tooltip="Order the queue by duration, file size or uploader. Non-FIFO orders fetch video info first (cached)."
+        )
+        
         # Help Text
         help_text = ft.Text(
             "Template variables: %(title)s (title), %(ext)s (extension), %(uploader)s (channel)",
@@ -402,6 +463,9 @@ class BatchDownloaderGUI:
                 ft.Text("🎨 Quality & Metadata Options:", size=12, weight=ft.FontWeight.BOLD),
                 embed_thumbnail_checkbox,
                 embed_metadata_checkbox,
+                workers_dropdown,
+                fragment_dropdown,
+                schedule_dropdown,
                 ft.Text("💡 Tip: Disable thumbnail & metadata for faster downloads on slow internet", 
                        size=10, color=ft.Colors.BLUE_600, italic=True),
                 help_text
@@ -648,6 +712,15 @@ class BatchDownloaderGUI:
             elif url in self.downloader.failed_downloads:
                 status = 'Failed'
                 status_color = ft.Colors.RED_600
+                failure = self.downloader.failure_classes.get(url)
+                if failure:
+                    status = f"Failed ({describe_failure(failure)})"
+            
+            # Show cached metadata when available (no network call)
+            info = self.downloader.get_cached_info(url)
+            if info:
+                duration = int(info.get('duration') or 0)
+                status = f"{status} • {info.get('title', 'Unknown')} ({duration // 60}:{duration % 60:02d})"
             
             url_item = ft.ListTile(
                 title=ft.Text(f"{i}. {url}", size=12),
@@ -668,8 +741,32 @@ class BatchDownloaderGUI:
         """Update URL count display"""
         count = len(self.downloader.url_list)
         self.url_count_text.value = f"URLs: {count}"
+        
+        # Estimated total size from cached metadata
+        total_size = self.downloader.estimate_total_size() if count else 0
+        if total_size:
+            self.url_count_text.value += f" (~{total_size / (1024 * 1024):.0f} MB)"
         self.page.update()
     
+    def fetch_video_info(self, e):
+        """Prefetch metadata for every URL in a separate thread"""
+        if not self.downloader.url_list:
+            self.show_dialog("Warning", "No URLs to fetch info for!")
+            return
+        
+        def fetch_thread():
+            self.fetch_info_btn.disabled = True
+            self.log_output(f"🔎 Fetching info for {len(self.downloader.url_list)} URLs...")
+            self.page.update()
+            
+            results = self.downloader.prefetch_metadata(progress_callback=self.update_progress)
+            
+            self.log_output(f"✅ Info available for {len(results)}/{len(self.downloader.url_list)} URLs")
+            self.fetch_info_btn.disabled = False
+            self.refresh_url_list()
+        
+        threading.Thread(target=fetch_thread, daemon=True).start()
+    
     def on_download_type_change(self, e):
         """Handle download type change"""
         self.download_type = e.control.value
@@ -690,6 +787,18 @@ class BatchDownloaderGUI:
         """Handle embed thumbnail checkbox change"""
         self.embed_thumbnail = e.control.value
     
+    def on_parallel_downloads_change(self, e):
+        """Handle parallel downloads dropdown change"""
+        self.parallel_downloads = e.control.value
+    
+    def on_fragment_concurrency_change(self, e):
+        """Handle concurrent fragments dropdown change"""
+        self.fragment_concurrency = e.control.value
+    
+    def on_schedule_policy_change(self, e):
+        """Handle queue order dropdown change"""
+        self.schedule_policy = e.control.value
+    
     def on_embed_metadata_change(self, e):
         """Handle embed metadata checkbox change"""
         self.embed_metadata = e.control.value
@@ -763,6 +872,10 @@ class BatchDownloaderGUI:
             self.log_output(f"Auto Numbering: {'Enabled' if self.auto_numbering else 'Disabled'}")
             self.log_output(f"Embed Thumbnail: {'Enabled' if self.embed_thumbnail else 'Disabled'}")
             self.log_output(f"Embed Metadata: {'Enabled' if self.embed_metadata else 'Disabled'}")
+            self.log_output(f"Parallel Downloads: {self.parallel_downloads}"
+                            f"{f' ({default_worker_count()})' if self.parallel_downloads == 'auto' else ''}")
+            self.log_output(f"Concurrent Fragments: {self.fragment_concurrency}")
+            self.log_output(f"Queue Order: {self.schedule_policy}")
             self.log_output("="*70)
             
             # Start timer for statistics
@@ -783,6 +896,9 @@ class BatchDownloaderGUI:
             continue_on_error = self.continue_on_error
             embed_thumbnail = self.embed_thumbnail
             embed_metadata = self.embed_metadata
+            max_workers = None if self.parallel_downloads == "auto" else int(self.parallel_downloads)
+            self.downloader.set_fragment_concurrency(self.fragment_concurrency)
+            self.downloader.set_schedule_policy(self.schedule_policy)
             
             try:
                 if download_type == "video_best":
@@ -790,25 +906,31 @@ class BatchDownloaderGUI:
                         quality="best", output_template=template, 
                         auto_numbering=auto_numbering, continue_on_error=continue_on_error,
                         embed_thumbnail=embed_thumbnail, embed_metadata=embed_metadata,
-                        progress_callback=self.update_progress)
+                        progress_callback=self.update_progress, max_workers=max_workers)
                 elif download_type == "video_720p":
                     result = self.downloader.batch_download_videos(
                         quality="720p", output_template=template, 
                         auto_numbering=auto_numbering, continue_on_error=continue_on_error,
                         embed_thumbnail=embed_thumbnail, embed_metadata=embed_metadata,
-                        progress_callback=self.update_progress)
+                        progress_callback=self.update_progress, max_workers=max_workers)
                 elif download_type == "video_480p":
                     result = self.downloader.batch_download_videos(
                         quality="480p", output_template=template, 
                         auto_numbering=auto_numbering, continue_on_error=continue_on_error,
                         embed_thumbnail=embed_thumbnail, embed_metadata=embed_metadata,
-                        progress_callback=self.update_progress)
+                        progress_callback=self.update_progress, max_workers=max_workers)
                 elif download_type == "audio_mp3":
                     result = self.downloader.batch_download_audio(
                         audio_format="mp3", output_template=template, 
                         auto_numbering=auto_numbering, continue_on_error=continue_on_error,
                         embed_thumbnail=embed_thumbnail, embed_metadata=embed_metadata,
-                        progress_callback=self.update_progress)
+                        progress_callback=self.update_progress, max_workers=max_workers)
+                elif download_type == "audio_native":
+                    result = self.downloader.batch_download_audio(
+                        audio_format="native", output_template=template, 
+                        auto_numbering=auto_numbering, continue_on_error=continue_on_error,
+                        embed_thumbnail=embed_thumbnail, embed_metadata=embed_metadata,
+                        progress_callback=self.update_progress, max_workers=max_workers)
                 
                 # Update UI with results
                 try:
@@ -897,6 +1019,11 @@ class BatchDownloaderGUI:
                     elapsed_mins = int(elapsed // 60)
                     elapsed_secs = int(elapsed % 60)
                     self.stats_text.value = f"Elapsed: {elapsed_mins:02d}:{elapsed_secs:02d} | Success: {len(self.downloader.successful_downloads)} | Failed: {len(self.downloader.failed_downloads)}"
+                    
+                    # Show adaptive request rate per host
+                    rate_summary = self.downloader.get_rate_summary()
+                    if rate_summary:
+                        self.stats_text.value += f" | Rate: {rate_summary}"
             
             # Update GUI
             self.page.update()
@@ -959,11 +1086,18 @@ class BatchDownloaderGUI:
             self.show_dialog("Info", "No failed downloads to retry!")
             return
         
-        failed_count = len(self.downloader.failed_downloads)
-        self.log_output(f"🔄 Retrying {failed_count} failed downloads...")
+        # Permanent failures (private, removed, geo-blocked...) would only fail again
+        failed_urls = self.downloader.retryable_failures()
+        for url in self.downloader.failed_downloads:
+            if url not in failed_urls:
+                failure = self.downloader.failure_classes.get(url)
+                self.log_output(f"⛔ Skip ({describe_failure(failure)}): {url}")
+        if not failed_urls:
+            self.show_dialog("Info", "All failed downloads failed permanently, nothing to retry!")
+            return
         
-        # Create new URL list with only failed URLs
-        failed_urls = self.downloader.failed_downloads.copy()
+        failed_count = len(failed_urls)
+        self.log_output(f"🔄 Retrying {failed_count} failed downloads...")
         
         # Clear current lists
         self.downloader.clear_url_list()
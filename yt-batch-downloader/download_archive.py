@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Download Archive
+Arsip SQLite berisi video yang sudah pernah didownload, supaya batch atau
+playlist yang dijalankan ulang bisa langsung skip item yang sudah selesai
+tanpa request metadata ke YouTube. Tabel failures menyimpan download yang
+gagal beserta klasifikasinya (permanen / sementara, lihat failure_classifier).
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+# Default archive file name inside a download folder
+ARCHIVE_FILENAME = ".media_tools_archive.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS downloads (
+    extractor     TEXT NOT NULL,
+    video_id      TEXT NOT NULL,
+    format        TEXT NOT NULL DEFAULT '',
+    output_path   TEXT,
+    size          INTEGER,
+    checksum      TEXT,
+    downloaded_at REAL,
+    PRIMARY KEY (extractor, video_id, format)
+);
+
+CREATE TABLE IF NOT EXISTS failures (
+    extractor     TEXT NOT NULL,
+    video_id      TEXT NOT NULL,
+    category      TEXT NOT NULL,
+    reason        TEXT NOT NULL,
+    error         TEXT,
+    attempts      INTEGER NOT NULL DEFAULT 1,
+    last_attempt  REAL,
+    PRIMARY KEY (extractor, video_id)
+);
+"""
+
+
+def file_checksum(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DownloadArchive:
+    """Indexed on-disk record of finished downloads (thread-safe)"""
+
+    def __init__(self, db_path, compute_checksum: bool = False):
+        """
+        Args:
+            db_path: Path of the SQLite file (created if missing)
+            compute_checksum: Store a SHA-256 of each recorded file. Off by default:
+                              record() runs on the download worker and would re-read
+                              every (multi-GB) file right after it was written
+        """
+        self.db_path = Path(db_path)
+        self.compute_checksum = compute_checksum
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def get(self, extractor: str, video_id: str, fmt: str = "") -> Optional[Dict[str, Any]]:
+        """Return the archive entry of a video, if any"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT output_path, size, checksum, downloaded_at FROM downloads "
+                "WHERE extractor = ? AND video_id = ? AND format = ?",
+                (extractor, video_id, fmt)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'extractor': extractor,
+            'video_id': video_id,
+            'format': fmt,
+            'output_path': row[0],
+            'size': row[1],
+            'checksum': row[2],
+            'downloaded_at': row[3],
+        }
+
+    def is_downloaded(self, extractor: str, video_id: str, fmt: str = "") -> bool:
+        """
+        Check whether a video was already downloaded in this format
+
+        Entries with a known output path only count while that file still exists.
+        Entries imported from a yt-dlp archive have no path and are trusted.
+        """
+        entry = self.get(extractor, video_id, fmt)
+        if entry is None:
+            return False
+        return not entry['output_path'] or Path(entry['output_path']).exists()
+
+    def record(self, extractor: str, video_id: str, fmt: str = "",
+               output_path: Optional[str] = None):
+        """Store (or update) a finished download"""
+        size = None
+        checksum = None
+        if output_path and Path(output_path).is_file():
+            size = Path(output_path).stat().st_size
+            if self.compute_checksum:
+                checksum = file_checksum(Path(output_path))
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO downloads "
+                "(extractor, video_id, format, output_path, size, checksum, downloaded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (extractor, video_id, fmt, output_path, size, checksum, time.time())
+            )
+            # A finished download settles any earlier failure of the video
+            self._conn.execute(
+                "DELETE FROM failures WHERE extractor = ? AND video_id = ?",
+                (extractor, video_id)
+            )
+            self._conn.commit()
+
+    def record_failure(self, extractor: str, video_id: str, category: str, reason: str,
+                       error: Optional[str] = None):
+        """Store a failed download (attempts counts every failure of the video)"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO failures (extractor, video_id, category, reason, error, attempts, last_attempt) "
+                "VALUES (?, ?, ?, ?, ?, 1, ?) "
+                "ON CONFLICT (extractor, video_id) DO UPDATE SET category = excluded.category, "
+                "reason = excluded.reason, error = excluded.error, attempts = attempts + 1, "
+                "last_attempt = excluded.last_attempt",
+                (extractor, video_id, category, reason, error, time.time())
+            )
+            self._conn.commit()
+
+    def get_failure(self, extractor: str, video_id: str) -> Optional[Dict[str, Any]]:
+        """Return the recorded failure of a video, if any"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT category, reason, error, attempts, last_attempt FROM failures "
+                "WHERE extractor = ? AND video_id = ?",
+                (extractor, video_id)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'extractor': extractor,
+            'video_id': video_id,
+            'category': row[0],
+            'reason': row[1],
+            'error': row[2],
+            'attempts': row[3],
+            'last_attempt': row[4],
+        }
+
+    def permanent_failures(self, max_age: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Failures classified as permanent
+
+        Args:
+            max_age: Only failures newer than this many seconds (None = all)
+        """
+        since = time.time() - max_age if max_age is not None else 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT extractor, video_id, reason, error, attempts, last_attempt FROM failures "
+                "WHERE category = 'permanent' AND last_attempt >= ?",
+                (since,)
+            ).fetchall()
+        return [{'extractor': row[0], 'video_id': row[1], 'category': 'permanent', 'reason': row[2],
+                 'error': row[3], 'attempts': row[4], 'last_attempt': row[5]} for row in rows]
+
+    def clear_failures(self, category: Optional[str] = None) -> int:
+        """Forget recorded failures (of one category, or all), returns the number removed"""
+        with self._lock:
+            if category is None:
+                cursor = self._conn.execute("DELETE FROM failures")
+            else:
+                cursor = self._conn.execute("DELETE FROM failures WHERE category = ?", (category,))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def import_ytdlp_archive(self, archive_file, fmt: str = "") -> int:
+        """
+        Import a yt-dlp --download-archive text file ("extractor video_id" per line)
+
+        Returns:
+            Number of entries imported
+        """
+        rows = []
+        with open(archive_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2:
+                    rows.append((parts[0].lower(), parts[1], fmt, time.time()))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO downloads (extractor, video_id, format, downloaded_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+        return len(rows)
+
+    def export_ytdlp_archive(self, archive_file, fmt: str = "") -> int:
+        """
+        Write the entries of one format as a yt-dlp --download-archive text file
+
+        Returns:
+            Number of entries written
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT extractor, video_id, output_path FROM downloads WHERE format = ?",
+                (fmt,)
+            ).fetchall()
+
+        count = 0
+        with open(archive_file, 'w', encoding='utf-8') as f:
+            for extractor, video_id, output_path in rows:
+                if output_path and not Path(output_path).exists():
+                    continue
+                f.write(f"{extractor} {video_id}\n")
+                count += 1
+        return count
+
+    def count(self) -> int:
+        """Number of archived downloads"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM downloads").fetchone()[0]
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Download Benchmark
+Benchmark offline untuk BatchDownloader dan PlaylistDownloader. Media sintetis
+dibuat dengan ffmpeg lavfi lalu disajikan oleh HTTP server lokal; yt-dlp
+mengambilnya lewat generic extractor (URL file langsung untuk batch, feed RSS
+untuk playlist). Hasil: items/s, MB/s, persentil latency per item dan peak RSS,
+untuk mode sequential maupun concurrent, tanpa request ke YouTube.
+
+Contoh:
+    python download_benchmark.py
+    python download_benchmark.py --items 40 --workers 8 --server-rate 2M
+    python download_benchmark.py --scenarios batch-concurrent --json hasil.json
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+from xml.sax.saxutils import escape
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_BATCH_DOWNLOADER_DIR = Path(__file__).resolve().parent
+_PLAYLIST_DOWNLOADER_DIR = _BATCH_DOWNLOADER_DIR.parent / "yt-playlist-downloader"
+for _path in (_BATCH_DOWNLOADER_DIR, _PLAYLIST_DOWNLOADER_DIR):
+    if str(_path) not in sys.path:
+        sys.path.append(str(_path))
+
+from bandwidth import parse_rate, format_rate
+
+SCENARIOS = ["batch-sequential", "batch-concurrent", "playlist"]
+
+FEED_PATH = "/feed.xml"
+CHUNK_SIZE = 64 * 1024
+
+
+# --- Synthetic media -------------------------------------------------------
+
+def generate_media(folder: Path, count: int, duration: float, bitrate: str) -> List[Path]:
+    """
+    Create count small H.264/AAC test videos with ffmpeg lavfi
+
+    Args:
+        folder: Output folder
+        count: Number of files
+        duration: Length of each file in seconds
+        bitrate: Video bitrate (controls the file size), e.g. "1M"
+    """
+    folder.mkdir(parents=True, exist_ok=True)
+    files = []
+    for n in range(1, count + 1):
+        path = folder / f"item_{n:03d}.mp4"
+        files.append(path)
+        if path.exists():
+            continue
+        cmd = [
+            'ffmpeg', '-hide_banner', '-loglevel', 'error', '-y',
+            '-f', 'lavfi', '-i', f'testsrc=size=640x360:rate=25:duration={duration}',
+            # Different tone per file so every item has distinct content
+            '-f', 'lavfi', '-i', f'sine=frequency={200 + n * 10}:duration={duration}',
+            '-c:v', 'libx264', '-preset', 'ultrafast', '-b:v', bitrate,
+            '-c:a', 'aac', '-shortest', '-movflags', '+faststart',
+            str(path),
+        ]
+        subprocess.run(cmd, check=True)
+    return files
+
+
+def _rss_feed(base_url: str, files: List[Path]) -> bytes:
+    """RSS feed that yt-dlp's generic extractor reads as a playlist"""
+    items = "".join(
+        f"<item><title>{escape(path.stem)}</title>"
+        f"<enclosure url=\"{escape(base_url)}/{escape(path.name)}\" "
+        f"length=\"{path.stat().st_size}\" type=\"video/mp4\"/></item>"
+        for path in files
+    )
+    return (f"<?xml version=\"1.0\" encoding=\"UTF-8\"?><rss version=\"2.0\"><channel>"
+            f"<title>Benchmark Playlist</title><link>{escape(base_url)}</link>"
+            f"{items}</channel></rss>").encode('utf-8')
+
+
+# --- Local media server ----------------------------------------------------
+
+class _MediaHandler(SimpleHTTPRequestHandler):
+    """Static files plus the feed, with optional per-connection latency and rate"""
+
+    feed = b""
+    latency = 0.0
+    rate = None
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.path.split('?')[0] == FEED_PATH:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/rss+xml')
+            self.send_header('Content-Length', str(len(self.feed)))
+            self.end_headers()
+            self.wfile.write(self.feed)
+            return
+        super().do_GET()
+
+    def do_HEAD(self):
+        if self.latency:
+            time.sleep(self.latency)
+        super().do_HEAD()
+
+    def copyfile(self, source, outputfile):
+        if not self.rate:
+            return super().copyfile(source, outputfile)
+        # Throttle like a remote server would, one connection at a time
+        started = time.monotonic()
+        sent = 0
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            outputfile.write(chunk)
+            sent += len(chunk)
+            ahead = sent / self.rate - (time.monotonic() - started)
+            if ahead > 0:
+                time.sleep(ahead)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MediaServer:
+    """Serve a folder of synthetic media on 127.0.0.1 in a background thread"""
+
+    def __init__(self, folder: Path, files: List[Path], latency: float = 0.0,
+                 rate: Optional[int] = None):
+        handler = type('BenchmarkHandler', (_MediaHandler,), {'latency': latency, 'rate': rate})
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), partial(handler, directory=str(folder)))
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        handler.feed = _rss_feed(self.base_url, files)
+        self.urls = [f"{self.base_url}/{path.name}" for path in files]
+        self.feed_url = self.base_url + FEED_PATH
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# --- Measurements ----------------------------------------------------------
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile, None for an empty list"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def peak_rss() -> Dict[str, Optional[int]]:
+    """Peak resident memory in bytes of this process and of its largest child"""
+    if resource is None:
+        return {'self': None, 'children': None}
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return {
+        'self': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        'children': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+    }
+
+
+def _folder_bytes(folder: Path) -> int:
+    return sum(path.stat().st_size for path in folder.rglob('*')
+               if path.is_file() and not path.name.endswith(('.part', '.ytdl')))
+
+
+def _quiet():
+    """Silence downloader console output while a scenario runs"""
+    return open(os.devnull, 'w', encoding='utf-8')
+
+
+def run_batch_scenario(urls: List[str], output: Path, workers: int, engine: str,
+                       mode: str, use_rate_limiter: bool) -> Dict[str, Any]:
+    """Download urls with BatchDownloader, timing every item"""
+    from batch_downloader import BatchDownloader
+    from rate_limiter import AdaptiveRateLimiter
+
+    latencies = []
+    lock = threading.Lock()
+
+    class TimedBatchDownloader(BatchDownloader):
+        def _run_yt_dlp(self, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return super()._run_yt_dlp(*args, **kwargs)
+            finally:
+                with lock:
+                    latencies.append(time.perf_counter() - started)
+
+    downloader = TimedBatchDownloader(engine=engine, use_archive=False, use_journal=False)
+    if not downloader.yt_dlp_available:
+        raise RuntimeError("yt-dlp tidak tersedia")
+    downloader.set_download_folder(str(output))
+    # Fixed level: no fragments here, and the user's tuning state stays untouched
+    downloader.set_fragment_concurrency(1)
+    downloader.pipeline_postprocessing = False
+    if not use_rate_limiter:
+        # Measure the downloader itself, not the politeness delay meant for real sites
+        downloader.rate_limiter = AdaptiveRateLimiter(initial_rate=1000, max_rate=1000, burst=1000)
+    downloader.add_urls_from_list(urls)
+
+    started = time.perf_counter()
+    if mode == "audio":
+        result = downloader.batch_download_audio(embed_thumbnail=False, embed_metadata=False,
+                                                 max_workers=workers)
+    else:
+        result = downloader.batch_download_videos(embed_thumbnail=False, embed_metadata=False,
+                                                  max_workers=workers)
+    wall = time.perf_counter() - started
+    return {'ok': result['success'], 'failed': result['failed'], 'wall': wall,
+            'latencies': latencies}
+
+
+def run_playlist_scenario(feed_url: str, output: Path, mode: str) -> Dict[str, Any]:
+    """Download the feed with PlaylistDownloader (one yt-dlp process, items in order)"""
+    from playlist_downloader import PlaylistDownloader
+
+    downloader = PlaylistDownloader(use_archive=False)
+    if not downloader.yt_dlp_available:
+        raise RuntimeError("yt-dlp tidak tersedia")
+    downloader.set_download_folder(str(output))
+    downloader.set_fragment_concurrency(1)
+
+    # Items run one after another: an item's latency is the time until the next one starts
+    starts = {}
+
+    def progress(current, total, percentage, title):
+        starts.setdefault(current, time.perf_counter())
+
+    started = time.perf_counter()
+    download = (downloader.download_audio_playlist if mode == "audio"
+                else downloader.download_video_playlist)
+    download(feed_url, embed_thumbnail=False, embed_metadata=False,
+             continue_on_error=False, progress_callback=progress)
+    finished = time.perf_counter()
+
+    marks = [starts[n] for n in sorted(starts)] + [finished]
+    latencies = [b - a for a, b in zip(marks, marks[1:])]
+    ok = sum(1 for path in output.iterdir() if path.is_file() and path.suffix not in ('.part', '.ytdl'))
+    return {'ok': ok, 'failed': max(0, len(starts) - ok),
+            'wall': finished - started, 'latencies': latencies}
+
+
+def run_scenario(name: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one scenario in this process and summarize it"""
+    output = Path(tempfile.mkdtemp(prefix=f"bench_{name}_"))
+    try:
+        with _quiet() as devnull:
+            stdout = sys.stdout
+            sys.stdout = devnull
+            try:
+                if name == "playlist":
+                    raw = run_playlist_scenario(config['feed_url'], output, config['mode'])
+                else:
+                    workers = 1 if name == "batch-sequential" else config['workers']
+                    raw = run_batch_scenario(config['urls'], output, workers, config['engine'],
+                                             config['mode'], config['rate_limiter'])
+            finally:
+                sys.stdout = stdout
+        total_bytes = _folder_bytes(output)
+    finally:
+        shutil.rmtree(output, ignore_errors=True)
+
+    wall = raw['wall']
+    latencies = raw['latencies']
+    return {
+        'scenario': name,
+        'items_ok': raw['ok'],
+        'items_failed': raw['failed'],
+        'wall_seconds': wall,
+        'items_per_second': raw['ok'] / wall if wall > 0 else None,
+        'bytes': total_bytes,
+        'bytes_per_second': total_bytes / wall if wall > 0 else None,
+        'latency_p50': percentile(latencies, 50),
+        'latency_p90': percentile(latencies, 90),
+        'latency_p99': percentile(latencies, 99),
+        'latency_max': max(latencies) if latencies else None,
+        'peak_rss': peak_rss(),
+    }
+
+
+def run_isolated(name: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a scenario in a fresh interpreter so its peak RSS is its own"""
+    fd, result_path = tempfile.mkstemp(prefix='bench_', suffix='.json')
+    os.close(fd)
+    try:
+        cmd = [sys.executable, str(Path(__file__).resolve()),
+               '--run-scenario', name, '--config', json.dumps(config), '--result-file', result_path]
+        completed = subprocess.run(cmd)
+        if completed.returncode != 0:
+            return {'scenario': name, 'error': f"exit code {completed.returncode}"}
+        with open(result_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    finally:
+        os.remove(result_path)
+
+
+# --- Report ----------------------------------------------------------------
+
+def _fmt_seconds(value: Optional[float]) -> str:
+    return f"{value:.2f}s" if value is not None else "-"
+
+
+def _fmt_bytes(value: Optional[int]) -> str:
+    return f"{value / 1024 ** 2:.0f} MB" if value else "-"
+
+
+def print_report(results: List[Dict[str, Any]]):
+    print("\n" + "=" * 100)
+    print(f"{'Scenario':<18}{'OK/Fail':>9}{'Wall':>9}{'Items/s':>9}{'MB/s':>8}"
+          f"{'p50':>8}{'p90':>8}{'p99':>8}{'RSS':>9}{'RSS child':>11}")
+    print("-" * 100)
+    for r in results:
+        if 'error' in r:
+            print(f"{r['scenario']:<18}❌ {r['error']}")
+            continue
+        mb_per_second = (r['bytes_per_second'] or 0) / 1024 ** 2
+        print(f"{r['scenario']:<18}{r['items_ok']:>5}/{r['items_failed']:<3}"
+              f"{_fmt_seconds(r['wall_seconds']):>9}{r['items_per_second'] or 0:>9.2f}"
+              f"{mb_per_second:>8.1f}{_fmt_seconds(r['latency_p50']):>8}"
+              f"{_fmt_seconds(r['latency_p90']):>8}{_fmt_seconds(r['latency_p99']):>8}"
+              f"{_fmt_bytes(r['peak_rss']['self']):>9}{_fmt_bytes(r['peak_rss']['children']):>11}")
+    print("=" * 100)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark batch & playlist downloader")
+    parser.add_argument('--items', type=int, default=20, help="Jumlah file media sintetis")
+    parser.add_argument('--duration', type=float, default=5, help="Durasi tiap file (detik)")
+    parser.add_argument('--bitrate', default="2M", help="Bitrate video, menentukan ukuran file")
+    parser.add_argument('--workers', type=int, default=4, help="Workers untuk batch-concurrent")
+    parser.add_argument('--engine', default="auto", choices=["auto", "subprocess", "inprocess"])
+    parser.add_argument('--mode', default="video", choices=["video", "audio"])
+    parser.add_argument('--scenarios', nargs='+', default=SCENARIOS, choices=SCENARIOS)
+    parser.add_argument('--server-rate', default=None,
+                        help="Batas kecepatan per koneksi server lokal, mis. 2M (default: tanpa batas)")
+    parser.add_argument('--server-latency', type=float, default=0.0,
+                        help="Delay tiap request ke server lokal (ms)")
+    parser.add_argument('--rate-limiter', action='store_true',
+                        help="Pakai rate limiter default BatchDownloader (default: dimatikan)")
+    parser.add_argument('--media-dir', default=None,
+                        help="Folder media sintetis (dipakai ulang antar run, default: folder temp)")
+    parser.add_argument('--json', default=None, help="Simpan hasil ke file JSON")
+    # Internal: run one scenario inside a child process
+    parser.add_argument('--run-scenario', help=argparse.SUPPRESS)
+    parser.add_argument('--config', help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scenario:
+        result = run_scenario(args.run_scenario, json.loads(args.config))
+        with open(args.result_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return
+
+    if not shutil.which('ffmpeg'):
+        print("❌ ffmpeg tidak ditemukan, dibutuhkan untuk membuat media sintetis.")
+        sys.exit(1)
+
+    media_dir = Path(args.media_dir) if args.media_dir else Path(tempfile.mkdtemp(prefix="bench_media_"))
+    try:
+        print(f"🎞️  Membuat {args.items} file media sintetis di {media_dir}...")
+        files = generate_media(media_dir, args.items, args.duration, args.bitrate)
+        size = sum(path.stat().st_size for path in files)
+        print(f"✅ {len(files)} file, total {size / 1024 ** 2:.1f} MB")
+
+        server_rate = parse_rate(args.server_rate)
+        with MediaServer(media_dir, files, args.server_latency / 1000.0, server_rate) as server:
+            print(f"🌐 Server lokal: {server.base_url} (per koneksi: {format_rate(server_rate)}, "
+                  f"latency: {args.server_latency:.0f} ms)")
+            config = {
+                'urls': server.urls,
+                'feed_url': server.feed_url,
+                'workers': args.workers,
+                'engine': args.engine,
+                'mode': args.mode,
+                'rate_limiter': args.rate_limiter,
+            }
+            results = []
+            for name in args.scenarios:
+                print(f"⏱️  Menjalankan {name}...")
+                results.append(run_isolated(name, config))
+    finally:
+        if not args.media_dir:
+            shutil.rmtree(media_dir, ignore_errors=True)
+
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': results}, f, indent=2)
+        print(f"💾 Hasil disimpan ke {args.json}")
+
+
+if __name__ == "__main__":
+    main()
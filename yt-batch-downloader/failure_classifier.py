@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Failure Classifier
+Menggolongkan error yt-dlp menjadi permanen (video private, dihapus, diblokir
+di negara ini, age-gated, khusus member) atau sementara (jaringan, HTTP 5xx,
+rate limit, stall). Item yang gagal permanen tidak perlu di-retry dan bisa
+di-skip di run berikutnya; yang sementara di-retry dengan exponential backoff.
+"""
+
+import random
+import re
+from typing import Optional, Dict, List, Tuple
+
+PERMANENT = "permanent"
+TRANSIENT = "transient"
+
+# Reason -> label for console output and GUIs
+REASONS = {
+    'private': "video private",
+    'unavailable': "video dihapus / tidak tersedia",
+    'geo_blocked': "diblokir di negara ini",
+    'age_restricted': "age-restricted (perlu login)",
+    'members_only': "khusus member channel",
+    'copyright': "dihapus karena copyright",
+    'unsupported': "URL tidak didukung",
+    'upcoming': "premiere / live belum mulai",
+    'rate_limited': "rate limit / bot check",
+    'network': "error jaringan / server",
+    'stalled': "download macet",
+    'unknown': "error tidak dikenal",
+}
+
+# (pattern, reason, category), first match wins: specific messages before generic ones
+_RULES: List[Tuple[str, str, str]] = [
+    (r"not a bot|HTTP Error 429|Too Many Requests", 'rate_limited', TRANSIENT),
+    (r"download stalled", 'stalled', TRANSIENT),
+    (r"Premieres in|live event will begin|This live event|is_upcoming|will begin in", 'upcoming', TRANSIENT),
+    (r"Private video|This video is private|private video", 'private', PERMANENT),
+    (r"confirm your age|age[- ]restricted|inappropriate for some users", 'age_restricted', PERMANENT),
+    (r"members[- ]only|Join this channel|available to this channel's members", 'members_only', PERMANENT),
+    (r"not made this video available in your country|blocked it in your country|"
+     r"not available in your country|geo[- ]?restrict", 'geo_blocked', PERMANENT),
+    # Only the extractor's own "video unavailable" messages are permanent: a URL or a
+    # title that merely contains "copyright", or a 404 on an expired media/fragment URL,
+    # must not blacklist the video
+    (r"due to a copyright claim|on copyright grounds|copyright infringement", 'copyright', PERMANENT),
+    (r"Unsupported URL|is not a valid URL", 'unsupported', PERMANENT),
+    (r"Video unavailable|This video has been removed|This video is no longer available|"
+     r"account associated with this video has been terminated|This video does not exist",
+     'unavailable', PERMANENT),
+    (r"HTTP Error (?:5\d\d|404|410)|timed out|Connection reset|Connection refused|Temporary failure|"
+     r"Name or service not known|IncompleteRead|Unable to download|Remote end closed|"
+     r"SSL|getaddrinfo|Network is unreachable", 'network', TRANSIENT),
+]
+_COMPILED = [(re.compile(pattern, re.IGNORECASE), reason, category) for pattern, reason, category in _RULES]
+
+# "ERROR: [youtube] dQw4w9WgXcQ: Private video..." -> extractor, video id, message
+_ERROR_LINE = re.compile(r"ERROR:\s*\[([\w:]+)\]\s*([\w-]+):\s*(.*)")
+
+
+def classify_failure(error: Optional[str]) -> Dict[str, str]:
+    """
+    Classify a yt-dlp error message
+
+    Returns:
+        Dict with 'category' (PERMANENT or TRANSIENT) and 'reason' (one of REASONS).
+        Unknown errors are transient: retrying them is cheaper than losing an item.
+    """
+    text = error or ""
+    for pattern, reason, category in _COMPILED:
+        if pattern.search(text):
+            return {'category': category, 'reason': reason}
+    return {'category': TRANSIENT, 'reason': 'unknown'}
+
+
+def is_permanent(failure: Optional[Dict[str, str]]) -> bool:
+    return bool(failure) and failure.get('category') == PERMANENT
+
+
+def parse_error_line(line: str) -> Optional[Tuple[str, str, str]]:
+    """(extractor, video_id, message) of a yt-dlp ERROR line about one video, else None"""
+    match = _ERROR_LINE.search(line)
+    if match is None:
+        return None
+    extractor = match.group(1).split(':')[0].lower()
+    return extractor, match.group(2), match.group(3).strip()
+
+
+def backoff_delay(attempt: int, base: float = 5.0, maximum: float = 300.0,
+                  jitter: float = 0.0) -> float:
+    """
+    Exponential backoff: base, 2x base, 4x base, ... capped at maximum
+
+    jitter spreads the delay randomly by +/- that fraction, so items that
+    failed together do not all come back at the same moment.
+    """
+    delay = min(maximum, base * 2 ** max(0, attempt - 1))
+    if jitter:
+        delay *= 1 + random.uniform(-jitter, jitter)
+    return delay
+
+
+def describe(failure: Optional[Dict[str, str]]) -> str:
+    """Console text of a classification, e.g. 'permanen: video private'"""
+    if not failure:
+        return ""
+    kind = "permanen" if failure.get('category') == PERMANENT else "sementara"
+    return f"{kind}: {REASONS.get(failure.get('reason'), failure.get('reason'))}"
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Fragment Tuner
+Mengatur --concurrent-fragments yt-dlp secara otomatis per host: mulai dari
+1 fragment, dinaikkan (1, 2, 4, 8, 16) selama throughput per job masih naik,
+lalu berhenti di level terbaik. Hasil tuning disimpan supaya run berikutnya
+(batch maupun playlist) langsung mulai dari level yang sudah terbukti cepat.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Union
+
+# Settings accepted by BatchDownloader / PlaylistDownloader
+AUTO = "auto"
+
+# Levels tried while ramping up
+LEVELS = [1, 2, 4, 8, 16]
+
+# A level must beat the previous one by this much to count as an improvement
+MIN_GAIN = 1.10
+
+# Samples averaged per level before deciding to ramp
+SAMPLES_PER_LEVEL = 2
+
+# Weight of a new sample in the running throughput average
+SMOOTHING = 0.3
+
+# Re-probe the next level after this many jobs at a settled level
+REPROBE_EVERY = 25
+
+DEFAULT_STATE_PATH = Path.home() / ".media_tools" / "fragment_tuning.json"
+
+
+def parse_fragment_setting(value: Union[str, int, None]) -> Union[str, int]:
+    """Normalize a GUI/CLI value ("auto", "4", 4) to AUTO or a positive int"""
+    if value is None or str(value).strip().lower() in ("", AUTO):
+        return AUTO
+    count = int(value)
+    if count < 1:
+        raise ValueError("concurrent fragments harus >= 1")
+    return count
+
+
+class FragmentThroughput:
+    """
+    Progress hook that measures the throughput of fragmented downloads in one job
+
+    Only formats that yt-dlp downloads in fragments (DASH/HLS) are counted,
+    since --concurrent-fragments has no effect on the others. yt-dlp marks
+    those by fragment_index/fragment_count on its 'downloading' statuses (the
+    'finished' status of FragmentFD carries neither), so the rate is taken from
+    downloaded_bytes/elapsed of the last 'downloading' status of every stream.
+    With concurrent fragments the hook is called from yt-dlp's fragment threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # stream (tmpfilename) -> [base bytes, base elapsed, last bytes, last elapsed]
+        self._streams: Dict[str, List[float]] = {}
+
+    def __call__(self, status: Dict[str, Any]):
+        if status.get('status') != 'downloading':
+            return
+        index = status.get('fragment_index')
+        if index is None and not status.get('fragment_count'):
+            return
+        downloaded = status.get('downloaded_bytes')
+        elapsed = status.get('elapsed')
+        if downloaded is None or elapsed is None:
+            return
+        key = status.get('tmpfilename') or status.get('filename') or ''
+        with self._lock:
+            sample = self._streams.get(key)
+            if sample is None:
+                # A resumed download already counts the fragments of the earlier run in
+                # downloaded_bytes, while elapsed starts at 0: measure from here on
+                resumed = index is not None and index > 1
+                base = [downloaded, elapsed] if resumed else [0.0, 0.0]
+                self._streams[key] = base + [downloaded, elapsed]
+            else:
+                sample[2] = max(sample[2], downloaded)
+                sample[3] = max(sample[3], elapsed)
+
+    @property
+    def throughput(self) -> Optional[float]:
+        """Bytes per second over all fragmented streams of the job, None if none"""
+        with self._lock:
+            size = sum(sample[2] - sample[0] for sample in self._streams.values())
+            seconds = sum(sample[3] - sample[1] for sample in self._streams.values())
+        return size / seconds if seconds > 0 and size > 0 else None
+
+
+class FragmentTuner:
+    """Hill-climbs the fragment concurrency per host across jobs (thread-safe)"""
+
+    def __init__(self, state_path: Optional[Path] = DEFAULT_STATE_PATH):
+        """
+        Args:
+            state_path: JSON file to keep the tuning between runs (None = memory only)
+        """
+        self.state_path = Path(state_path) if state_path else None
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.state_path or not self.state_path.exists():
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        if not self.state_path:
+            return
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.state_path, 'w', encoding='utf-8') as f:
+                json.dump(self._hosts, f, indent=2)
+        except OSError:
+            pass
+
+    def _host(self, key: str) -> Dict[str, Any]:
+        return self._hosts.setdefault(key, {
+            'level': LEVELS[0],
+            'settled': False,
+            'throughput': {},   # level -> smoothed bytes/s
+            'samples': {},      # level -> number of samples
+            'jobs_since_probe': 0,
+        })
+
+    def suggest(self, key: str) -> int:
+        """Fragment concurrency to use for the next job on this host"""
+        with self._lock:
+            return self._host(key)['level']
+
+    def report(self, key: str, level: int, throughput: Optional[float]):
+        """
+        Feed the measured throughput of a finished job
+
+        Args:
+            key: Host key (see rate_limiter.rate_key)
+            level: Fragment concurrency the job used
+            throughput: Bytes per second (None = job had no fragmented streams)
+        """
+        if not throughput:
+            return
+        with self._lock:
+            host = self._host(key)
+            name = str(level)
+            previous = host['throughput'].get(name)
+            host['throughput'][name] = (throughput if previous is None
+                                        else previous + SMOOTHING * (throughput - previous))
+            host['samples'][name] = host['samples'].get(name, 0) + 1
+            if level == host['level']:
+                self._step(host)
+            self._save()
+
+    def _step(self, host: Dict[str, Any]):
+        """Move to the next level, settle, or fall back (caller holds the lock)"""
+        level = host['level']
+        if host['samples'].get(str(level), 0) < SAMPLES_PER_LEVEL:
+            return
+
+        index = LEVELS.index(level) if level in LEVELS else 0
+        lower = LEVELS[index - 1] if index > 0 else None
+        current = host['throughput'][str(level)]
+
+        # The last step up did not pay off: go back to fewer connections and stay there
+        if lower is not None and host['throughput'].get(str(lower)):
+            if current < host['throughput'][str(lower)] * MIN_GAIN:
+                host['level'] = lower
+                host['settled'] = True
+                host['jobs_since_probe'] = 0
+                return
+
+        if not host['settled']:
+            if index + 1 < len(LEVELS):
+                host['level'] = LEVELS[index + 1]
+            else:
+                host['settled'] = True
+            return
+
+        # Settled: occasionally probe one level up in case the link got faster
+        host['jobs_since_probe'] += 1
+        if host['jobs_since_probe'] >= REPROBE_EVERY and index + 1 < len(LEVELS):
+            host['jobs_since_probe'] = 0
+            upper = str(LEVELS[index + 1])
+            host['samples'][upper] = 0
+            host['throughput'].pop(upper, None)
+            host['level'] = LEVELS[index + 1]
+
+    def summary(self) -> Dict[str, int]:
+        """Current level per host"""
+        with self._lock:
+            return {key: host['level'] for key, host in self._hosts.items()}
+
+
+# Shared by every downloader in this process
+tuner = FragmentTuner()
+
+
+def fragment_args(setting: Union[str, int], key: str) -> List[str]:
+    """--concurrent-fragments arguments for a job, from a fixed count or the tuner"""
+    count = tuner.suggest(key) if setting == AUTO else int(setting)
+    return ['--concurrent-fragments', str(count)] if count > 1 else []
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Job Journal
+Journal append-only (JSON per baris) untuk status batch download. Setiap
+perubahan status (queued/running/done/failed) langsung di-fsync, jadi kalau
+proses atau GUI mati di tengah batch, item yang belum selesai bisa dilanjutkan.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+# Default journal file name inside a download folder
+JOURNAL_FILENAME = ".batch_journal.jsonl"
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobJournal:
+    """Append-only, fsync'd record of batch item state transitions"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._file = None
+
+    def _write(self, record: Dict[str, Any]):
+        record['ts'] = time.time()
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(json.dumps(record) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def start_batch(self, mode: str, options: Dict[str, Any], urls: List[str]):
+        """Start a new journal (replacing the old one) with every URL queued"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            self._file = open(self.path, 'w', encoding='utf-8')
+        # One header line holds the whole queue, so big batches cost a single fsync
+        self._write({'event': 'batch', 'mode': mode, 'options': options, 'urls': urls})
+
+    def add_urls(self, urls: List[str]):
+        """Queue more URLs (streamed batches), numbered after the ones already journaled"""
+        if urls:
+            self._write({'event': 'urls', 'urls': urls})
+
+    def mark(self, index: int, url: str, state: str, **extra):
+        """Record a state transition of one item (index is 1-based)"""
+        record = {'event': 'item', 'index': index, 'url': url, 'state': state}
+        record.update(extra)
+        self._write(record)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    @staticmethod
+    def load(path) -> Optional[Dict[str, Any]]:
+        """
+        Replay a journal file
+
+        Returns:
+            Dict with 'mode', 'options', 'urls' and 'items' (index -> state info),
+            or None if the file has no batch header. A torn last line from a
+            crash is ignored.
+        """
+        path = Path(path)
+        if not path.exists():
+            return None
+
+        batch = None
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if record.get('event') == 'batch':
+                    batch = {
+                        'mode': record['mode'],
+                        'options': record['options'],
+                        'urls': record['urls'],
+                        'items': {
+                            i: {'url': url, 'state': QUEUED, 'partial_files': []}
+                            for i, url in enumerate(record['urls'], 1)
+                        },
+                    }
+                elif record.get('event') == 'urls' and batch is not None:
+                    for url in record['urls']:
+                        batch['urls'].append(url)
+                        batch['items'][len(batch['urls'])] = {
+                            'url': url, 'state': QUEUED, 'partial_files': []
+                        }
+                elif record.get('event') == 'item' and batch is not None:
+                    item = batch['items'].get(record['index'])
+                    if item is None:
+                        continue
+                    item['state'] = record['state']
+                    if record.get('partial') and record['partial'] not in item['partial_files']:
+                        item['partial_files'].append(record['partial'])
+                    for key in ('filepath', 'error'):
+                        if key in record:
+                            item[key] = record[key]
+        return batch
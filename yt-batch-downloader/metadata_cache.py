@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Metadata Cache
+Cache SQLite untuk info video (judul, durasi, uploader, ukuran, daftar format)
+dengan masa berlaku (TTL), supaya metadata cukup diambil sekali lalu dipakai
+ulang untuk pemilihan format, nama file, estimasi ukuran dan tampilan list.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+from url_utils import parse_video_key
+
+# Default cache location, shared by every download folder
+DEFAULT_CACHE_PATH = Path.home() / ".media_tools" / "metadata_cache.db"
+
+# Default freshness window (seconds)
+DEFAULT_TTL = 24 * 60 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    cache_key  TEXT PRIMARY KEY,
+    data       TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+
+def cache_key(url: str) -> str:
+    """Canonical cache key: 'extractor:id' when known, otherwise the URL"""
+    key = parse_video_key(url)
+    return f"{key[0]}:{key[1]}" if key else url.strip()
+
+
+def summarize_info(info: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the fields later stages need from a yt-dlp info dict"""
+    formats: List[Dict[str, Any]] = []
+    for f in info.get('formats') or []:
+        formats.append({
+            'format_id': f.get('format_id'),
+            'ext': f.get('ext'),
+            'height': f.get('height'),
+            'vcodec': f.get('vcodec'),
+            'acodec': f.get('acodec'),
+            'filesize': f.get('filesize') or f.get('filesize_approx'),
+            'tbr': f.get('tbr'),
+        })
+
+    filesize = info.get('filesize') or info.get('filesize_approx')
+    if not filesize and info.get('requested_formats'):
+        filesize = sum((f.get('filesize') or f.get('filesize_approx') or 0)
+                       for f in info['requested_formats']) or None
+
+    return {
+        'id': info.get('id'),
+        'title': info.get('title', 'Unknown'),
+        'duration': info.get('duration', 0),
+        'uploader': info.get('uploader', 'Unknown'),
+        'view_count': info.get('view_count', 0),
+        'filesize': filesize,
+        'formats': formats,
+    }
+
+
+class MetadataCache:
+    """On-disk video metadata cache with expiry (thread-safe)"""
+
+    def __init__(self, db_path=DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL):
+        """
+        Args:
+            db_path: Path of the SQLite file (created if missing)
+            ttl: Seconds before a cached entry is considered stale
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return cached metadata of a URL if it is still fresh"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, fetched_at FROM metadata WHERE cache_key = ?",
+                (cache_key(url),)
+            ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def put(self, url: str, metadata: Dict[str, Any]):
+        """Store metadata (as returned by summarize_info) for a URL"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO metadata (cache_key, data, fetched_at) VALUES (?, ?, ?)",
+                (cache_key(url), json.dumps(metadata), time.time())
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete stale entries, return how many were removed"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM metadata WHERE fetched_at < ?", (time.time() - self.ttl,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
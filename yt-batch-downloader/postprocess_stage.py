@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Post-Processing Stage
+Tahap kedua pipeline batch download: embed thumbnail, metadata dan konversi
+audio (ffmpeg, berat di CPU) dijalankan di pool terpisah, sementara worker
+download sudah lanjut ke URL berikutnya. Kedua tahap dihubungkan
+dengan antrian terbatas supaya file yang menunggu diproses tidak menumpuk.
+"""
+
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from typing import Optional, Dict, Any, Callable, List
+
+# Flags whose work happens after the download (ffmpeg / mutagen, CPU bound)
+POSTPROCESS_FLAGS = {'--embed-thumbnail', '--add-metadata', '--embed-metadata', '-x',
+                     '--extract-audio', '--embed-subs', '--embed-chapters'}
+# Post-processing flags that take a value
+POSTPROCESS_OPTIONS = {'--audio-format', '--audio-quality', '--remux-video', '--recode-video'}
+
+
+def default_postprocess_workers() -> int:
+    """One post-processing job per CPU core"""
+    return max(1, os.cpu_count() or 1)
+
+
+def split_postprocess_args(args: List[str]):
+    """
+    Split yt-dlp arguments into (network args, post-processing args)
+
+    The network args still select the same format and file name, so the
+    post-processing run finds the downloaded file.
+    """
+    network, post = [], []
+    i = 0
+    while i < len(args):
+        if args[i] in POSTPROCESS_OPTIONS and i + 1 < len(args):
+            post += args[i:i + 2]
+            i += 2
+            continue
+        (post if args[i] in POSTPROCESS_FLAGS else network).append(args[i])
+        i += 1
+    return network, post
+
+
+class PostProcessStage:
+    """
+    Bounded queue plus worker pool for post-processing jobs
+
+    The pool is sized to the CPU cores. The heavy work runs in ffmpeg
+    processes started by yt-dlp's post-processors, so worker threads are
+    enough, and it never blocks the download workers (only a full queue
+    does, as back-pressure).
+    """
+
+    def __init__(self, run_job: Callable[[Dict[str, Any]], None],
+                 workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 on_worker_exit: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            run_job: Function that post-processes one job dict
+            workers: Parallel post-processing jobs (default: CPU cores)
+            max_pending: Downloaded items allowed to wait for post-processing
+                         (default: 2 per worker)
+            on_worker_exit: Called by each worker thread when the pool stops
+                            (e.g. to close that thread's YoutubeDL instances)
+        """
+        self.run_job = run_job
+        self.on_worker_exit = on_worker_exit
+        self.workers = workers or default_postprocess_workers()
+        self._queue = queue.Queue(maxsize=max_pending or self.workers * 2)
+        # Info dicts handed from the download to the post-processing run
+        self.work_dir = tempfile.mkdtemp(prefix='ytdlp_pp_')
+        self._counter = 0
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._worker, daemon=True)
+                         for _ in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def info_json_path(self) -> str:
+        """Fresh file name for the info dict of one item"""
+        with self._lock:
+            self._counter += 1
+            return os.path.join(self.work_dir, f"{self._counter}.info.json")
+
+    def submit(self, job: Dict[str, Any]):
+        """Queue a downloaded item, blocks while the queue is full"""
+        self._queue.put(job)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _worker(self):
+        try:
+            while True:
+                job = self._queue.get()
+                if job is None:
+                    return
+                try:
+                    self.run_job(job)
+                except Exception as e:
+                    print(f"❌ Post-processing error: {e}")
+                    on_done = job.get('on_done')
+                    if on_done:
+                        on_done(False)
+        finally:
+            if self.on_worker_exit:
+                self.on_worker_exit()
+
+    def close(self):
+        """Wait until every queued job is post-processed, then stop the pool"""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Adaptive Rate Limiter
+Token bucket per host dengan kontrol AIMD (additive increase, multiplicative
+decrease): rate naik pelan-pelan selama request sukses, dan turun setengah
+saat server mulai membalas 429 / minta verifikasi bot.
+"""
+
+import re
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+# Error messages from yt-dlp that mean "you are going too fast"
+THROTTLE_PATTERNS = re.compile(
+    r"HTTP Error 429|Too Many Requests|rate[- ]?limit|"
+    r"confirm you.re not a bot|HTTP Error 503",
+    re.IGNORECASE
+)
+
+# Hosts that belong to the same site/extractor
+HOST_ALIASES = {
+    'youtu.be': 'youtube.com',
+    'youtube-nocookie.com': 'youtube.com',
+}
+
+
+def rate_key(url: str) -> str:
+    """Return the host key a URL is rate limited under"""
+    host = (urlparse(url).hostname or '').lower()
+    for prefix in ('www.', 'm.', 'music.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    return HOST_ALIASES.get(host, host) or 'unknown'
+
+
+def is_throttled(error_text: Optional[str]) -> bool:
+    """Check whether a yt-dlp error message is a throttling signal"""
+    return bool(error_text) and bool(THROTTLE_PATTERNS.search(error_text))
+
+
+class _Bucket:
+    """Token bucket state for one host"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class AdaptiveRateLimiter:
+    """
+    Limit how fast new downloads are started, per host.
+
+    Every worker calls acquire() before a request and report() after it.
+    Rates are in requests per second.
+    """
+
+    def __init__(self, initial_rate: float = 0.5, min_rate: float = 0.05,
+                 max_rate: float = 5.0, increase: float = 0.05,
+                 decrease: float = 0.5, burst: float = 1.0):
+        """
+        Args:
+            initial_rate: Starting rate (0.5 = one request every 2 seconds)
+            min_rate: Lowest rate after repeated throttling
+            max_rate: Highest rate reached while everything succeeds
+            increase: Rate added after each successful request
+            decrease: Factor applied to the rate on a throttling signal
+            burst: Number of requests allowed back-to-back
+        """
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.burst = burst
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, key: str) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(self.initial_rate, self.burst)
+        return bucket
+
+    def acquire(self, key: str) -> float:
+        """Block until a request to this host is allowed, return seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                bucket = self._bucket(key)
+                bucket.refill(time.monotonic())
+                if bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    return waited
+                delay = (1 - bucket.tokens) / bucket.rate
+            time.sleep(delay)
+            waited += delay
+
+    def report(self, key: str, success: bool, error_text: Optional[str] = None) -> bool:
+        """
+        Feed the result of a request back into the controller
+
+        Returns:
+            True if the error was recognised as throttling
+        """
+        throttled = not success and is_throttled(error_text)
+        with self._lock:
+            bucket = self._bucket(key)
+            if throttled:
+                bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+                # Drain the bucket so the next request waits a full interval
+                bucket.tokens = 0
+            elif success:
+                bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+        return throttled
+
+    def current_rate(self, key: str) -> float:
+        """Current allowed requests per second for a host"""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            return bucket.rate if bucket else self.initial_rate
+
+    def rates(self) -> Dict[str, float]:
+        """Current rate of every host seen so far"""
+        with self._lock:
+            return {key: bucket.rate for key, bucket in self._buckets.items()}
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Batch Scheduler
+Urutan antrian batch download berdasarkan metadata yang sudah di-prefetch
+(durasi, ukuran file, uploader). Nomor item tetap mengikuti posisi di list,
+jadi auto numbering tidak berubah; yang berubah hanya urutan pengerjaan.
+"""
+
+from typing import Optional, Dict, Any, List, Tuple, Callable
+
+FIFO = "fifo"
+SHORTEST_FIRST = "shortest"
+LARGEST_FIRST = "largest"
+ROUND_ROBIN = "round-robin"
+
+# Policy -> label for the CLI and GUIs
+POLICIES = {
+    FIFO: "FIFO (urutan list)",
+    SHORTEST_FIRST: "Shortest first (durasi terpendek dulu)",
+    LARGEST_FIRST: "Largest first (file terbesar dulu)",
+    ROUND_ROBIN: "Round-robin per uploader",
+}
+
+Item = Tuple[int, str]
+
+
+def parse_policy(value: Optional[str]) -> str:
+    """Normalize a GUI/CLI value to one of POLICIES"""
+    policy = (value or FIFO).strip().lower()
+    if policy not in POLICIES:
+        raise ValueError(f"Scheduler policy tidak dikenal: {value} "
+                         f"(pilihan: {', '.join(POLICIES)})")
+    return policy
+
+
+def estimated_size(info: Optional[Dict[str, Any]]) -> Optional[float]:
+    """File size from metadata, or duration x best bitrate when yt-dlp gave no size"""
+    if not info:
+        return None
+    if info.get('filesize'):
+        return info['filesize']
+    bitrates = [f['tbr'] for f in info.get('formats') or [] if f.get('tbr')]
+    if info.get('duration') and bitrates:
+        return info['duration'] * max(bitrates) * 1000 / 8
+    return None
+
+
+def order_items(items: List[Item], policy: str,
+                lookup: Callable[[str], Optional[Dict[str, Any]]]) -> List[Item]:
+    """
+    Order (item_number, url) pairs for a batch queue
+
+    Args:
+        items: Items in list order
+        policy: One of POLICIES
+        lookup: Returns cached metadata of a URL (None if unknown)
+
+    Items without the needed metadata keep their list order after the known ones.
+    """
+    if policy == FIFO or len(items) < 2:
+        return list(items)
+
+    infos = {url: lookup(url) for _, url in items}
+
+    if policy == SHORTEST_FIRST:
+        def key(item):
+            info = infos[item[1]] or {}
+            duration = info.get('duration') or None
+            size = estimated_size(info)
+            return (duration is None, duration or 0, size or 0, item[0])
+        return sorted(items, key=key)
+
+    if policy == LARGEST_FIRST:
+        def key(item):
+            size = estimated_size(infos[item[1]])
+            return (size is None, -(size or 0), item[0])
+        return sorted(items, key=key)
+
+    # Round-robin: one item per uploader in turn, uploaders in order of first appearance
+    groups: Dict[str, List[Item]] = {}
+    for item in items:
+        info = infos[item[1]] or {}
+        groups.setdefault(info.get('uploader') or 'Unknown', []).append(item)
+    ordered = []
+    queues = list(groups.values())
+    while queues:
+        for group in queues:
+            ordered.append(group.pop(0))
+        queues = [group for group in queues if group]
+    return ordered
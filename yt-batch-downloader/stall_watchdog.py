@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Stall Watchdog
+Mendeteksi download yang "hidup tapi macet": koneksi masih mengirim data tapi
+cuma beberapa KB/s, sehingga socket timeout yt-dlp tidak pernah terpicu.
+Throughput job diukur dalam sliding window; kalau di bawah batas minimum
+lebih lama dari timeout, job dihentikan supaya bisa diantrikan ulang dengan
+koneksi baru.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Optional, Dict, Any
+
+# Defaults used by BatchDownloader (bytes/s, seconds)
+DEFAULT_MIN_RATE = 20 * 1024
+DEFAULT_STALL_TIMEOUT = 30
+DEFAULT_WINDOW = 10
+
+# A job limited by the bandwidth cap is only stalled below this share of its limit
+RATE_CAP_SHARE = 0.5
+
+STALLED_ERROR = "ERROR: download stalled"
+
+
+class StallWatchdog:
+    """
+    Sliding-window throughput monitor for one download job (thread-safe)
+
+    Use the instance as a yt-dlp progress hook and call check() regularly
+    (from the hook or from a timer). Only 'downloading' time counts, so
+    extraction and post-processing (ffmpeg merge) never look like a stall.
+    """
+
+    def __init__(self, min_rate: int = DEFAULT_MIN_RATE,
+                 timeout: float = DEFAULT_STALL_TIMEOUT,
+                 window: float = DEFAULT_WINDOW):
+        """
+        Args:
+            min_rate: Throughput floor in bytes per second
+            timeout: Seconds the job may stay below the floor before it is stalled
+            window: Length of the sliding window the throughput is measured over
+        """
+        self.min_rate = min_rate
+        self.timeout = timeout
+        self.window = window
+        # Current --limit-rate of the job (set by the engine), None = unlimited
+        self.rate_cap: Optional[int] = None
+        self.stalled = False
+        self._lock = threading.Lock()
+        self._samples = deque()      # (time, total bytes)
+        self._per_file: Dict[str, float] = {}
+        self._total = 0.0
+        self._armed_at: Optional[float] = None
+        self._slow_since: Optional[float] = None
+
+    def __call__(self, status: Dict[str, Any]):
+        now = time.monotonic()
+        with self._lock:
+            if status.get('status') != 'downloading':
+                # Between streams or post-processing: nothing is expected to flow
+                self._armed_at = None
+                self._slow_since = None
+                return
+            # downloaded_bytes restarts for every stream (video, audio), sum the deltas
+            name = status.get('tmpfilename') or status.get('filename') or ''
+            downloaded = status.get('downloaded_bytes') or 0
+            previous = self._per_file.get(name, 0)
+            if downloaded > previous:
+                self._total += downloaded - previous
+            self._per_file[name] = downloaded
+
+            if self._armed_at is None:
+                self._armed_at = now
+                self._samples.clear()
+            self._samples.append((now, self._total))
+
+    def _floor(self) -> float:
+        if self.rate_cap:
+            return min(self.min_rate, self.rate_cap * RATE_CAP_SHARE)
+        return self.min_rate
+
+    def rate(self, now: Optional[float] = None) -> Optional[float]:
+        """Throughput over the last window, None until a full window was observed"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return self._rate(now)
+
+    def _rate(self, now: float) -> Optional[float]:
+        if self._armed_at is None or now - self._armed_at < self.window:
+            return None
+        start = now - self.window
+        # Keep one sample at or before the window start as the baseline
+        while len(self._samples) > 1 and self._samples[1][0] <= start:
+            self._samples.popleft()
+        baseline = self._samples[0][1] if self._samples else self._total
+        # Silence since the last sample counts as zero progress
+        return (self._total - baseline) / self.window
+
+    def check(self) -> bool:
+        """Return True (and stay True) once the job is below the floor for too long"""
+        if self.stalled:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            rate = self._rate(now)
+            if rate is None or rate >= self._floor():
+                self._slow_since = None
+                return False
+            if self._slow_since is None:
+                self._slow_since = now
+            if now - self._slow_since >= self.timeout:
+                self.stalled = True
+        return self.stalled
+
+    def describe(self) -> str:
+        """Console text for a stalled job"""
+        rate = self.rate()
+        return (f"di bawah {self._floor() / 1024:.0f} KB/s selama lebih dari {self.timeout:.0f} detik"
+                + (f" ({rate / 1024:.1f} KB/s)" if rate is not None else ""))
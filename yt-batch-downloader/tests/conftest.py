@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The modules are imported the way the tools import them (folder on sys.path)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
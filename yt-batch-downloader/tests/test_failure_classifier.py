@@ -0,0 +1,52 @@
+import pytest
+
+from failure_classifier import (PERMANENT, TRANSIENT, backoff_delay, classify_failure,
+                                is_permanent, parse_error_line)
+
+
+@pytest.mark.parametrize('error, reason', [
+    ("ERROR: [youtube] abc123def45: Private video. Sign in if you've been granted access to this video",
+     'private'),
+    ("ERROR: [youtube] abc123def45: Video unavailable. This video is no longer available due to a "
+     "copyright claim by Some Label", 'copyright'),
+    ("ERROR: [youtube] abc123def45: Video unavailable. This video has been removed by the uploader",
+     'unavailable'),
+    ("ERROR: [youtube] abc123def45: Video unavailable. The uploader has not made this video available "
+     "in your country", 'geo_blocked'),
+    ("ERROR: [vimeo] 123456: This video does not exist.", 'unavailable'),
+])
+def test_extractor_messages_are_permanent(error, reason):
+    assert classify_failure(error) == {'category': PERMANENT, 'reason': reason}
+
+
+@pytest.mark.parametrize('error', [
+    # Expired googlevideo / fragment URL, the next attempt extracts fresh ones
+    "ERROR: unable to download video data: HTTP Error 404: Not Found",
+    "ERROR: fragment 12 not found, unable to continue: HTTP Error 410: Gone",
+    "ERROR: [youtube] abc123def45: Unable to download webpage: HTTP Error 503: Service Unavailable",
+    # Words in a title or URL are not an extractor verdict
+    "ERROR: Postprocessing: Conversion failed for 'Copyright Free Music - Does Not Exist.webm'",
+])
+def test_media_errors_are_transient(error):
+    assert classify_failure(error)['category'] == TRANSIENT
+
+
+def test_rate_limit_wins_over_generic_rules():
+    failure = classify_failure("ERROR: [youtube] abc123def45: Sign in to confirm you're not a bot")
+    assert failure == {'category': TRANSIENT, 'reason': 'rate_limited'}
+
+
+def test_unknown_errors_are_retried():
+    assert classify_failure(None) == {'category': TRANSIENT, 'reason': 'unknown'}
+    assert not is_permanent(classify_failure("something odd"))
+
+
+def test_parse_error_line():
+    assert parse_error_line("ERROR: [youtube:tab] abc-123_x: Video unavailable") == (
+        'youtube', 'abc-123_x', 'Video unavailable')
+    assert parse_error_line("ERROR: unable to download video data") is None
+
+
+def test_backoff_delay_doubles_up_to_maximum():
+    assert [backoff_delay(attempt, 5, 30) for attempt in range(1, 6)] == [5, 10, 20, 30, 30]
+    assert 7.5 <= backoff_delay(2, 5, 30, jitter=0.25) <= 12.5
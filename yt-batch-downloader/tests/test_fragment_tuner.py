@@ -0,0 +1,88 @@
+from fragment_tuner import FragmentThroughput, FragmentTuner, LEVELS, SAMPLES_PER_LEVEL
+from ytdlp_engine import PROGRESS_PREFIX, parse_progress_line
+
+MB = 1024 * 1024
+
+
+def fragment_statuses(tmpfilename, fragments, fragment_size, seconds_per_fragment, first=1):
+    """Statuses shaped like yt-dlp's FragmentFD: downloading per fragment, finished without fragment info"""
+    statuses = []
+    for index in range(first, fragments + 1):
+        statuses.append({
+            'status': 'downloading',
+            'downloaded_bytes': index * fragment_size,
+            'total_bytes_estimate': fragments * fragment_size,
+            'fragment_index': index,
+            'fragment_count': fragments,
+            'elapsed': (index - first + 1) * seconds_per_fragment,
+            'speed': fragment_size / seconds_per_fragment,
+            'filename': tmpfilename[:-5],
+            'tmpfilename': tmpfilename,
+        })
+    statuses.append({
+        'status': 'finished',
+        'downloaded_bytes': fragments * fragment_size,
+        'total_bytes': fragments * fragment_size,
+        'filename': tmpfilename[:-5],
+        'elapsed': (fragments - first + 1) * seconds_per_fragment,
+    })
+    return statuses
+
+
+def test_throughput_of_fragmented_streams():
+    observer = FragmentThroughput()
+    for status in fragment_statuses("video.f137.mp4.part", 10, MB, 0.5):
+        observer(status)
+    for status in fragment_statuses("audio.f140.m4a.part", 4, MB, 0.5):
+        observer(status)
+    assert observer.throughput == 2 * MB
+
+
+def test_plain_http_download_is_not_measured():
+    observer = FragmentThroughput()
+    observer({'status': 'downloading', 'downloaded_bytes': 5 * MB, 'total_bytes': 10 * MB,
+              'elapsed': 1.0, 'speed': 5 * MB, 'filename': 'a.mp4', 'tmpfilename': 'a.mp4.part'})
+    observer({'status': 'finished', 'downloaded_bytes': 10 * MB, 'total_bytes': 10 * MB,
+              'elapsed': 2.0, 'filename': 'a.mp4'})
+    assert observer.throughput is None
+
+
+def test_resumed_download_measures_only_this_run():
+    observer = FragmentThroughput()
+    # Fragments 1-5 came from an earlier run, their bytes are in downloaded_bytes
+    for status in fragment_statuses("video.mp4.part", 10, MB, 1.0, first=6):
+        observer(status)
+    assert observer.throughput == MB
+
+
+def test_subprocess_progress_lines():
+    observer = FragmentThroughput()
+    lines = [
+        f"{PROGRESS_PREFIX}downloading|{n * MB}|NA|{8 * MB}|{MB}|{n * 0.25}|{n}|8|v.mp4.part|v.mp4"
+        for n in range(1, 9)
+    ]
+    # FragmentFD's finished status has no fragment fields, the template prints NA
+    lines.append(f"{PROGRESS_PREFIX}finished|{8 * MB}|{8 * MB}|NA|NA|2.0|NA|NA|NA|v.mp4")
+    for line in lines:
+        observer(parse_progress_line(line))
+    assert observer.throughput == 4 * MB
+
+
+def test_tuner_ramps_up_while_throughput_improves():
+    tuner = FragmentTuner(state_path=None)
+    assert tuner.suggest("youtube") == LEVELS[0]
+    for level, rate in ((1, 1 * MB), (2, 2 * MB)):
+        for _ in range(SAMPLES_PER_LEVEL):
+            tuner.report("youtube", level, rate)
+    assert tuner.suggest("youtube") == 4
+    # No gain at 4: back to 2 and settled
+    for _ in range(SAMPLES_PER_LEVEL):
+        tuner.report("youtube", 4, 2 * MB)
+    assert tuner.suggest("youtube") == 2
+
+
+def test_tuner_ignores_jobs_without_fragments():
+    tuner = FragmentTuner(state_path=None)
+    for _ in range(5):
+        tuner.report("youtube", 1, FragmentThroughput().throughput)
+    assert tuner.suggest("youtube") == 1
@@ -0,0 +1,54 @@
+import threading
+import time
+import types
+
+from ytdlp_engine import InProcessEngine
+
+
+class FakeYoutubeDL:
+    """Just enough of yt_dlp.YoutubeDL for metadata extraction"""
+
+    def __init__(self, params):
+        self.params = params
+
+    def add_post_hook(self, hook):
+        pass
+
+    def add_progress_hook(self, hook):
+        pass
+
+    def extract_info(self, url, download=True):
+        if url == "slow":
+            time.sleep(1)
+        return {'id': url, 'thread': threading.current_thread().name}
+
+    def sanitize_info(self, info):
+        return info
+
+    def close(self):
+        pass
+
+
+def fake_yt_dlp():
+    return types.SimpleNamespace(
+        YoutubeDL=FakeYoutubeDL,
+        parse_options=lambda args: types.SimpleNamespace(ydl_opts={}),
+    )
+
+
+def test_extract_info_gives_up_at_timeout():
+    engine = InProcessEngine(fake_yt_dlp())
+    started = time.monotonic()
+    assert engine.extract_info([], "slow", timeout=0.1) is None
+    assert time.monotonic() - started < 0.5
+    # The abandoned extraction does not block the next URL
+    assert engine.extract_info([], "fast", timeout=1)['id'] == "fast"
+    engine.close()
+
+
+def test_extract_info_reuses_helper_thread():
+    engine = InProcessEngine(fake_yt_dlp())
+    first = engine.extract_info([], "a")
+    second = engine.extract_info([], "b")
+    assert first['thread'] == second['thread'] != threading.current_thread().name
+    engine.close()
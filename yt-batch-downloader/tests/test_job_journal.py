@@ -0,0 +1,88 @@
+import json
+
+from batch_downloader import BatchDownloader
+from job_journal import DONE, FAILED, QUEUED, RUNNING, JobJournal
+
+
+def test_load_replays_state_transitions(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = JobJournal(path)
+    journal.start_batch("video", {'quality': "720p"}, ["u1", "u2"])
+    journal.add_urls(["u3"])
+    journal.mark(1, "u1", RUNNING, partial="a.mp4.part")
+    journal.mark(1, "u1", RUNNING, partial="a.mp4.part")
+    journal.mark(1, "u1", DONE, filepath="a.mp4")
+    journal.mark(2, "u2", RUNNING, partial="b.webm.part")
+    journal.mark(3, "u3", FAILED, error="ERROR: Private video")
+    journal.close()
+
+    batch = JobJournal.load(path)
+
+    assert batch['mode'] == "video"
+    assert batch['options'] == {'quality': "720p"}
+    assert batch['urls'] == ["u1", "u2", "u3"]
+    assert batch['items'][1] == {'url': "u1", 'state': DONE, 'partial_files': ["a.mp4.part"],
+                                 'filepath': "a.mp4"}
+    # Interrupted while running: its partial file is known for the resume
+    assert batch['items'][2] == {'url': "u2", 'state': RUNNING, 'partial_files': ["b.webm.part"]}
+    assert batch['items'][3]['error'] == "ERROR: Private video"
+
+
+def test_load_ignores_torn_line_and_unknown_items(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = JobJournal(path)
+    journal.start_batch("audio", {}, ["u1"])
+    journal.mark(5, "u5", DONE)
+    journal.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'event': 'item', 'index': 1, 'url': "u1", 'state': DONE})[:20])
+
+    batch = JobJournal.load(path)
+
+    assert list(batch['items']) == [1]
+    assert batch['items'][1]['state'] == QUEUED
+
+
+def test_start_batch_replaces_old_journal(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = JobJournal(path)
+    journal.start_batch("video", {}, ["old"])
+    journal.start_batch("video", {}, ["new"])
+    journal.close()
+
+    assert JobJournal.load(path)['urls'] == ["new"]
+
+
+def test_load_without_header(tmp_path):
+    assert JobJournal.load(tmp_path / "missing.jsonl") is None
+    path = tmp_path / "journal.jsonl"
+    path.write_text('{"event": "item", "index": 1, "url": "u1", "state": "done"}\n', encoding='utf-8')
+    assert JobJournal.load(path) is None
+
+
+def finished_with_failure(path):
+    journal = JobJournal(path)
+    journal.start_batch("video", {}, ["u1", "u2"])
+    journal.mark(1, "u1", DONE)
+    journal.mark(2, "u2", FAILED, error="ERROR: Private video")
+    journal.close()
+
+
+def test_finished_batch_with_failures_is_not_resumable(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    finished_with_failure(path)
+    downloader = BatchDownloader(engine="subprocess", use_archive=False)
+
+    assert downloader.get_resumable_batch(path) is None
+    assert downloader.get_resumable_batch(path, include_failed=True)['pending'] == [2]
+
+
+def test_interrupted_batch_is_resumable(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    finished_with_failure(path)
+    journal = JobJournal(path)
+    journal.add_urls(["u3"])
+    journal.close()
+    downloader = BatchDownloader(engine="subprocess", use_archive=False)
+
+    assert downloader.get_resumable_batch(path)['pending'] == [3]
@@ -0,0 +1,53 @@
+import pytest
+
+from scheduler import (FIFO, LARGEST_FIRST, ROUND_ROBIN, SHORTEST_FIRST, estimated_size,
+                       order_items, parse_policy)
+
+INFOS = {
+    'a': {'duration': 600, 'filesize': 50, 'uploader': "x"},
+    'b': {'duration': 60, 'filesize': 300, 'uploader': "x"},
+    'c': None,
+    'd': {'duration': 60, 'filesize': 10, 'uploader': "y"},
+    'e': {'duration': 100, 'formats': [{'tbr': 800}, {'tbr': 1600}], 'uploader': "x"},
+}
+ITEMS = [(i, url) for i, url in enumerate("abcde", 1)]
+
+
+def order(policy):
+    return [url for _, url in order_items(ITEMS, policy, INFOS.get)]
+
+
+def test_fifo_keeps_list_order():
+    assert order(FIFO) == list("abcde")
+
+
+def test_shortest_first_ties_by_size_unknown_last():
+    assert order(SHORTEST_FIRST) == list("dbeac")
+
+
+def test_largest_first_estimates_size_from_bitrate():
+    # e: 100 s x 1600 kbit/s = 20 MB
+    assert order(LARGEST_FIRST) == list("ebadc")
+
+
+def test_round_robin_alternates_uploaders():
+    # Uploaders in order of first appearance, unknown metadata grouped as one uploader
+    assert order(ROUND_ROBIN) == list("acdbe")
+
+
+def test_item_numbers_are_kept():
+    assert order_items(ITEMS, SHORTEST_FIRST, INFOS.get)[0] == (4, 'd')
+
+
+def test_estimated_size():
+    assert estimated_size(None) is None
+    assert estimated_size({'filesize': 123, 'duration': 10}) == 123
+    assert estimated_size({'duration': 10, 'formats': [{'tbr': 8}]}) == 10000
+    assert estimated_size({'duration': 10, 'formats': [{'tbr': None}]}) is None
+
+
+def test_parse_policy():
+    assert parse_policy(None) == FIFO
+    assert parse_policy(" Shortest ") == SHORTEST_FIRST
+    with pytest.raises(ValueError):
+        parse_policy("random")
@@ -0,0 +1,51 @@
+import pytest
+
+from url_utils import UrlList, canonical_key
+
+
+def test_spellings_of_one_video_are_one_item():
+    urls = UrlList([
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ",
+        "https://m.youtube.com/watch?v=dQw4w9WgXcQ&t=10",
+        "https://www.youtube.com/watch?v=9bZkp7q19f0",
+    ])
+    assert len(urls) == 2
+    # The first spelling added is the one kept
+    assert urls[0] == "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    assert "https://youtu.be/9bZkp7q19f0" in urls
+    assert urls.get("https://youtu.be/dQw4w9WgXcQ") == urls[0]
+
+
+def test_canonical_key_of_non_video_url_is_the_url():
+    assert canonical_key(" https://example.com/a ") == ('url', "https://example.com/a")
+
+
+def test_indexing_after_remove():
+    urls = UrlList(f"https://example.com/{n}" for n in range(5))
+    urls.remove("https://example.com/1")
+    urls.discard("https://example.com/3")
+    urls.discard("https://example.com/missing")
+    assert urls[1] == "https://example.com/2"
+    assert urls[-1] == "https://example.com/4"
+    assert urls[0:2] == ["https://example.com/0", "https://example.com/2"]
+    assert list(urls) == ["https://example.com/0", "https://example.com/2", "https://example.com/4"]
+    assert len(urls) == 3
+    # A removed video can be added again, at the end
+    assert urls.add("https://example.com/1")
+    assert urls[-1] == "https://example.com/1"
+
+
+def test_remove_unknown_url_raises_value_error():
+    with pytest.raises(ValueError):
+        UrlList().remove("https://example.com/x")
+
+
+def test_iteration_sees_urls_appended_meanwhile():
+    urls = UrlList(["https://example.com/0"])
+    seen = []
+    for url in urls:
+        seen.append(url)
+        if len(urls) < 3:
+            urls.add(f"https://example.com/{len(urls)}")
+    assert seen == ["https://example.com/0", "https://example.com/1", "https://example.com/2"]
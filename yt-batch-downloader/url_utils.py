@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+URL Utilities
+Parse video URL secara lokal (tanpa request ke network) menjadi key
+(extractor, video_id) yang sama dengan format --download-archive yt-dlp,
+plus UrlList: daftar URL berurutan dengan index hash pada key tersebut.
+"""
+
+import re
+from typing import Optional, Tuple, Iterable, Iterator, List
+from urllib.parse import urlparse, parse_qs
+
+YOUTUBE_HOSTS = {
+    'youtube.com', 'www.youtube.com', 'm.youtube.com', 'music.youtube.com',
+    'youtube-nocookie.com', 'www.youtube-nocookie.com',
+}
+
+# YouTube video IDs are always 11 characters from this alphabet
+YOUTUBE_ID_RE = re.compile(r'^[A-Za-z0-9_-]{11}$')
+
+# Path prefixes that are followed directly by a video ID
+YOUTUBE_ID_PATHS = ('shorts', 'embed', 'live', 'v', 'e')
+
+
+def _youtube_id(url: str) -> Optional[str]:
+    parsed = urlparse(url if '://' in url else 'https://' + url)
+    host = (parsed.hostname or '').lower()
+    parts = [p for p in parsed.path.split('/') if p]
+
+    candidate = None
+    if host == 'youtu.be':
+        candidate = parts[0] if parts else None
+    elif host in YOUTUBE_HOSTS:
+        if parts[:1] == ['watch']:
+            candidate = parse_qs(parsed.query).get('v', [None])[0]
+        elif len(parts) >= 2 and parts[0] in YOUTUBE_ID_PATHS:
+            candidate = parts[1]
+
+    if candidate and YOUTUBE_ID_RE.match(candidate):
+        return candidate
+    return None
+
+
+def parse_video_key(url: str) -> Optional[Tuple[str, str]]:
+    """
+    Return (extractor, video_id) for a video URL, or None if unknown
+
+    youtu.be/X, youtube.com/watch?v=X&t=30 and m.youtube.com/watch?v=X
+    all give ('youtube', 'X').
+    """
+    url = url.strip()
+    video_id = _youtube_id(url)
+    if video_id:
+        return ('youtube', video_id)
+    return None
+
+
+def canonical_key(url: str) -> Tuple[str, str]:
+    """Dedup key of a URL: (extractor, video_id) when known, otherwise ('url', url)"""
+    url = url.strip()
+    return parse_video_key(url) or ('url', url)
+
+
+class UrlList:
+    """
+    Ordered URL list backed by a hash index on canonical_key()
+
+    Membership, add and remove are O(1), so importing a huge list is
+    linear. Different spellings of the same video count as one item;
+    the first spelling added is the one kept. Iteration, len(), `in`,
+    indexing and remove() behave like the plain list used before.
+    """
+
+    def __init__(self, urls: Iterable[str] = ()):
+        # canonical key -> position in _entries
+        self._items = {}
+        # (canonical key, URL) in order; None where an item was removed
+        self._entries = []
+        self._removed = 0
+        self.extend(urls)
+
+    def add(self, url: str) -> bool:
+        """Append a URL, return False if the same video is already listed"""
+        key = canonical_key(url)
+        if key in self._items:
+            return False
+        self._items[key] = len(self._entries)
+        self._entries.append((key, url.strip()))
+        return True
+
+    def append(self, url: str):
+        self.add(url)
+
+    def extend(self, urls: Iterable[str]) -> int:
+        """Append several URLs, return how many were new"""
+        return sum(1 for url in urls if self.add(url))
+
+    def get(self, url: str) -> Optional[str]:
+        """The listed URL for the same video as url, if any"""
+        position = self._items.get(canonical_key(url))
+        return None if position is None else self._entries[position][1]
+
+    def remove(self, url: str):
+        """Remove the item for url (any spelling of the same video)"""
+        try:
+            position = self._items.pop(canonical_key(url))
+        except KeyError:
+            raise ValueError(f"{url} is not in the URL list")
+        # Leave a hole, positions are compacted on the next indexed access
+        self._entries[position] = None
+        self._removed += 1
+
+    def discard(self, url: str):
+        if url in self:
+            self.remove(url)
+
+    def clear(self):
+        self._items.clear()
+        self._entries = []
+        self._removed = 0
+
+    def copy(self) -> List[str]:
+        return list(self)
+
+    def _compact(self):
+        """Drop the holes left by remove() (a new list, so running iterators are unaffected)"""
+        self._entries = [entry for entry in self._entries if entry is not None]
+        self._items = {key: position for position, (key, _) in enumerate(self._entries)}
+        self._removed = 0
+
+    def __contains__(self, url) -> bool:
+        return isinstance(url, str) and canonical_key(url) in self._items
+
+    def __iter__(self) -> Iterator[str]:
+        # URLs appended while iterating are included, like a plain list
+        for entry in self._entries:
+            if entry is not None:
+                yield entry[1]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if self._removed:
+            self._compact()
+        if isinstance(index, slice):
+            return [url for _, url in self._entries[index]]
+        return self._entries[index][1]
+
+    def __repr__(self) -> str:
+        return f"UrlList({list(self)!r})"
@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+yt-dlp Engines
+Cara menjalankan yt-dlp untuk BatchDownloader:
+- SubprocessEngine: satu proses `python -m yt_dlp` per URL (cara lama)
+- InProcessEngine: objek yt_dlp.YoutubeDL yang dipakai ulang di dalam proses
+  (tanpa start-up interpreter, import, dan inisialisasi extractor per URL)
+
+Kedua engine menerima argumen command line yang sama (tanpa URL), jadi
+BatchDownloader cukup membangun satu daftar argumen.
+"""
+
+import importlib
+import json
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import List, Optional, Dict, Any, Callable
+
+from bandwidth import governor
+from stall_watchdog import StallWatchdog, STALLED_ERROR
+
+# How often the watchdog of a subprocess job is polled (seconds)
+WATCHDOG_INTERVAL = 1.0
+
+# Machine-readable progress line for subprocess jobs, parsed back into a
+# dict shaped like a yt-dlp progress hook argument
+PROGRESS_PREFIX = '[progress] '
+PROGRESS_TEMPLATE = (
+    'download:' + PROGRESS_PREFIX +
+    '%(progress.status)s|%(progress.downloaded_bytes)s|%(progress.total_bytes)s|'
+    '%(progress.total_bytes_estimate)s|%(progress.speed)s|%(progress.elapsed)s|'
+    '%(progress.fragment_index)s|%(progress.fragment_count)s|%(progress.tmpfilename)s|'
+    '%(progress.filename)s'
+)
+
+
+def _number(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def parse_progress_line(line: str) -> Optional[Dict[str, Any]]:
+    """Turn a PROGRESS_TEMPLATE line into a progress dict, or None"""
+    if not line.startswith(PROGRESS_PREFIX):
+        return None
+    parts = line[len(PROGRESS_PREFIX):].split('|', 9)
+    if len(parts) != 10:
+        return None
+    (status, downloaded, total, estimate, speed, elapsed, fragment_index, fragment_count,
+     tmpfilename, filename) = parts
+    return {
+        'status': status,
+        'downloaded_bytes': _number(downloaded),
+        'total_bytes': _number(total),
+        'total_bytes_estimate': _number(estimate),
+        'speed': _number(speed),
+        'elapsed': _number(elapsed),
+        'fragment_index': _number(fragment_index),
+        'fragment_count': _number(fragment_count),
+        'tmpfilename': None if tmpfilename == 'NA' else tmpfilename,
+        'filename': None if filename == 'NA' else filename,
+    }
+
+
+def format_progress(progress: Dict[str, Any]) -> str:
+    """Short console line for a progress dict (replaces yt-dlp's own progress bar)"""
+    downloaded = progress.get('downloaded_bytes') or 0
+    total = progress.get('total_bytes') or progress.get('total_bytes_estimate')
+    speed = progress.get('speed')
+    line = f"[download] {downloaded / 1024 / 1024:.1f} MB"
+    if total:
+        line = f"[download] {downloaded / total * 100:5.1f}% of {total / 1024 / 1024:.1f} MB"
+    if speed:
+        line += f" at {speed / 1024 / 1024:.2f} MB/s"
+    return line
+
+
+def option_value(args: List[str], name: str) -> Optional[str]:
+    """Value of the last `name VALUE` pair in a yt-dlp argument list"""
+    value = None
+    for i, arg in enumerate(args[:-1]):
+        if arg == name:
+            value = args[i + 1]
+    return value
+
+
+def replace_option(args: List[str], name: str, value: str) -> List[str]:
+    """Copy of args with every `name VALUE` pair replaced by one `name value`"""
+    result = []
+    i = 0
+    while i < len(args):
+        if args[i] == name and i + 1 < len(args):
+            i += 2
+            continue
+        result.append(args[i])
+        i += 1
+    return result + [name, value]
+
+
+def load_yt_dlp():
+    """Import yt_dlp as a module, or return None if it is not installed"""
+    try:
+        return importlib.import_module('yt_dlp')
+    except ImportError:
+        return None
+
+
+class SubprocessEngine:
+    """Run every yt-dlp call in a fresh `python -m yt_dlp` process"""
+
+    name = "subprocess"
+
+    def __init__(self):
+        self.base_cmd = [sys.executable, '-m', 'yt_dlp']
+
+    def download(self, args: List[str], url: str,
+                 progress_hook: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 watchdog: Optional[StallWatchdog] = None) -> Dict[str, Any]:
+        """
+        Download a URL, streaming yt-dlp output to stdout
+
+        Args:
+            args: yt-dlp command line arguments (without the URL)
+            url: Video URL
+            progress_hook: Called with a yt-dlp style progress dict
+
+        Returns:
+            Dict with 'success' (bool), 'error' (ERROR lines from yt-dlp),
+            'filepath' (final file, if known) and 'stalled' (killed by the watchdog)
+        """
+        extra = []
+        if progress_hook or watchdog:
+            extra += ['--newline', '--progress-template', PROGRESS_TEMPLATE]
+        # A subprocess cannot be re-limited later, it keeps its share of the global cap
+        bandwidth_token = governor.register()
+        rate = governor.allocation(bandwidth_token)
+        if rate:
+            extra += ['--limit-rate', str(rate)]
+        if watchdog:
+            watchdog.rate_cap = rate
+        # With a saved info dict yt-dlp ignores (and warns about) the URL
+        target = [] if '--load-info-json' in args else [url]
+        try:
+            return self._run(args + extra + target, progress_hook, watchdog)
+        finally:
+            governor.unregister(bandwidth_token)
+
+    def postprocess(self, args: List[str], info_json: str) -> Dict[str, Any]:
+        """
+        Run only the post-processors of an already downloaded video
+
+        yt-dlp loads the saved info dict (no extraction request), finds the media
+        file already on disk and goes straight to the post-processors.
+
+        Args:
+            args: The same arguments as the download, plus the post-processing flags
+            info_json: Info dict written by the download
+
+        Returns:
+            Same dict as download()
+        """
+        return self._run(args + ['--load-info-json', info_json])
+
+    def _run(self, cmd_args: List[str],
+             progress_hook: Optional[Callable[[Dict[str, Any]], None]] = None,
+             watchdog: Optional[StallWatchdog] = None) -> Dict[str, Any]:
+        # Let yt-dlp write the final path to a side file (--print would imply --quiet)
+        fd, path_file = tempfile.mkstemp(prefix='ytdlp_', suffix='.txt')
+        os.close(fd)
+        cmd = self.base_cmd + cmd_args + ['--print-to-file', 'after_move:filepath', path_file]
+        try:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                     text=True, universal_newlines=True)
+            if watchdog:
+                # Polled from a timer too: a job that went silent sends no progress lines
+                threading.Thread(target=self._watch, args=(process, watchdog), daemon=True).start()
+
+            errors = []
+            for line in process.stdout:
+                line = line.strip()
+                progress = parse_progress_line(line) if (progress_hook or watchdog) else None
+                if progress:
+                    if watchdog:
+                        watchdog(progress)
+                    if progress_hook:
+                        progress_hook(progress)
+                        print(format_progress(progress))
+                    continue
+                print(line)
+                if line.startswith('ERROR:'):
+                    errors.append(line)
+
+            process.wait()
+
+            with open(path_file, 'r', encoding='utf-8') as f:
+                paths = [line.strip() for line in f if line.strip()]
+        finally:
+            os.remove(path_file)
+
+        stalled = bool(watchdog and watchdog.stalled)
+        if stalled:
+            errors.append(STALLED_ERROR)
+        return {
+            'success': process.returncode == 0 and not stalled,
+            'error': '\n'.join(errors),
+            'filepath': paths[-1] if paths else None,
+            'stalled': stalled,
+        }
+
+    @staticmethod
+    def _watch(process: subprocess.Popen, watchdog: StallWatchdog):
+        """Kill the yt-dlp process once the watchdog reports a stall"""
+        while process.poll() is None:
+            if watchdog.check():
+                print(f"🐌 Download macet ({watchdog.describe()}), job dihentikan")
+                process.kill()
+                return
+            time.sleep(WATCHDOG_INTERVAL)
+
+    def extract_info(self, args: List[str], url: str, timeout: int = 30) -> Optional[Dict[str, Any]]:
+        """Return the info dict of a URL without downloading"""
+        cmd = self.base_cmd + ['--dump-json'] + args + [url]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return None
+
+        if result.returncode != 0:
+            return None
+        try:
+            return json.loads(result.stdout.strip().split('\n')[0])
+        except (json.JSONDecodeError, IndexError):
+            return None
+
+    def close(self):
+        """Nothing to release for subprocess jobs"""
+        pass
+
+
+class InProcessEngine:
+    """
+    Drive long-lived yt_dlp.YoutubeDL objects inside this process.
+
+    YoutubeDL is not thread-safe, so each worker thread keeps its own
+    instances, one per distinct option set. The HTTP session, cookies and
+    initialised extractors are reused for every URL that thread handles.
+    """
+
+    name = "inprocess"
+
+    def __init__(self, yt_dlp_module=None):
+        self.yt_dlp = yt_dlp_module or load_yt_dlp()
+        if self.yt_dlp is None:
+            raise ImportError("yt_dlp module is not installed")
+        self._local = threading.local()
+
+    @staticmethod
+    def _split_output_template(args: List[str]):
+        """
+        Separate per-item options ('-o TEMPLATE', '-f FORMAT', '--load-info-json FILE',
+        '--print-to-file TEMPLATE FILE') from the rest so they do not force a new instance
+        """
+        key_args = []
+        i = 0
+        while i < len(args):
+            if args[i] in ('-o', '--output', '-f', '--format', '--load-info-json') and i + 1 < len(args):
+                i += 2
+                continue
+            if args[i] == '--print-to-file' and i + 2 < len(args):
+                i += 3
+                continue
+            key_args.append(args[i])
+            i += 1
+        return tuple(key_args)
+
+    def _get_ydl(self, args: List[str]):
+        """
+        Return this thread's YoutubeDL for the given option set and its job state
+
+        The job state (progress hook, watchdog and final path of the current
+        download) belongs to the instance, not to the calling thread: with
+        --concurrent-fragments yt-dlp calls progress hooks from its own fragment
+        threads, where a threading.local would be empty.
+        """
+        instances = getattr(self._local, 'instances', None)
+        if instances is None:
+            instances = self._local.instances = {}
+
+        ydl_opts = self.yt_dlp.parse_options(args).ydl_opts
+        # Raise download errors so their message reaches the caller
+        ydl_opts['ignoreerrors'] = False
+        key = self._split_output_template(args)
+        entry = instances.get(key)
+        if entry is None:
+            ydl = self.yt_dlp.YoutubeDL(ydl_opts)
+            state = {'progress_hook': None, 'watchdog': None, 'filepath': None}
+
+            def remember_filepath(filepath: str):
+                state['filepath'] = filepath
+
+            # Post hooks get the final path after all post-processors ran
+            ydl.add_post_hook(remember_filepath)
+            ydl.add_progress_hook(lambda status: self._dispatch_progress(ydl, state, status))
+            entry = instances[key] = (ydl, state)
+        else:
+            ydl = entry[0]
+            # Same options, different file name (e.g. auto numbering) or print target
+            if ydl_opts.get('outtmpl'):
+                ydl.params['outtmpl'] = {**ydl.params.get('outtmpl', {}), **ydl_opts['outtmpl']}
+            ydl.params['format'] = ydl_opts.get('format')
+            ydl.params['print_to_file'] = ydl_opts.get('print_to_file') or {}
+        return entry
+
+    def _dispatch_progress(self, ydl, state: Dict[str, Any], status: Dict[str, Any]):
+        watchdog = state['watchdog']
+        if watchdog:
+            # Follow live bandwidth rebalancing, a capped job is not a stalled one
+            watchdog.rate_cap = ydl.params.get('ratelimit')
+            watchdog(status)
+            # Checked on every progress callback (the socket timeout covers total silence)
+            if watchdog.check():
+                raise self.yt_dlp.utils.DownloadCancelled(f"download stalled ({watchdog.describe()})")
+        hook = state['progress_hook']
+        if hook:
+            hook(status)
+
+    def _discard_ydl(self, args: List[str]):
+        """Drop this thread's instance for an option set, the next job gets fresh connections"""
+        instances = getattr(self._local, 'instances', None) or {}
+        entry = instances.pop(self._split_output_template(args), None)
+        if entry is not None:
+            ydl = entry[0]
+            try:
+                ydl.close()
+            except Exception:
+                pass
+
+    def download(self, args: List[str], url: str,
+                 progress_hook: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 watchdog: Optional[StallWatchdog] = None) -> Dict[str, Any]:
+        """
+        Download a URL with a reused YoutubeDL instance
+
+        Args:
+            args: yt-dlp command line arguments (without the URL)
+            url: Video URL
+            progress_hook: Called with the yt-dlp progress dict
+            watchdog: Cancels the download when its throughput stays too low
+
+        Returns:
+            Dict with 'success' (bool), 'error' (error message, if any),
+            'filepath' (final file, if known) and 'stalled' (cancelled by the watchdog)
+        """
+        state = None
+        try:
+            ydl, state = self._get_ydl(args)
+            state.update(filepath=None, progress_hook=progress_hook, watchdog=watchdog)
+            # The return code is sticky per instance, reset it for this URL
+            ydl._download_retcode = 0
+            info_file = option_value(args, '--load-info-json')
+            # Share of the global bandwidth cap, rebalanced live as other jobs come and go
+            with governor.ydl_job(ydl):
+                if info_file:
+                    # Saved info dict: no extraction request, like the yt-dlp CLI
+                    success = ydl.download_with_info_file(info_file) == 0
+                else:
+                    success = ydl.download([url]) == 0
+            return {
+                'success': success,
+                'error': '' if success else 'ERROR: download failed',
+                'filepath': state['filepath'],
+                'stalled': False,
+            }
+        except Exception as e:
+            stalled = bool(watchdog and watchdog.stalled)
+            if stalled:
+                print(f"🐌 Download macet ({watchdog.describe()}), job dihentikan")
+                self._discard_ydl(args)
+                return {'success': False, 'error': STALLED_ERROR, 'filepath': None, 'stalled': True}
+            # yt-dlp already printed its own DownloadError messages
+            if not isinstance(e, self.yt_dlp.utils.DownloadError):
+                print(f"ERROR: {e}")
+            return {'success': False, 'error': str(e), 'filepath': None, 'stalled': False}
+        finally:
+            if state is not None:
+                state.update(progress_hook=None, watchdog=None)
+
+    def postprocess(self, args: List[str], info_json: str) -> Dict[str, Any]:
+        """
+        Run only the post-processors of an already downloaded video
+
+        Same as SubprocessEngine.postprocess, but on this thread's YoutubeDL for
+        the option set: no interpreter start-up and no extractor imports per item.
+        The saved info dict is processed like --load-info-json, so yt-dlp finds
+        the media file already on disk and goes straight to the post-processors.
+        """
+        try:
+            ydl, state = self._get_ydl(args)
+            state.update(filepath=None, progress_hook=None, watchdog=None)
+            ydl._download_retcode = 0
+            success = ydl.download_with_info_file(info_json) == 0
+            return {
+                'success': success,
+                'error': '' if success else 'ERROR: post-processing failed',
+                'filepath': state['filepath'],
+                'stalled': False,
+            }
+        except Exception as e:
+            if not isinstance(e, self.yt_dlp.utils.DownloadError):
+                print(f"ERROR: {e}")
+            return {'success': False, 'error': str(e), 'filepath': None, 'stalled': False}
+
+    def extract_info(self, args: List[str], url: str, timeout: int = 30) -> Optional[Dict[str, Any]]:
+        """
+        Return the info dict of a URL without downloading (None on error or timeout)
+
+        The socket timeout does not bound a whole extraction (many requests, or an
+        extractor that keeps paging), so it runs on a helper thread of the calling
+        thread and is given up after timeout seconds, like the subprocess engine.
+        """
+        worker = getattr(self._local, 'info_worker', None)
+        if worker is None:
+            worker = self._local.info_worker = _InfoWorker(self)
+        info = worker.extract(args, url, timeout)
+        if worker.stopped:
+            # Still busy with the abandoned URL, the next call gets a fresh helper
+            self._local.info_worker = None
+        return info
+
+    def _extract_info(self, args: List[str], url: str) -> Optional[Dict[str, Any]]:
+        try:
+            ydl = self._get_ydl(args)[0]
+            info = ydl.extract_info(url, download=False)
+            return ydl.sanitize_info(info) if info else None
+        except Exception:
+            return None
+
+    def close(self):
+        """Close the YoutubeDL instances owned by the calling thread"""
+        worker = getattr(self._local, 'info_worker', None)
+        if worker is not None:
+            worker.stop()
+            self._local.info_worker = None
+        instances = getattr(self._local, 'instances', None) or {}
+        for ydl, _ in instances.values():
+            try:
+                ydl.close()
+            except Exception:
+                pass
+        instances.clear()
+
+
+class _InfoWorker:
+    """
+    Daemon thread running the extractions of one calling thread with its own
+    YoutubeDL instances; a timed-out extraction cannot be interrupted, the
+    worker then exits after it and nothing waits for it
+    """
+
+    def __init__(self, engine: InProcessEngine):
+        self.engine = engine
+        self.stopped = False
+        self._jobs = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            args, url, result, done = job
+            result.append(self.engine._extract_info(args, url))
+            done.set()
+        self.engine.close()
+
+    def extract(self, args: List[str], url: str, timeout: float) -> Optional[Dict[str, Any]]:
+        result = []
+        done = threading.Event()
+        self._jobs.put((args, url, result, done))
+        if not done.wait(timeout):
+            self.stop()
+            return None
+        return result[0]
+
+    def stop(self):
+        self.stopped = True
+        self._jobs.put(None)
+
+
+ENGINES = {
+    SubprocessEngine.name: SubprocessEngine,
+    InProcessEngine.name: InProcessEngine,
+}
+
+
+def create_engine(name: str = "auto"):
+    """
+    Create a yt-dlp engine
+
+    Args:
+        name: "inprocess", "subprocess" or "auto" (in-process when yt_dlp is importable)
+    """
+    if name == "auto":
+        name = InProcessEngine.name if load_yt_dlp() is not None else SubprocessEngine.name
+
+    if name not in ENGINES:
+        raise ValueError(f"Unknown yt-dlp engine: {name}")
+
+    try:
+        return ENGINES[name]()
+    except ImportError:
+        print("⚠️  yt_dlp module tidak bisa di-import, memakai subprocess engine")
+        return SubprocessEngine()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Playlist Bulk Mode
+Beberapa playlist/channel sekaligus: semua daftar dienumerasi paralel, video
+yang muncul di lebih dari satu playlist hanya didownload sekali, lalu folder
+tiap playlist dilengkapi dengan hardlink/symlink ke file yang sudah ada atau
+diganti dengan playlist .m3u8 yang menunjuk ke file tersebut.
+"""
+
+import os
+import re
+from typing import Optional, Dict, Any, List
+
+# How a playlist folder refers to videos downloaded for another playlist
+HARDLINK = "hardlink"
+SYMLINK = "symlink"
+M3U8 = "m3u8"
+LINK_MODES = (HARDLINK, SYMLINK, M3U8)
+
+# Playlists listed at the same time
+DEFAULT_ENUMERATION_WORKERS = 4
+
+_INVALID_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+
+def safe_name(text: str) -> str:
+    """File/folder name of a title (characters invalid on Windows replaced)"""
+    return _INVALID_CHARS.sub('_', text or '').strip(' .')
+
+
+def playlist_folder_name(info: Dict[str, Any], position: int) -> str:
+    """Folder of a playlist inside the bulk folder: its title, else its id"""
+    return (safe_name(info.get('title') or '') or safe_name(info.get('playlist_id') or '')
+            or f"playlist_{position}")
+
+
+def dedupe_playlists(listings: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Global set of unique videos of several playlist listings
+
+    Returns:
+        Dict with 'owners' (video id -> position of the first playlist that has it,
+        in listing order), 'total' (entries of all playlists) and 'duplicates'
+        (entries whose video already appears earlier)
+    """
+    owners: Dict[str, int] = {}
+    total = 0
+    for position, info in enumerate(listings):
+        for entry in info['entries']:
+            video_id = entry.get('id')
+            if not video_id:
+                continue
+            total += 1
+            owners.setdefault(video_id, position)
+    return {'owners': owners, 'total': total, 'duplicates': total - len(owners)}
+
+
+def link_name(entry: Dict[str, Any], source: str, width: int, auto_numbering: bool = True) -> str:
+    """
+    File name of a linked entry, like the default "%(playlist_index)s - %(title)s.%(ext)s"
+    with this playlist's index
+    """
+    ext = os.path.splitext(source)[1]
+    title = safe_name(entry.get('title') or '') or entry['id']
+    if auto_numbering:
+        return f"{entry['index']:0{width}d} - {title}{ext}"
+    return f"{title}{ext}"
+
+
+def link_file(source: str, target: str, mode: str = HARDLINK) -> Optional[str]:
+    """
+    Make target refer to source
+
+    A hardlink falls back to a symlink (other drive / filesystem without hardlinks).
+
+    Returns:
+        The link type made (HARDLINK or SYMLINK), None if both failed
+    """
+    if mode == HARDLINK:
+        try:
+            os.link(source, target)
+            return HARDLINK
+        except OSError:
+            pass
+    try:
+        # Relative, so the bulk folder can be moved as a whole
+        os.symlink(os.path.relpath(source, os.path.dirname(target)), target)
+        return SYMLINK
+    except OSError:
+        return None
+
+
+def write_m3u8(path: str, items: List[Dict[str, Any]]):
+    """
+    Write an extended M3U playlist (UTF-8) of entries with a 'path'
+
+    Paths are written relative to the playlist file.
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("#EXTM3U\n")
+        for item in items:
+            duration = item.get('duration')
+            seconds = int(duration) if isinstance(duration, (int, float)) else -1
+            f.write(f"#EXTINF:{seconds},{item.get('title') or item['id']}\n")
+            f.write(os.path.relpath(item['path'], folder).replace(os.sep, '/') + "\n")
@@ -4,16 +4,84 @@ YouTube Playlist Downloader
 Menggunakan yt-dlp untuk mendownload playlist YouTube dengan berbagai opsi kualitas
 """
 
+import copy
 import os
+import queue
 import subprocess
 import sys
+import tempfile
+import threading
+import time
 from pathlib import Path
 from typing import Optional, Dict, Any, List
+from urllib.parse import urlparse, parse_qs
 import json
 
+# Shared download helpers live in the sibling yt-batch-downloader folder; the
+# launcher runs every tool as its own process, so this file adds it to sys.path
+_BATCH_DOWNLOADER_DIR = str(Path(__file__).resolve().parent.parent / "yt-batch-downloader")
+if _BATCH_DOWNLOADER_DIR not in sys.path:
+    sys.path.append(_BATCH_DOWNLOADER_DIR)
+
+from download_archive import DownloadArchive, ARCHIVE_FILENAME
+from bandwidth import governor, set_bandwidth_limit, format_rate
+from fragment_tuner import AUTO as AUTO_FRAGMENTS, FragmentThroughput, parse_fragment_setting, tuner
+from rate_limiter import rate_key
+from ytdlp_engine import PROGRESS_TEMPLATE, parse_progress_line, format_progress
+from failure_classifier import (PERMANENT, classify_failure, parse_error_line,
+                                describe as describe_failure)
+from playlist_manifest import (PlaylistManifest, MANIFEST_FILENAME, RECORD_TEMPLATE,
+                               format_playlist_items, split_shards, entry_index)
+from playlist_enumerator import PlaylistEnumerator, DEFAULT_INACTIVITY_TIMEOUT
+from playlist_snapshot import snapshots, DEFAULT_SNAPSHOT_TTL
+from playlist_retry import RetryTracker, DEFAULT_JITTER
+from playlist_bulk import (HARDLINK, SYMLINK, M3U8, LINK_MODES, DEFAULT_ENUMERATION_WORKERS, dedupe_playlists,
+                           playlist_folder_name, link_name, link_file, write_m3u8)
+
+
 class PlaylistDownloader:
-    def __init__(self):
+    def __init__(self, use_archive: bool = True):
+        """
+        Args:
+            use_archive: Skip videos already recorded in the download archive
+        """
         self.download_folder = None
+        self.use_archive = use_archive
+        self.archive = None
+        self._archive_files = None
+        # --download-archive file exported once and shared by the shards of a playlist
+        self._shared_archive_file = None
+        # Playlist entry -> output file of the download folder (see playlist_manifest)
+        self.manifest = None
+        self._manifest_file = None
+        self._bandwidth_token = None
+        # --concurrent-fragments: "auto" (tuned from observed throughput) or a fixed count
+        self.fragment_concurrency = AUTO_FRAGMENTS
+        self._fragment_observer = None
+        self._fragment_level = 1
+        # Video id -> classification of its failure in the current playlist run
+        self.item_failures: Dict[str, Dict[str, str]] = {}
+        # Skip videos that failed permanently in an earlier run (private, removed,
+        # geo-blocked...); after permanent_failure_ttl seconds they are tried again
+        self.skip_permanent_failures = True
+        self.permanent_failure_ttl = 30 * 24 * 3600
+        # A failed item is retried after retry_backoff, 2x, 4x ... seconds (its own
+        # schedule, spread by +/- retry_jitter so failed items do not retry in lockstep)
+        self.retry_backoff = 3.0
+        self.retry_max_delay = 300.0
+        self.retry_jitter = DEFAULT_JITTER
+        # Concurrent yt-dlp processes of one playlist (1 = the whole playlist in one process)
+        self.playlist_workers = 1
+        # Entries per shard started while a playlist is still being listed (one per
+        # worker); the rest is split into one shard per worker once the listing is
+        # complete, since every shard run reads the playlist pages up to its entries again
+        self.shard_size = 25
+        # Playlist enumeration gives up after this many seconds without output
+        self.enumeration_timeout = DEFAULT_INACTIVITY_TIMEOUT
+        # Complete listings are reused for this many seconds (info, download, verify)
+        self.snapshot_ttl = DEFAULT_SNAPSHOT_TTL
+        # Playlists listed concurrently in bulk mode
+        self.enumeration_workers = DEFAULT_ENUMERATION_WORKERS
         self.yt_dlp_available = self._check_yt_dlp()
         self.yt_dlp_cmd = self._get_yt_dlp_command()
     
@@ -76,59 +144,330 @@ class PlaylistDownloader:
         try:
             self.download_folder = Path(folder_path)
             self.download_folder.mkdir(parents=True, exist_ok=True)
+            if self.use_archive:
+                if self.archive is not None:
+                    self.archive.close()
+                self.archive = DownloadArchive(self.download_folder / ARCHIVE_FILENAME)
+            self.manifest = PlaylistManifest(self.download_folder / MANIFEST_FILENAME)
             return True
         except Exception as e:
             print(f"Error creating folder: {e}")
             return False
     
-    def get_playlist_info(self, playlist_url: str) -> Optional[Dict[str, Any]]:
-        """Get playlist information without downloading"""
+    def set_bandwidth_limit(self, total_rate) -> bool:
+        """Cap the total download rate of this process ("5M", "500K", bytes/s, None = unlimited)"""
+        try:
+            set_bandwidth_limit(total_rate)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return False
+        print(f"📶 Batas bandwidth total: {format_rate(governor.total_rate)}")
+        return True
+    
+    def set_playlist_workers(self, value) -> bool:
+        """Number of concurrent yt-dlp processes per playlist (1 = sequential)"""
+        try:
+            workers = int(value)
+        except (TypeError, ValueError):
+            print(f"❌ Jumlah worker tidak valid: {value}")
+            return False
+        if workers < 1:
+            print(f"❌ Jumlah worker minimal 1: {value}")
+            return False
+        self.playlist_workers = workers
+        return True
+    
+    def set_fragment_concurrency(self, value) -> bool:
+        """Set --concurrent-fragments: "auto" or a fixed number of parallel fragments"""
+        try:
+            self.fragment_concurrency = parse_fragment_setting(value)
+            return True
+        except ValueError as e:
+            print(f"❌ {e}")
+            return False
+    
+    def _fragment_args(self, playlist_url: str) -> List[str]:
+        """
+        --concurrent-fragments for this run
+        
+        One yt-dlp process serves the whole playlist, so in auto mode the level is
+        picked once per run and the measured throughput tunes the next run.
+        """
+        self._fragment_observer = None
+        if self.fragment_concurrency != AUTO_FRAGMENTS:
+            count = self.fragment_concurrency
+            return ['--concurrent-fragments', str(count)] if count > 1 else []
+        
+        count = tuner.suggest(rate_key(playlist_url))
+        self._fragment_level = count
+        self._fragment_observer = FragmentThroughput()
+        args = ['--newline', '--progress-template', PROGRESS_TEMPLATE]
+        if count > 1:
+            args += ['--concurrent-fragments', str(count)]
+        return args
+    
+    def _observe_progress(self, line: str) -> bool:
+        """Consume a machine-readable progress line, return True if it was one"""
+        if self._fragment_observer is None:
+            return False
+        progress = parse_progress_line(line)
+        if progress is None:
+            return False
+        self._fragment_observer(progress)
+        print(format_progress(progress))
+        return True
+    
+    def _report_fragments(self, playlist_url: str):
+        """Feed the throughput of this run to the fragment tuner"""
+        if self._fragment_observer is not None:
+            tuner.report(rate_key(playlist_url), self._fragment_level,
+                         self._fragment_observer.throughput)
+            self._fragment_observer = None
+    
+    def _start_process(self, cmd: List[str]) -> subprocess.Popen:
+        """Start yt-dlp with this job's share of the global bandwidth cap"""
+        # The share is fixed for the lifetime of the process (--limit-rate)
+        self._bandwidth_token = governor.register()
+        rate = governor.allocation(self._bandwidth_token)
+        if rate:
+            cmd = cmd + ['--limit-rate', str(rate)]
+            print(f"📶 Bandwidth job ini: {format_rate(rate)}")
+        return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                text=True, universal_newlines=True)
+    
+    def _release_bandwidth(self):
+        """Give this job's bandwidth share back to the other running jobs"""
+        if self._bandwidth_token is not None:
+            governor.unregister(self._bandwidth_token)
+            self._bandwidth_token = None
+    
+    def import_ytdlp_archive(self, archive_file: str, archive_format: str = "video:best") -> int:
+        """Import a yt-dlp --download-archive text file into the download archive"""
+        if self.archive is None:
+            print("Download archive belum di-set!")
+            return 0
+        try:
+            count = self.archive.import_ytdlp_archive(archive_file, archive_format)
+            print(f"✅ {count} entry diimport dari {archive_file}")
+            return count
+        except Exception as e:
+            print(f"Error importing archive: {e}")
+            return 0
+    
+    def _archive_args(self, archive_format: str) -> List[str]:
+        """
+        yt-dlp arguments that skip archived videos and report new downloads
+        
+        The SQLite archive is exported as a yt-dlp --download-archive file, so
+        yt-dlp skips known entries before extracting them. New downloads are
+        written (extractor, id, path) to a side file and recorded afterwards.
+        """
+        if not self.use_archive or self.archive is None:
+            self._archive_files = None
+            return []
+        
+        fd, record_file = tempfile.mkstemp(prefix='ytdlp_done_', suffix='.txt')
+        os.close(fd)
+        if self._shared_archive_file:
+            archive_file = self._shared_archive_file
+            # Removed by the sharded download that exported it
+            self._archive_files = (None, record_file, archive_format)
+        else:
+            archive_file = self._export_archive(archive_format)
+            self._archive_files = (archive_file, record_file, archive_format)
+        
+        return [
+            '--download-archive', archive_file,
+            '--print-to-file', 'after_move:%(extractor_key)s\t%(id)s\t%(filepath)s', record_file,
+        ]
+    
+    def _export_archive(self, archive_format: str) -> str:
+        """Write the archive (and permanent failures) to a new yt-dlp --download-archive file"""
+        fd, archive_file = tempfile.mkstemp(prefix='ytdlp_archive_', suffix='.txt')
+        os.close(fd)
+        skipped = self.archive.export_ytdlp_archive(archive_file, archive_format)
+        if skipped:
+            print(f"⏭️  {skipped} video sudah ada di archive dan akan di-skip")
+        if self.skip_permanent_failures:
+            # yt-dlp skips archive entries without extracting them, failures included
+            failures = self.archive.permanent_failures(self.permanent_failure_ttl)
+            with open(archive_file, 'a', encoding='utf-8') as f:
+                for failure in failures:
+                    f.write(f"{failure['extractor']} {failure['video_id']}\n")
+            if failures:
+                print(f"⛔ {len(failures)} video pernah gagal permanen dan akan di-skip")
+        return archive_file
+    
+    def _record_archive_downloads(self):
+        """Move the downloads reported by yt-dlp into the SQLite archive"""
+        if not self._archive_files:
+            return
+        archive_file, record_file, archive_format = self._archive_files
+        self._archive_files = None
+        try:
+            with open(record_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    parts = line.rstrip('\n').split('\t')
+                    if len(parts) == 3:
+                        self.archive.record(parts[0].lower(), parts[1], archive_format, parts[2])
+                        self.item_failures.pop(parts[1], None)
+        except Exception as e:
+            print(f"⚠️  Gagal menyimpan ke archive: {e}")
+        finally:
+            for path in (archive_file, record_file):
+                try:
+                    if path:
+                        os.remove(path)
+                except OSError:
+                    pass
+    
+    def _manifest_args(self, archive_format: str) -> List[str]:
+        """yt-dlp arguments that report every finished entry for the playlist manifest"""
+        if self.manifest is None:
+            self._manifest_file = None
+            return []
+        fd, record_file = tempfile.mkstemp(prefix='ytdlp_manifest_', suffix='.txt')
+        os.close(fd)
+        self._manifest_file = (record_file, archive_format)
+        return ['--print-to-file', RECORD_TEMPLATE, record_file]
+    
+    def _record_manifest_downloads(self):
+        """Move the entries reported by yt-dlp into the playlist manifest"""
+        if not self._manifest_file:
+            return
+        record_file, archive_format = self._manifest_file
+        self._manifest_file = None
+        try:
+            self.manifest.import_records(record_file, archive_format)
+        except Exception as e:
+            print(f"⚠️  Gagal menyimpan ke manifest: {e}")
+        finally:
+            try:
+                os.remove(record_file)
+            except OSError:
+                pass
+    
+    def _observe_error(self, line: str):
+        """Classify a yt-dlp ERROR line about one video and remember the failure"""
+        parsed = parse_error_line(line)
+        if parsed is None:
+            return
+        extractor, video_id, message = parsed
+        failure = classify_failure(message)
+        self.item_failures[video_id] = failure
+        print(f"🏷️  {video_id}: error {describe_failure(failure)}")
+        if self.archive is not None:
+            try:
+                self.archive.record_failure(extractor, video_id, failure['category'],
+                                            failure['reason'], message)
+            except Exception as e:
+                print(f"⚠️  Gagal menyimpan failure ke archive: {e}")
+    
+    def permanent_failures(self) -> List[str]:
+        """Video ids of the current run that failed permanently"""
+        return [video_id for video_id, failure in self.item_failures.items()
+                if failure['category'] == PERMANENT]
+    
+    def skipped_permanent_failures(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Video id -> archived failure of the videos skipped for an earlier permanent
+        failure (written to the --download-archive file, yt-dlp reports no error)
+        """
+        if not self.use_archive or self.archive is None or not self.skip_permanent_failures:
+            return {}
+        return {failure['video_id']: failure
+                for failure in self.archive.permanent_failures(self.permanent_failure_ttl)}
+    
+    def enumerate_playlist(self, playlist_url: str) -> PlaylistEnumerator:
+        """Streaming flat enumeration of a playlist/channel (iterate to start yt-dlp)"""
+        cmd = self.yt_dlp_cmd + [
+            '--dump-json',
+            '--flat-playlist',
+            playlist_url
+        ]
+        return PlaylistEnumerator(cmd, self.enumeration_timeout)
+    
+    def get_playlist_info(self, playlist_url: str, on_entry=None,
+                          refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Get playlist information without downloading
+        
+        A complete listing is kept as a snapshot and reused for snapshot_ttl
+        seconds, so info, download and verification enumerate the playlist once.
+        
+        Args:
+            playlist_url: URL playlist YouTube
+            on_entry: Optional callback (entry, count) called for every entry as soon
+                      as yt-dlp prints it, e.g. to fill a list in the UI
+            refresh: Ignore the snapshot and list the playlist again
+        """
         if not self.yt_dlp_available:
             print("yt-dlp tidak tersedia. Jalankan install_or_update_yt_dlp() terlebih dahulu.")
             return None
         
+        cached = None if refresh else snapshots.get(playlist_url, self.snapshot_ttl)
+        if cached is not None:
+            age = snapshots.age(playlist_url) or 0
+            print(f"📋 Snapshot playlist dipakai ulang ({cached['total_videos']} entry, "
+                  f"{age / 60:.0f} menit lalu)")
+            if on_entry:
+                for count, entry in enumerate(cached['entries'], 1):
+                    on_entry(entry, count)
+            return cached
+        
         try:
-            cmd = self.yt_dlp_cmd + [
-                '--dump-json',
-                '--flat-playlist',
-                playlist_url
-            ]
+            enumerator = self.enumerate_playlist(playlist_url)
+            entries = []
+            for entry in enumerator:
+                entries.append(entry)
+                if on_entry:
+                    on_entry(entry, len(entries))
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            if enumerator.error:
+                if not entries:
+                    print(f"Error getting playlist info: {enumerator.error}")
+                    return None
+                print(f"⚠️  Daftar playlist tidak lengkap ({len(entries)} entry): {enumerator.error}")
             
-            if result.returncode == 0:
-                # Parse each line as JSON (yt-dlp outputs one JSON per line for playlists)
-                entries = []
-                for line in result.stdout.strip().split('\n'):
-                    if line.strip():
-                        try:
-                            entry = json.loads(line)
-                            entries.append(entry)
-                        except json.JSONDecodeError:
-                            continue
-                
-                return {
-                    'total_videos': len(entries),
-                    'entries': entries
-                }
-            else:
-                print(f"Error getting playlist info: {result.stderr}")
-                return None
-                
-        except subprocess.TimeoutExpired:
-            print("Timeout saat mengambil info playlist")
-            return None
+            return self._store_listing(playlist_url, entries, enumerator.complete)
         except Exception as e:
             print(f"Error: {e}")
             return None
     
+    def _store_listing(self, playlist_url: str, entries: List[Dict[str, Any]],
+                       complete: bool) -> Dict[str, Any]:
+        """Playlist info of an enumeration; complete listings become the snapshot"""
+        first = entries[0] if entries else {}
+        info = {
+            'total_videos': len(entries),
+            'entries': entries,
+            'playlist_id': first.get('playlist_id') or self._playlist_id_from_url(playlist_url),
+            'title': first.get('playlist_title') or first.get('playlist'),
+            # False when yt-dlp failed or stalled midway (entries is a prefix)
+            'complete': complete,
+        }
+        if complete:
+            snapshots.put(playlist_url, info)
+        return info
+    
+    def refresh_playlist_info(self, playlist_url: str, on_entry=None) -> Optional[Dict[str, Any]]:
+        """List a playlist again, replacing its snapshot"""
+        return self.get_playlist_info(playlist_url, on_entry=on_entry, refresh=True)
+    
+    @staticmethod
+    def _playlist_id_from_url(playlist_url: str) -> Optional[str]:
+        """The list= parameter of a playlist URL"""
+        values = parse_qs(urlparse(playlist_url).query).get('list')
+        return values[0] if values else None
+    
     def download_video_playlist(self, playlist_url: str, quality: str = "best", 
                               output_template: str = "%(playlist_index)s - %(title)s.%(ext)s",
                               auto_numbering: bool = True, 
                               embed_thumbnail: bool = True,
                               embed_metadata: bool = True,
                               continue_on_error: bool = True,
-                              progress_callback=None) -> bool:
+                              progress_callback=None,
+                              playlist_items: Optional[str] = None) -> bool:
         """
         Download video playlist dengan kualitas terbaik
         
@@ -141,6 +480,8 @@ class PlaylistDownloader:
             embed_metadata: Add metadata like title, artist, date (disable for faster download)
             continue_on_error: Continue downloading if one video fails (skip failed items)
             progress_callback: Function callback untuk update progress (current, total, percentage, title)
+            playlist_items: Only these entries (--playlist-items, e.g. "3,7-9"); such a
+                            partial run is not verified on its own
         """
         if not self.yt_dlp_available:
             print("yt-dlp tidak tersedia. Install terlebih dahulu!")
@@ -150,11 +491,18 @@ class PlaylistDownloader:
             print("Download folder belum di-set!")
             return False
         
+        verify = continue_on_error and playlist_items is None
+        if verify:
+            # A new verified run; its retries (partial runs) add to this record
+            self.item_failures.clear()
+        
+        if self.playlist_workers > 1 and playlist_items is None:
+            return self._download_sharded(
+                playlist_url, True, quality, output_template, auto_numbering,
+                embed_thumbnail, embed_metadata, continue_on_error, progress_callback
+            )
+        
         try:
-            # Change to download directory
-            original_cwd = os.getcwd()
-            os.chdir(self.download_folder)
-            
             # Adjust output template based on auto_numbering setting
             if not auto_numbering:
                 # Remove only playlist_index from template, keep title and other variables
@@ -178,10 +526,20 @@ class PlaylistDownloader:
             
             cmd = self.yt_dlp_cmd + [
                 '-f', format_selector,
+                '-P', str(self.download_folder),  # Output folder per job (no chdir)
                 '-o', output_template,
                 '--no-playlist' if 'list=' not in playlist_url else '',
             ]
             
+            # Skip videos already in the download archive
+            cmd.extend(self._archive_args(f"video:{quality}"))
+            cmd.extend(self._manifest_args(f"video:{quality}"))
+            if playlist_items:
+                cmd.extend(['--playlist-items', playlist_items])
+            
+            # Parallel fragments for DASH/HLS formats
+            cmd.extend(self._fragment_args(playlist_url))
+            
             # Continue on error - skip failed videos and continue with next
             if continue_on_error:
                 cmd.append('--ignore-errors')  # Continue downloading even if errors occur
@@ -205,8 +563,7 @@ class PlaylistDownloader:
             print("="*50)
             
             # Run the download command and show output in real-time
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, 
-                                     text=True, universal_newlines=True)
+            process = self._start_process(cmd)
             
             current_item = 0
             total_items = 0
@@ -214,6 +571,8 @@ class PlaylistDownloader:
             
             for line in process.stdout:
                 line_stripped = line.strip()
+                if self._observe_progress(line_stripped):
+                    continue
                 
                 # Parse playlist info
                 if "Downloading" in line and "items of" in line:
@@ -265,14 +624,21 @@ class PlaylistDownloader:
                         if progress_callback:
                             progress_callback(current_item, total_items, percentage, current_title)
                 
+                if "ERROR:" in line_stripped:
+                    self._observe_error(line_stripped)
+                
                 # Print the original line (but filter some verbose output)
                 if not any(skip in line_stripped for skip in ["Sleeping", "WARNING:", "See  https://"]):
                     print(line_stripped)
             
             process.wait()
+            self._release_bandwidth()
+            self._report_fragments(playlist_url)
+            self._record_archive_downloads()
+            self._record_manifest_downloads()
             
             # Check if continue_on_error is enabled and verify completion
-            if continue_on_error:
+            if verify:
                 print("\n🔍 Verifying download completion...")
                 return self._verify_and_retry_playlist(
                     playlist_url, quality, output_template, auto_numbering,
@@ -290,11 +656,10 @@ class PlaylistDownloader:
             print(f"Error saat download: {e}")
             return False
         finally:
-            # Return to original directory
-            try:
-                os.chdir(original_cwd)
-            except:
-                pass
+            self._release_bandwidth()
+            # Record finished downloads even if the run was interrupted
+            self._record_archive_downloads()
+            self._record_manifest_downloads()
     
     def download_audio_playlist(self, playlist_url: str, audio_format: str = "mp3",
                               audio_quality: str = "0",
@@ -303,7 +668,8 @@ class PlaylistDownloader:
                               embed_thumbnail: bool = True,
                               embed_metadata: bool = True,
                               continue_on_error: bool = True,
-                              progress_callback=None) -> bool:
+                              progress_callback=None,
+                              playlist_items: Optional[str] = None) -> bool:
         """
         Download audio-only playlist
         
@@ -317,6 +683,8 @@ class PlaylistDownloader:
             embed_metadata: Add metadata like title, artist, date (disable for faster download)
             continue_on_error: Continue downloading if one audio fails (skip failed items)
             progress_callback: Function callback untuk update progress (current, total, percentage, title)
+            playlist_items: Only these entries (--playlist-items, e.g. "3,7-9"); such a
+                            partial run is not verified on its own
         """
         if not self.yt_dlp_available:
             print("yt-dlp tidak tersedia. Install terlebih dahulu!")
@@ -326,11 +694,19 @@ class PlaylistDownloader:
             print("Download folder belum di-set!")
             return False
         
+        verify = continue_on_error and playlist_items is None
+        if verify:
+            # A new verified run; its retries (partial runs) add to this record
+            self.item_failures.clear()
+        
+        if self.playlist_workers > 1 and playlist_items is None:
+            return self._download_sharded(
+                playlist_url, False, audio_format, output_template, auto_numbering,
+                embed_thumbnail, embed_metadata, continue_on_error, progress_callback,
+                audio_quality=audio_quality
+            )
+        
         try:
-            # Change to download directory
-            original_cwd = os.getcwd()
-            os.chdir(self.download_folder)
-            
             # Adjust output template based on auto_numbering setting
             if not auto_numbering:
                 # Remove only playlist_index from template, keep title and other variables
@@ -346,9 +722,19 @@ class PlaylistDownloader:
                 '-x',  # Extract audio
                 '--audio-format', audio_format,
                 '--audio-quality', audio_quality,
+                '-P', str(self.download_folder),  # Output folder per job (no chdir)
                 '-o', output_template,
             ]
             
+            # Skip audios already in the download archive
+            cmd.extend(self._archive_args(f"audio:{audio_format}"))
+            cmd.extend(self._manifest_args(f"audio:{audio_format}"))
+            if playlist_items:
+                cmd.extend(['--playlist-items', playlist_items])
+            
+            # Parallel fragments for DASH/HLS formats
+            cmd.extend(self._fragment_args(playlist_url))
+            
             # Continue on error - skip failed audios and continue with next
             if continue_on_error:
                 cmd.append('--ignore-errors')  # Continue downloading even if errors occur
@@ -370,8 +756,7 @@ class PlaylistDownloader:
             print("="*50)
             
             # Run the download command and show output in real-time
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, 
-                                     text=True, universal_newlines=True)
+            process = self._start_process(cmd)
             
             current_item = 0
             total_items = 0
@@ -379,6 +764,8 @@ class PlaylistDownloader:
             
             for line in process.stdout:
                 line_stripped = line.strip()
+                if self._observe_progress(line_stripped):
+                    continue
                 
                 # Parse playlist info
                 if "Downloading" in line and "items of" in line:
@@ -430,14 +817,21 @@ class PlaylistDownloader:
                         if progress_callback:
                             progress_callback(current_item, total_items, percentage, current_title)
                 
+                if "ERROR:" in line_stripped:
+                    self._observe_error(line_stripped)
+                
                 # Print the original line (but filter some verbose output)
                 if not any(skip in line_stripped for skip in ["Sleeping", "WARNING:", "See  https://"]):
                     print(line_stripped)
             
             process.wait()
+            self._release_bandwidth()
+            self._report_fragments(playlist_url)
+            self._record_archive_downloads()
+            self._record_manifest_downloads()
             
             # Check if continue_on_error is enabled and verify completion
-            if continue_on_error:
+            if verify:
                 print("\n🔍 Verifying download completion...")
                 return self._verify_and_retry_playlist(
                     playlist_url, audio_format, output_template, auto_numbering,
@@ -456,13 +850,328 @@ class PlaylistDownloader:
             print(f"Error saat download: {e}")
             return False
         finally:
-            # Return to original directory
-            try:
-                os.chdir(original_cwd)
-            except:
-                pass
+            self._release_bandwidth()
+            # Record finished downloads even if the run was interrupted
+            self._record_archive_downloads()
+            self._record_manifest_downloads()
 
 
+    def _job_copy(self, shared_archive_file: Optional[str] = None) -> 'PlaylistDownloader':
+        """
+        Downloader for one more concurrent yt-dlp process: shares the archive,
+        manifest and failure record, has its own per-process state
+        """
+        job = copy.copy(self)
+        job._archive_files = None
+        job._shared_archive_file = shared_archive_file
+        job._manifest_file = None
+        job._bandwidth_token = None
+        job._fragment_observer = None
+        job.playlist_workers = 1
+        return job
+    
+    def _download_sharded(self, playlist_url: str, is_video: bool, quality_or_format: str,
+                          output_template: str, auto_numbering: bool,
+                          embed_thumbnail: bool, embed_metadata: bool,
+                          continue_on_error: bool, progress_callback,
+                          audio_quality: str = "0") -> bool:
+        """
+        Download a playlist with playlist_workers concurrent yt-dlp processes
+        
+        Every shard is one yt-dlp run of the playlist URL with --playlist-items, so
+        %(playlist_index)s stays the index in the whole playlist; each run reads the
+        playlist pages up to its entries again, so there are few large shards. While
+        the playlist is still being listed every worker gets one shard of shard_size
+        entries; the entries listed after that are split into one contiguous shard
+        per worker when the listing is complete (a reused snapshot is split right
+        away). Entries already in the manifest or archive are left out, and the
+        archive is exported once for all shards. Progress of all shards is reported
+        to progress_callback as one count (the total grows while the enumeration runs).
+        """
+        def download(job, **kwargs):
+            if is_video:
+                return job.download_video_playlist(
+                    playlist_url, quality_or_format, output_template, auto_numbering,
+                    embed_thumbnail, embed_metadata, **kwargs)
+            return job.download_audio_playlist(
+                playlist_url, quality_or_format, audio_quality, output_template, auto_numbering,
+                embed_thumbnail, embed_metadata, **kwargs)
+        
+        archive_format = f"video:{quality_or_format}" if is_video else f"audio:{quality_or_format}"
+        shard_queue = queue.Queue()
+        listing_done = threading.Event()
+        stop_event = threading.Event()
+        lock = threading.Lock()
+        started = [0]
+        total = [0]
+        shard_count = [0]
+        results = []
+        
+        def shard_progress(current, shard_total, percentage, title):
+            # Every call is a new item in one of the shards
+            with lock:
+                started[0] += 1
+                current = started[0]
+                known = max(total[0], current)
+            progress_callback(current, known, (current / known) * 100, title)
+        
+        def worker():
+            while not stop_event.is_set():
+                try:
+                    number, shard = shard_queue.get(timeout=0.2)
+                except queue.Empty:
+                    if listing_done.is_set() and shard_queue.empty():
+                        return
+                    continue
+                items = format_playlist_items(shard)
+                print(f"\n🧩 Shard {number}: #{items}")
+                success = download(self._job_copy(shared_archive), continue_on_error=continue_on_error,
+                                   progress_callback=shard_progress if progress_callback else None,
+                                   playlist_items=items)
+                with lock:
+                    results.append(success)
+                if not success and not continue_on_error:
+                    print(f"⏹️  Shard {number} gagal, shard berikutnya dibatalkan")
+                    stop_event.set()
+        
+        def add_shard(indices):
+            with lock:
+                shard_count[0] += 1
+                total[0] += len(indices)
+            shard_queue.put((shard_count[0], indices))
+        
+        print(f"⚡ Sharded mode: {self.playlist_workers} proses paralel")
+        shared_archive = (self._export_archive(archive_format)
+                          if self.use_archive and self.archive is not None else None)
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.playlist_workers)]
+        # Every shard process gets total bandwidth / workers, not all of what is left
+        with governor.expect(self.playlist_workers):
+            for thread in threads:
+                thread.start()
+            
+            # A fresh snapshot (e.g. from Get Info) replaces the enumeration
+            snapshot = snapshots.get(playlist_url, self.snapshot_ttl)
+            enumerator = self.enumerate_playlist(playlist_url) if snapshot is None else None
+            if snapshot is not None:
+                print(f"📋 Snapshot playlist dipakai ulang ({snapshot['total_videos']} entry)")
+            entries = []
+            pending = []
+            try:
+                for position, entry in enumerate(enumerator if snapshot is None else snapshot['entries'], 1):
+                    if stop_event.is_set():
+                        break
+                    entries.append(entry)
+                    playlist_id = entry.get('playlist_id') or self._playlist_id_from_url(playlist_url) or ''
+                    entry = {**entry, 'index': entry_index(entry, position)}
+                    if self._entry_present(playlist_id, entry, archive_format):
+                        continue
+                    pending.append(entry['index'])
+                    # Workers start while the rest of the playlist is still being listed
+                    if (snapshot is None and shard_count[0] < self.playlist_workers
+                            and len(pending) >= self.shard_size):
+                        add_shard(pending)
+                        pending = []
+                if not stop_event.is_set():
+                    for shard in split_shards(pending, self.playlist_workers):
+                        add_shard(shard)
+            finally:
+                if enumerator is not None:
+                    enumerator.close()
+                listing_done.set()
+            
+            for thread in threads:
+                thread.join()
+        if shared_archive:
+            try:
+                os.remove(shared_archive)
+            except OSError:
+                pass
+        
+        print(f"\n📋 {len(entries)} entry, {total[0]} didownload dalam {shard_count[0]} shard")
+        if enumerator is not None and not stop_event.is_set():
+            # The verification below reuses this listing
+            self._store_listing(playlist_url, entries, enumerator.complete)
+        if enumerator is not None and enumerator.error:
+            print(f"⚠️  Daftar playlist tidak lengkap: {enumerator.error}")
+            if not entries:
+                print("⚠️  Daftar entry tidak tersedia, download tanpa sharding")
+                return download(self._job_copy(), continue_on_error=continue_on_error,
+                                progress_callback=progress_callback)
+        elif not total[0]:
+            print(f"\n🎉 Semua {len(entries)} item sudah ada!")
+            return True
+        
+        if continue_on_error:
+            print("\n🔍 Verifying download completion...")
+            return self._verify_and_retry_playlist(
+                playlist_url, quality_or_format, output_template, auto_numbering,
+                embed_thumbnail, embed_metadata, progress_callback, is_video=is_video,
+                audio_quality=audio_quality
+            )
+        return not stop_event.is_set() and all(results)
+    
+    def get_playlists_info(self, playlist_urls: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Info of several playlists/channels, enumeration_workers listed at a time"""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(playlist_urls)
+        pending = queue.Queue()
+        for position, url in enumerate(playlist_urls):
+            pending.put((position, url))
+        
+        def worker():
+            while True:
+                try:
+                    position, url = pending.get_nowait()
+                except queue.Empty:
+                    return
+                results[position] = self.get_playlist_info(url)
+        
+        threads = [threading.Thread(target=worker, daemon=True)
+                   for _ in range(max(1, min(self.enumeration_workers, len(playlist_urls))))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+    
+    def download_bulk(self, playlist_urls: List[str], is_video: bool = True,
+                      quality_or_format: str = "best", audio_quality: str = "0",
+                      link_mode: str = HARDLINK,
+                      output_template: str = "%(playlist_index)s - %(title)s.%(ext)s",
+                      auto_numbering: bool = True,
+                      embed_thumbnail: bool = True,
+                      embed_metadata: bool = True,
+                      progress_callback=None) -> bool:
+        """
+        Download several playlists/channels, every video only once
+        
+        All listings are enumerated concurrently first and deduplicated by video
+        ID. The playlists are then downloaded one after another, each into its own
+        subfolder; videos downloaded for an earlier playlist are skipped through the
+        download archive. Finally every playlist folder gets a hardlink/symlink (or,
+        with link_mode M3U8, a .m3u8 playlist entry) for its videos that live in
+        another playlist's folder.
+        
+        Args:
+            playlist_urls: Playlist/channel URLs, in priority order (a video is stored
+                           in the folder of the first playlist that has it)
+            is_video: True for video, False for audio
+            quality_or_format: Video quality or audio format
+            audio_quality: Audio quality (for audio downloads)
+            link_mode: HARDLINK, SYMLINK or M3U8
+            output_template: Template nama file output (inside the playlist folder)
+            auto_numbering: Enable/disable auto numbering
+            embed_thumbnail: Embed thumbnail option
+            embed_metadata: Embed metadata option
+            progress_callback: Progress callback function (per playlist)
+        """
+        if not self.yt_dlp_available:
+            print("yt-dlp tidak tersedia. Install terlebih dahulu!")
+            return False
+        if not self.download_folder:
+            print("Download folder belum di-set!")
+            return False
+        if self.archive is None:
+            # The archive is what makes later playlists skip videos downloaded earlier
+            print("❌ Bulk mode memerlukan download archive (use_archive=True)")
+            return False
+        if link_mode not in LINK_MODES:
+            print(f"❌ Link mode tidak dikenal: {link_mode} (pilih {', '.join(LINK_MODES)})")
+            return False
+        
+        playlist_urls = list(dict.fromkeys(url.strip() for url in playlist_urls if url.strip()))
+        print(f"📚 Bulk mode: {len(playlist_urls)} playlist, "
+              f"{min(self.enumeration_workers, len(playlist_urls))} dienumerasi paralel")
+        listings = self.get_playlists_info(playlist_urls)
+        playlists = [(url, info) for url, info in zip(playlist_urls, listings) if info]
+        for url, info in zip(playlist_urls, listings):
+            if not info:
+                print(f"⚠️  Playlist dilewati (daftar tidak tersedia): {url}")
+        if not playlists:
+            return False
+        
+        dedupe = dedupe_playlists([info for _, info in playlists])
+        print(f"📊 {dedupe['total']} entry, {len(dedupe['owners'])} video unik "
+              f"({dedupe['duplicates']} duplikat hanya didownload sekali)")
+        
+        archive_format = f"video:{quality_or_format}" if is_video else f"audio:{quality_or_format}"
+        folders = []
+        results = []
+        for position, (url, info) in enumerate(playlists, 1):
+            name = playlist_folder_name(info, position)
+            folders.append(name)
+            print(f"\n📁 [{position}/{len(playlists)}] {name} ({info['total_videos']} entry)")
+            print("=" * 60)
+            
+            # Videos of earlier playlists are adopted from the archive here
+            missing = self._missing_entries(info, archive_format)
+            if not missing:
+                print("✅ Semua video sudah ada")
+                results.append(True)
+                continue
+            print(f"📥 {len(missing)} video belum ada")
+            
+            # % is a template character; the folder name is literal
+            template = f"{name.replace('%', '%%')}/{output_template}"
+            if is_video:
+                success = self.download_video_playlist(
+                    url, quality_or_format, template, auto_numbering, embed_thumbnail,
+                    embed_metadata, progress_callback=progress_callback)
+            else:
+                success = self.download_audio_playlist(
+                    url, quality_or_format, audio_quality, template, auto_numbering,
+                    embed_thumbnail, embed_metadata, progress_callback=progress_callback)
+            results.append(success)
+        
+        print(f"\n🔗 Melengkapi folder playlist ({link_mode})...")
+        for (url, info), name in zip(playlists, folders):
+            self._materialise_playlist(info, name, archive_format, link_mode, auto_numbering)
+        
+        complete = sum(1 for success in results if success)
+        print(f"\n📚 Bulk selesai: {complete}/{len(playlists)} playlist lengkap, "
+              f"{len(dedupe['owners'])} video unik")
+        return complete == len(playlist_urls)
+    
+    def _materialise_playlist(self, playlist_info: Dict[str, Any], folder_name: str,
+                              archive_format: str, link_mode: str, auto_numbering: bool = True):
+        """Link (or list in a .m3u8) the videos of a playlist that live in another folder"""
+        playlist_id = playlist_info.get('playlist_id') or ''
+        folder = self.download_folder / folder_name
+        folder.mkdir(parents=True, exist_ok=True)
+        own_folder = os.path.abspath(folder)
+        width = len(str(playlist_info['total_videos']))
+        
+        items = []
+        linked = 0
+        failed = 0
+        for position, entry in enumerate(playlist_info['entries'], 1):
+            entry = {**entry, 'index': entry_index(entry, position)}
+            if not self._entry_present(playlist_id, entry, archive_format):
+                continue
+            record = self.manifest.get(playlist_id, entry['id'])
+            if not record or not record.get('path'):
+                continue
+            path = os.path.abspath(record['path'])
+            items.append({**entry, 'path': path})
+            if link_mode == M3U8 or os.path.dirname(path) == own_folder:
+                continue
+            
+            target = folder / link_name(entry, path, width, auto_numbering)
+            if os.path.lexists(target):
+                continue
+            if link_file(path, str(target), link_mode):
+                linked += 1
+            else:
+                failed += 1
+        
+        if link_mode == M3U8:
+            playlist_file = folder / f"{folder_name}.m3u8"
+            write_m3u8(str(playlist_file), items)
+            print(f"📝 {folder_name}: {playlist_file.name} ({len(items)} item)")
+            return
+        print(f"🔗 {folder_name}: {linked} link baru")
+        if failed:
+            print(f"⚠️  {failed} link gagal dibuat, coba link mode {M3U8}")
+    
     def _verify_and_retry_playlist(self, playlist_url: str, quality_or_format: str,
                                    output_template: str, auto_numbering: bool,
                                    embed_thumbnail: bool, embed_metadata: bool,
@@ -471,6 +1180,13 @@ class PlaylistDownloader:
         """
         Verify playlist download completion and retry failed items
         
+        The playlist entries are diffed against the manifest (entry ID -> output
+        file), so exactly the missing IDs are known. Every missing entry gets its
+        own retry schedule (exponential backoff with jitter); a retry round
+        requests only the entries that are due with --playlist-items, keeping
+        their playlist_index numbering. Entries with a permanent error (private,
+        removed, geo-blocked...) are dropped right away.
+        
         Args:
             playlist_url: URL playlist YouTube
             quality_or_format: Video quality or audio format
@@ -481,11 +1197,8 @@ class PlaylistDownloader:
             progress_callback: Progress callback function
             is_video: True for video, False for audio
             audio_quality: Audio quality (for audio downloads)
-            max_retries: Maximum retry attempts
+            max_retries: Maximum retry attempts per item
         """
-        import os
-        import glob
-        
         print("📋 Getting playlist info...")
         playlist_info = self.get_playlist_info(playlist_url)
         
@@ -493,91 +1206,139 @@ class PlaylistDownloader:
             print("⚠️  Could not verify playlist info")
             return True  # Assume success if can't verify
         
+        archive_format = f"video:{quality_or_format}" if is_video else f"audio:{quality_or_format}"
         expected_count = playlist_info['total_videos']
         print(f"📊 Expected items: {expected_count}")
         
-        # Count downloaded files
-        downloaded_files = []
-        if is_video:
-            # Video extensions
-            for ext in ['*.mp4', '*.mkv', '*.webm', '*.avi', '*.mov']:
-                downloaded_files.extend(glob.glob(os.path.join(str(self.download_folder), ext)))
-        else:
-            # Audio extensions
-            for ext in ['*.mp3', '*.m4a', '*.opus', '*.wav']:
-                downloaded_files.extend(glob.glob(os.path.join(str(self.download_folder), ext)))
-        
-        downloaded_count = len(downloaded_files)
-        print(f"✅ Downloaded items: {downloaded_count}")
-        
-        # Check if complete
-        if downloaded_count >= expected_count:
-            print(f"\n🎉 Download complete! All {expected_count} items downloaded successfully!")
-            return True
+        missing = self._missing_entries(playlist_info, archive_format)
+        print(f"✅ Downloaded items: {expected_count - len(missing)}")
         
-        missing_count = expected_count - downloaded_count
-        print(f"\n⚠️  Missing {missing_count} items. Starting retry process...")
+        tracker = RetryTracker(max_retries, self.retry_backoff, self.retry_max_delay, self.retry_jitter)
+        # Skipped by yt-dlp on every run, a retry would only skip them again
+        skipped = self.skipped_permanent_failures()
+        for entry in missing:
+            tracker.failed(entry['id'], self.item_failures.get(entry['id']) or skipped.get(entry['id']))
         
-        # Retry logic
-        retry_count = 0
-        while retry_count < max_retries and downloaded_count < expected_count:
-            retry_count += 1
-            print(f"\n🔄 Retry attempt {retry_count}/{max_retries}...")
+        rounds = 0
+        while missing:
+            missing_ids = [entry['id'] for entry in missing]
+            if not tracker.pending(missing_ids):
+                break
+            
+            delay = tracker.wait_time(missing_ids)
+            if delay > 0:
+                if delay >= 1:
+                    print(f"⏳ Waiting {delay:.0f} seconds until the next item is due...")
+                time.sleep(delay)
+            # Items due shortly after the first one share its retry run
+            due = set(tracker.due(missing_ids, window=self.retry_backoff))
+            retry_entries = [entry for entry in missing if entry['id'] in due]
+            rounds += 1
+            
+            items = format_playlist_items(entry['index'] for entry in retry_entries)
+            print(f"\n🔄 Retry round {rounds}: {len(retry_entries)} item (#{items})")
+            for entry in retry_entries:
+                print(f"   - #{entry['index']} {entry['id']}: attempt "
+                      f"{tracker.retries(entry['id']) + 1}/{max_retries}")
             print("=" * 60)
             
-            # Re-run download (yt-dlp will skip existing files)
+            # Only the due entries, their playlist_index (numbering) stays the same
             if is_video:
                 self.download_video_playlist(
                     playlist_url, quality_or_format, output_template,
                     auto_numbering, embed_thumbnail, embed_metadata,
-                    continue_on_error=False,  # Don't recurse into verify again
-                    progress_callback=progress_callback
+                    progress_callback=progress_callback, playlist_items=items
                 )
             else:
                 self.download_audio_playlist(
                     playlist_url, quality_or_format, audio_quality, output_template,
                     auto_numbering, embed_thumbnail, embed_metadata,
-                    continue_on_error=False,  # Don't recurse into verify again
-                    progress_callback=progress_callback
+                    progress_callback=progress_callback, playlist_items=items
                 )
             
-            # Re-count files
-            downloaded_files = []
-            if is_video:
-                for ext in ['*.mp4', '*.mkv', '*.webm', '*.avi', '*.mov']:
-                    downloaded_files.extend(glob.glob(os.path.join(str(self.download_folder), ext)))
-            else:
-                for ext in ['*.mp3', '*.m4a', '*.opus', '*.wav']:
-                    downloaded_files.extend(glob.glob(os.path.join(str(self.download_folder), ext)))
-            
-            new_downloaded_count = len(downloaded_files)
-            
-            if new_downloaded_count > downloaded_count:
-                print(f"✅ Progress: {downloaded_count} → {new_downloaded_count} items")
-                downloaded_count = new_downloaded_count
-                
-                if downloaded_count >= expected_count:
-                    print(f"\n🎉 All {expected_count} items downloaded successfully after {retry_count} retries!")
-                    return True
+            previous = len(missing)
+            missing = self._missing_entries(playlist_info, archive_format)
+            still_missing = {entry['id'] for entry in missing}
+            for video_id in due:
+                if video_id in still_missing:
+                    # The latest error of this run decides whether it is worth another try
+                    tracker.failed(video_id, self.item_failures.get(video_id))
+                else:
+                    tracker.succeeded(video_id)
+            if len(missing) < previous:
+                print(f"✅ Progress: {expected_count - previous} → {expected_count - len(missing)} items")
             else:
                 print(f"⚠️  No new files downloaded in this retry")
-            
-            if retry_count < max_retries and downloaded_count < expected_count:
-                import time
-                print("⏳ Waiting 3 seconds before next retry...")
-                time.sleep(3)
         
-        # Final status
-        if downloaded_count >= expected_count:
-            print(f"\n🎉 Download complete! All {expected_count} items downloaded!")
+        if not missing:
+            suffix = f" after {rounds} retry rounds" if rounds else ""
+            print(f"\n🎉 Download complete! All {expected_count} items downloaded{suffix}!")
             return True
+        
+        print(f"\n⚠️  Download incomplete ({rounds} retry rounds).")
+        print(f"Downloaded: {expected_count - len(missing)}/{expected_count} items")
+        print(f"Missing: {len(missing)} items")
+        # Failures of this run win over the archived ones of skipped videos
+        failures = {video_id: {'category': failure['category'], 'reason': failure['reason']}
+                    for video_id, failure in skipped.items()}
+        failures.update(self.item_failures)
+        permanent = {video_id for video_id, failure in failures.items() if failure['category'] == PERMANENT}
+        for entry in missing:
+            if entry['id'] not in permanent:
+                print(f"   - #{entry['index']} {entry['id']}: {entry.get('title') or ''} "
+                      f"({tracker.retries(entry['id'])} retries)")
+        permanent = [entry['id'] for entry in missing if entry['id'] in permanent]
+        if permanent:
+            self._print_permanent_failures(permanent, failures)
         else:
-            missing = expected_count - downloaded_count
-            print(f"\n⚠️  Download incomplete after {max_retries} retries.")
-            print(f"Downloaded: {downloaded_count}/{expected_count} items")
-            print(f"Missing: {missing} items")
             print("\n💡 Some videos might be unavailable, private, or geo-blocked.")
+        return False
+    
+    def _missing_entries(self, playlist_info: Dict[str, Any], archive_format: str) -> List[Dict[str, Any]]:
+        """Playlist entries without a downloaded file (manifest, then the download archive)"""
+        playlist_id = playlist_info.get('playlist_id') or ''
+        missing = []
+        for entry in self.manifest.missing(playlist_id, playlist_info['entries'], archive_format):
+            if not self._adopt_archived_entry(playlist_id, entry, archive_format):
+                missing.append(entry)
+        return missing
+    
+    def _entry_present(self, playlist_id: str, entry: Dict[str, Any], archive_format: str) -> bool:
+        """Whether one entry (with 'index') is already downloaded (manifest or archive)"""
+        if not entry.get('id'):
             return False
+        if self.manifest is not None and self.manifest.has_file(playlist_id, entry['id'], archive_format):
+            return True
+        return self._adopt_archived_entry(playlist_id, entry, archive_format)
+    
+    def _adopt_archived_entry(self, playlist_id: str, entry: Dict[str, Any], archive_format: str) -> bool:
+        """
+        Whether the download archive already has an entry (yt-dlp skipped it, so
+        nothing was reported); its file is then added to the manifest
+        """
+        if self.archive is None:
+            return False
+        extractor = (entry.get('ie_key') or entry.get('extractor_key') or 'youtube').lower()
+        record = self.archive.get(extractor, entry['id'], archive_format)
+        if record is None:
+            return False
+        path = record['output_path']
+        if not path:
+            # Imported from a yt-dlp archive file: no path, trusted like is_downloaded()
+            return True
+        if not os.path.exists(path):
+            return False
+        self.manifest.record(playlist_id, entry['id'], entry['index'], path, archive_format)
+        return True
+    
+    def _print_permanent_failures(self, video_ids: List[str],
+                                  failures: Optional[Dict[str, Dict[str, str]]] = None):
+        """List the items that failed permanently, with the reason (failures default: this run's)"""
+        failures = self.item_failures if failures is None else failures
+        note = " (dilewati di run berikutnya)" if self.archive is not None and self.skip_permanent_failures else ""
+        print(f"\n⛔ {len(video_ids)} item tidak bisa didownload{note}:")
+        for video_id in video_ids:
+            print(f"   - {video_id}: {describe_failure(failures.get(video_id))}")
 
 
 def main():
@@ -611,18 +1372,22 @@ def main():
         else:
             print("❌ Gagal membuat folder. Coba lagi...")
     
-    # Get playlist URL
+    # Get playlist URL(s)
     while True:
-        url = input("\nMasukkan URL playlist YouTube: ").strip()
-        if url:
+        urls = input("\nMasukkan URL playlist YouTube (beberapa URL dipisah spasi = bulk mode): ")
+        urls = urls.replace(',', ' ').split()
+        if urls:
             break
         print("URL tidak boleh kosong!")
+    url = urls[0]
+    bulk = len(urls) > 1
     
-    # Get playlist info
-    print("\n📋 Mengambil informasi playlist...")
-    info = downloader.get_playlist_info(url)
-    if info:
-        print(f"📊 Total video: {info['total_videos']}")
+    # Get playlist info (bulk mode lists every playlist when it starts)
+    if not bulk:
+        print("\n📋 Mengambil informasi playlist...")
+        info = downloader.get_playlist_info(url)
+        if info:
+            print(f"📊 Total video: {info['total_videos']}")
     
     # Auto numbering option
     print("\n🔢 Auto File Numbering:")
@@ -634,6 +1399,19 @@ def main():
     else:
         print("❌ File tanpa nomor urut: Title.ext")
     
+    # Parallel shards
+    workers = input("\n🧵 Jumlah download paralel (default: 1): ").strip()
+    if workers and downloader.set_playlist_workers(workers) and downloader.playlist_workers > 1:
+        print(f"✅ Playlist dibagi ke {downloader.playlist_workers} proses yt-dlp")
+    
+    # Bulk mode: how playlist folders refer to videos stored for another playlist
+    link_mode = HARDLINK
+    if bulk:
+        print(f"\n📚 Bulk mode: {len(urls)} playlist, video yang sama hanya didownload sekali")
+        print("🔗 Video dari playlist lain: 1. Hardlink  2. Symlink  3. Playlist .m3u8")
+        link_choice = input("Pilihan (1-3, default: 1): ").strip()
+        link_mode = {'2': SYMLINK, '3': M3U8}.get(link_choice, HARDLINK)
+    
     # Choose download type
     print("\n🎯 Pilih jenis download:")
     print("1. Video (kualitas terbaik)")
@@ -644,7 +1422,13 @@ def main():
     while True:
         choice = input("Pilihan (1-4): ").strip()
         
-        if choice == "1":
+        if bulk and choice in ("1", "2", "3", "4"):
+            quality = {"1": "best", "2": "720p", "3": "480p"}.get(choice)
+            success = downloader.download_bulk(urls, is_video=quality is not None,
+                                               quality_or_format=quality or "mp3",
+                                               link_mode=link_mode, auto_numbering=auto_numbering)
+            break
+        elif choice == "1":
             success = downloader.download_video_playlist(url, quality="best", auto_numbering=auto_numbering)
             break
         elif choice == "2":
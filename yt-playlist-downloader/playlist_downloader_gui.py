@@ -35,6 +35,8 @@ class PlaylistDownloaderGUI:
         self.download_type = tk.StringVar(value="video_best")
         self.output_template = tk.StringVar(value="%(playlist_index)s - %(title)s.%(ext)s")
         self.auto_numbering = tk.BooleanVar(value=True)
+        self.fragment_concurrency = tk.StringVar(value="auto")
+        self.playlist_workers = tk.StringVar(value="1")
         
         # Set default download folder
         self.download_folder.set(os.path.join(os.path.expanduser("~"), "Downloads", "YouTube_Downloads"))
@@ -110,6 +112,8 @@ class PlaylistDownloaderGUI:
         self.url_entry.grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 10))
         
         ttk.Button(url_frame, text="Get Info", command=self.get_playlist_info).grid(row=0, column=1)
+        ttk.Button(url_frame, text="🔄", width=3,
+                   command=lambda: self.get_playlist_info(refresh=True)).grid(row=0, column=2, padx=(5, 0))
         
         # Playlist info display
         self.info_label = ttk.Label(main_frame, text="", foreground="blue")
@@ -161,6 +165,28 @@ class PlaylistDownloaderGUI:
                                                       command=self.on_auto_numbering_change)
         self.auto_numbering_checkbox.pack(anchor=tk.W)
         
+        # Concurrent fragments for segmented (DASH/HLS) formats
+        fragment_frame = ttk.Frame(auto_numbering_frame)
+        fragment_frame.pack(anchor=tk.W, pady=(5, 0))
+        ttk.Label(fragment_frame, text="⚡ Concurrent Fragments:").pack(side=tk.LEFT)
+        self.fragment_combobox = ttk.Combobox(fragment_frame, textvariable=self.fragment_concurrency,
+                                              values=["auto", "1", "2", "4", "8", "16"],
+                                              state="readonly", width=6)
+        self.fragment_combobox.pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Label(fragment_frame, text="(auto = tuned from download speed)",
+                  font=("Arial", 8), foreground="gray").pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Concurrent yt-dlp processes, each downloading a shard of the playlist
+        workers_frame = ttk.Frame(auto_numbering_frame)
+        workers_frame.pack(anchor=tk.W, pady=(5, 0))
+        ttk.Label(workers_frame, text="🧵 Parallel Downloads:").pack(side=tk.LEFT)
+        self.workers_combobox = ttk.Combobox(workers_frame, textvariable=self.playlist_workers,
+                                             values=["1", "2", "3", "4", "6", "8"],
+                                             state="readonly", width=6)
+        self.workers_combobox.pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Label(workers_frame, text="(1 = one item at a time)",
+                  font=("Arial", 8), foreground="gray").pack(side=tk.LEFT, padx=(5, 0))
+        
         # Download button
         self.download_btn = ttk.Button(main_frame, text="🚀 Start Download", 
                                      command=self.start_download, style="Accent.TButton")
@@ -287,8 +313,8 @@ class PlaylistDownloaderGUI:
                 new_template = "%(title)s.%(ext)s"
             self.output_template.set(new_template)
     
-    def get_playlist_info(self):
-        """Get playlist information in a separate thread"""
+    def get_playlist_info(self, refresh=False):
+        """Get playlist information in a separate thread (refresh = ignore the cached listing)"""
         url = self.playlist_url.get().strip()
         if not url:
             messagebox.showwarning("Warning", "Please enter a playlist URL first!")
@@ -299,13 +325,21 @@ class PlaylistDownloaderGUI:
             self.progress.grid()  # Show the general progress bar
             self.progress.start()
             
-            info = self.downloader.get_playlist_info(url)
+            def on_entry(entry, count):
+                # Entries arrive while yt-dlp is still listing big playlists/channels
+                if count == 1 or count % 25 == 0:
+                    text = f"📥 Listing playlist... {count} videos so far"
+                    self.root.after(0, lambda: self.info_label.config(text=text))
+            
+            info = self.downloader.get_playlist_info(url, on_entry=on_entry, refresh=refresh)
             
             self.progress.stop()
             self.progress.grid_remove()  # Hide again
             
             if info:
                 info_text = f"📊 Found {info['total_videos']} videos in playlist"
+                if not info.get('complete', True):
+                    info_text += " (list incomplete, see log)"
                 self.root.after(0, lambda: self.info_label.config(text=info_text))
                 self.log_output(f"✅ {info_text}")
             else:
@@ -355,6 +389,10 @@ class PlaylistDownloaderGUI:
             auto_numbering = self.auto_numbering.get()
             
             self.log_output(f"Auto Numbering: {'Enabled' if auto_numbering else 'Disabled'}")
+            self.log_output(f"Concurrent Fragments: {self.fragment_concurrency.get()}")
+            self.downloader.set_fragment_concurrency(self.fragment_concurrency.get())
+            self.log_output(f"Parallel Downloads: {self.playlist_workers.get()}")
+            self.downloader.set_playlist_workers(self.playlist_workers.get())
             
             try:
                 if download_type == "video_best":
@@ -39,6 +39,8 @@ class PlaylistDownloaderGUI:
         self.embed_thumbnail = True  # NEW: Optional thumbnail embedding
         self.embed_metadata = True   # NEW: Optional metadata embedding
         self.continue_on_error = True  # NEW: Continue download if error occurs
+        self.fragment_concurrency = "auto"  # Parallel DASH/HLS fragments (auto-tuned)
+        self.playlist_workers = "1"  # Concurrent yt-dlp processes (playlist shards)
         
         # UI Components
         self.folder_field = None
@@ -143,8 +145,14 @@ class PlaylistDownloaderGUI:
             style=ft.ButtonStyle(bgcolor=ft.Colors.BLUE_100)
         )
         
+        refresh_info_btn = ft.IconButton(
+            icon=ft.Icons.REFRESH,
+            tooltip="List the playlist again (Get Info reuses the last listing for a while)",
+            on_click=self.refresh_playlist_info
+        )
+        
         url_section = ft.Container(
-            content=ft.Row([self.url_field, self.get_info_btn]),
+            content=ft.Row([self.url_field, self.get_info_btn, refresh_info_btn]),
             padding=ft.padding.only(bottom=5)
         )
         main_content.controls.append(url_section)
@@ -297,6 +305,40 @@ class PlaylistDownloaderGUI:
             tooltip="Adds metadata to downloaded files. Disable if you have slow internet."
         )
         
+        # Concurrent fragments dropdown
+        fragment_dropdown = ft.Dropdown(
+            label="⚡ Concurrent Fragments (DASH/HLS)",
+            width=300,
+            options=[
+                ft.dropdown.Option("auto", "Auto (tuned from speed)"),
+                ft.dropdown.Option("1", "1 (sequential)"),
+                ft.dropdown.Option("2", "2"),
+                ft.dropdown.Option("4", "4"),
+                ft.dropdown.Option("8", "8"),
+                ft.dropdown.Option("16", "16"),
+            ],
+            value=self.fragment_concurrency,
+            on_change=self.on_fragment_concurrency_change,
+            tooltip="Download several fragments of a segmented format at once. Auto ramps up until speed stops improving."
+        )
+        
+        # Parallel playlist downloads dropdown
+        workers_dropdown = ft.Dropdown(
+            label="🧵 Parallel Downloads",
+            width=300,
+            options=[
+                ft.dropdown.Option("1", "1 (one item at a time)"),
+                ft.dropdown.Option("2", "2"),
+                ft.dropdown.Option("3", "3"),
+                ft.dropdown.Option("4", "4"),
+                ft.dropdown.Option("6", "6"),
+                ft.dropdown.Option("8", "8"),
+            ],
+            value=self.playlist_workers,
+            on_change=self.on_playlist_workers_change,
+            tooltip="Split the playlist into shards downloaded by several yt-dlp processes at once. Numbering stays the same."
+        )
+        
         # Help Text
         help_text = ft.Text(
             "Template variables: %(playlist_index)s (number), %(title)s (title), %(ext)s (extension)",
@@ -317,6 +359,8 @@ class PlaylistDownloaderGUI:
                 ft.Text("🎨 Quality & Metadata Options:", size=12, weight=ft.FontWeight.BOLD),
                 embed_thumbnail_checkbox,
                 embed_metadata_checkbox,
+                fragment_dropdown,
+                workers_dropdown,
                 ft.Text("💡 Tip: Disable thumbnail & metadata for faster downloads on slow internet", 
                        size=10, color=ft.Colors.BLUE_600, italic=True),
                 help_text
@@ -449,7 +493,11 @@ class PlaylistDownloaderGUI:
         self.info_text.value = ""
         self.page.update()
     
-    def get_playlist_info(self, e):
+    def refresh_playlist_info(self, e):
+        """Get playlist information without the cached snapshot"""
+        self.get_playlist_info(e, refresh=True)
+    
+    def get_playlist_info(self, e, refresh=False):
         """Get playlist information in a separate thread"""
         url = self.url_field.value.strip() if self.url_field.value else ""
         if not url:
@@ -462,7 +510,14 @@ class PlaylistDownloaderGUI:
             self.get_info_btn.text = "Getting Info..."
             self.page.update()
             
-            info = self.downloader.get_playlist_info(url)
+            def on_entry(entry, count):
+                # Entries arrive while yt-dlp is still listing big playlists/channels
+                if count == 1 or count % 25 == 0:
+                    self.info_text.value = f"📥 Listing playlist... {count} videos so far"
+                    self.info_text.color = ft.Colors.BLUE_600
+                    self.page.update()
+            
+            info = self.downloader.get_playlist_info(url, on_entry=on_entry, refresh=refresh)
             
             self.get_info_btn.disabled = False
             self.get_info_btn.text = "Get Info"
@@ -470,6 +525,8 @@ class PlaylistDownloaderGUI:
             if info:
                 self.playlist_info = info
                 info_text = f"📊 Found {info['total_videos']} videos in playlist"
+                if not info.get('complete', True):
+                    info_text += " (list incomplete, see log)"
                 self.info_text.value = info_text
                 self.info_text.color = ft.Colors.GREEN_600
                 self.log_output(f"✅ {info_text}")
@@ -499,6 +556,14 @@ class PlaylistDownloaderGUI:
         """Handle continue on error checkbox change"""
         self.continue_on_error = e.control.value
     
+    def on_fragment_concurrency_change(self, e):
+        """Handle concurrent fragments dropdown change"""
+        self.fragment_concurrency = e.control.value
+    
+    def on_playlist_workers_change(self, e):
+        """Handle parallel downloads dropdown change"""
+        self.playlist_workers = e.control.value
+    
     def on_embed_thumbnail_change(self, e):
         """Handle embed thumbnail checkbox change"""
         self.embed_thumbnail = e.control.value
@@ -575,6 +640,8 @@ class PlaylistDownloaderGUI:
             self.log_output(f"Continue on Error: {'Enabled (skip failed items)' if self.continue_on_error else 'Disabled (stop on error)'}")
             self.log_output(f"Embed Thumbnail: {'Enabled' if self.embed_thumbnail else 'Disabled'}")
             self.log_output(f"Embed Metadata: {'Enabled' if self.embed_metadata else 'Disabled'}")
+            self.log_output(f"Concurrent Fragments: {self.fragment_concurrency}")
+            self.log_output(f"Parallel Downloads: {self.playlist_workers}")
             self.log_output("="*60)
             
             # Disable UI elements
@@ -591,6 +658,8 @@ class PlaylistDownloaderGUI:
             continue_on_error = self.continue_on_error
             embed_thumbnail = self.embed_thumbnail
             embed_metadata = self.embed_metadata
+            self.downloader.set_fragment_concurrency(self.fragment_concurrency)
+            self.downloader.set_playlist_workers(self.playlist_workers)
             
             try:
                 if download_type == "video_best":
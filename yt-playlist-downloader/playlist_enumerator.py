@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Playlist Enumerator
+Membaca entry playlist/channel dari `yt-dlp --dump-json --flat-playlist`
+baris per baris selama proses masih berjalan, jadi UI dan download bisa
+mulai dari entry pertama. Tidak ada timeout total: proses hanya dihentikan
+kalau tidak ada output sama sekali selama inactivity timeout.
+"""
+
+import json
+import queue
+import subprocess
+import threading
+from collections import deque
+from typing import Optional, Dict, Any, List, Iterator
+
+# Seconds without any yt-dlp output before the enumeration is given up
+DEFAULT_INACTIVITY_TIMEOUT = 60
+
+
+class PlaylistEnumerator:
+    """
+    Iterable over the flat entries of one yt-dlp run
+
+    After the iteration, complete tells whether yt-dlp finished normally and
+    error holds the reason if it did not (entries yielded before stay valid).
+    Breaking out of the loop stops the yt-dlp process.
+    """
+
+    def __init__(self, cmd: List[str], inactivity_timeout: float = DEFAULT_INACTIVITY_TIMEOUT):
+        """
+        Args:
+            cmd: Complete yt-dlp command line (printing one JSON object per line)
+            inactivity_timeout: Seconds without stdout/stderr output before giving up
+        """
+        self.cmd = cmd
+        self.inactivity_timeout = inactivity_timeout
+        self.complete = False
+        self.error: Optional[str] = None
+        self.count = 0
+        self._process = None
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self._process = subprocess.Popen(self.cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                         text=True, encoding='utf-8', errors='replace')
+        lines = queue.Queue()
+        stderr_tail = deque(maxlen=20)
+
+        def read(stream, name):
+            for line in stream:
+                lines.put((name, line))
+            lines.put((name, None))
+
+        readers = [threading.Thread(target=read, args=(self._process.stdout, 'stdout'), daemon=True),
+                   threading.Thread(target=read, args=(self._process.stderr, 'stderr'), daemon=True)]
+        for reader in readers:
+            reader.start()
+
+        try:
+            open_streams = 2
+            while open_streams:
+                try:
+                    # stderr lines (retries, warnings) count as activity too
+                    name, line = lines.get(timeout=self.inactivity_timeout)
+                except queue.Empty:
+                    self.error = f"tidak ada output dari yt-dlp selama {self.inactivity_timeout:.0f} detik"
+                    return
+                if line is None:
+                    open_streams -= 1
+                    continue
+                if name == 'stderr':
+                    stderr_tail.append(line.rstrip())
+                    continue
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.count += 1
+                yield entry
+
+            returncode = self._process.wait()
+            if returncode == 0:
+                self.complete = True
+            else:
+                errors = [line for line in stderr_tail if 'ERROR' in line]
+                self.error = "\n".join(errors) or f"yt-dlp exit code {returncode}"
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop the yt-dlp process (no-op once it has exited)"""
+        process = self._process
+        if process is not None and process.poll() is None:
+            process.kill()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                pass
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Playlist Manifest
+Catatan per folder download: entry playlist (ID video) -> file hasilnya,
+direkam saat download lewat --print-to-file after_move. Verifikasi cukup
+membandingkan daftar entry playlist dengan manifest untuk tahu persis ID
+mana yang belum ada, tanpa menghitung file berdasarkan ekstensi.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable
+
+# Default manifest file name inside a download folder
+MANIFEST_FILENAME = ".playlist_manifest.jsonl"
+
+# yt-dlp --print-to-file template: one tab-separated line per finished entry
+RECORD_TEMPLATE = "after_move:%(playlist_id)s\t%(playlist_index)s\t%(id)s\t%(filepath)s"
+
+
+def format_playlist_items(indices: Iterable[int]) -> str:
+    """--playlist-items value for a set of 1-based indices, runs collapsed (1-3,7,9-10)"""
+    ranges = []
+    for index in sorted(set(indices)):
+        if ranges and index == ranges[-1][1] + 1:
+            ranges[-1][1] = index
+        else:
+            ranges.append([index, index])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+
+
+def split_shards(indices: List[int], count: int) -> List[List[int]]:
+    """Split indices (in playlist order) into at most count contiguous shards of equal size"""
+    if not indices:
+        return []
+    size = -(-len(indices) // max(1, count))
+    return [indices[start:start + size] for start in range(0, len(indices), size)]
+
+
+def entry_index(entry: Dict[str, Any], position: int) -> int:
+    """Playlist index of a flat entry (yt-dlp's playlist_index, else its position)"""
+    try:
+        return int(entry.get('playlist_index') or position)
+    except (TypeError, ValueError):
+        return position
+
+
+class PlaylistManifest:
+    """
+    Append-only record of downloaded playlist entries (thread-safe, last record wins)
+
+    Every record is also reachable by its video id alone: a single video URL has
+    no playlist id (yt-dlp prints NA), and the id a flat listing reports is not
+    always the one printed at download time.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        # playlist id ('' without one) -> video id -> record
+        self._playlists: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # video id -> last record of any playlist
+        self._videos: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _add(self, record: Dict[str, Any]):
+        self._playlists.setdefault(record['playlist_id'], {})[record['id']] = record
+        self._videos[record['id']] = record
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn last line after a crash
+                    continue
+                if record.get('id'):
+                    record['playlist_id'] = record.get('playlist_id') or ''
+                    self._add(record)
+
+    def record(self, playlist_id: Optional[str], video_id: str, index: Optional[int],
+               path: Optional[str], fmt: str = ""):
+        """Store the output file of one playlist entry (playlist_id '' for a single video)"""
+        record = {'playlist_id': playlist_id or '', 'id': video_id, 'index': index,
+                  'path': path, 'format': fmt, 'ts': time.time()}
+        with self._lock:
+            self._add(record)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def import_records(self, record_file, fmt: str = "") -> int:
+        """
+        Record the lines yt-dlp printed with RECORD_TEMPLATE
+
+        Returns:
+            Number of entries recorded
+        """
+        count = 0
+        with open(record_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.rstrip('\n').split('\t')
+                if len(parts) != 4 or parts[2] in ('', 'NA'):
+                    continue
+                try:
+                    index = int(parts[1])
+                except ValueError:
+                    index = None
+                # A single video URL has no playlist id, it is found by video id
+                playlist_id = '' if parts[0] == 'NA' else parts[0]
+                self.record(playlist_id, parts[2], index, parts[3], fmt)
+                count += 1
+        return count
+
+    def _records(self, playlist_id: str, video_id: str) -> List[Dict[str, Any]]:
+        """The playlist's own record of a video first, then its last record anywhere"""
+        with self._lock:
+            records = [self._playlists.get(playlist_id or '', {}).get(video_id),
+                       self._videos.get(video_id)]
+        return [dict(record) for record in records if record]
+
+    def get(self, playlist_id: str, video_id: str) -> Optional[Dict[str, Any]]:
+        records = self._records(playlist_id, video_id)
+        return records[0] if records else None
+
+    def entries(self, playlist_id: str) -> Dict[str, Dict[str, Any]]:
+        """Video id -> record of every entry recorded for a playlist"""
+        with self._lock:
+            return {video_id: dict(record)
+                    for video_id, record in self._playlists.get(playlist_id, {}).items()}
+
+    def has_file(self, playlist_id: str, video_id: str, fmt: str = "") -> bool:
+        """Whether an entry was downloaded in this format and its file still exists"""
+        return any(record.get('format', '') == fmt and record.get('path')
+                   and os.path.exists(record['path'])
+                   for record in self._records(playlist_id, video_id))
+
+    def missing(self, playlist_id: str, entries: List[Dict[str, Any]],
+                fmt: str = "") -> List[Dict[str, Any]]:
+        """
+        Diff a playlist's flat entries against the manifest
+
+        Returns:
+            The entries (with 'index' set) that have no existing file in this format
+        """
+        result = []
+        for position, entry in enumerate(entries, 1):
+            video_id = entry.get('id')
+            if not video_id or self.has_file(playlist_id, video_id, fmt):
+                continue
+            result.append({**entry, 'index': entry_index(entry, position)})
+        return result
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Playlist Retry Tracker
+Status retry per entry playlist: berapa kali gagal, kapan boleh dicoba lagi
+(exponential backoff + jitter per item) dan apakah sudah menyerah karena
+error permanen atau batas percobaan habis.
+"""
+
+import time
+from typing import Optional, Dict, Any, List, Iterable
+
+from failure_classifier import backoff_delay, is_permanent
+
+# Default spread of a retry delay (+/- 25%)
+DEFAULT_JITTER = 0.25
+
+
+class RetryTracker:
+    """Per-entry failure count and next attempt time (keys are video ids)"""
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 3.0,
+                 max_delay: float = 300.0, jitter: float = DEFAULT_JITTER):
+        """
+        Args:
+            max_retries: Retries per entry after its first failure
+            base_delay: Delay before the first retry of an entry (doubles per retry)
+            max_delay: Upper bound of a single delay
+            jitter: Random spread of every delay (fraction)
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        # video id -> {'failures', 'next_at', 'failure', 'gave_up'}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    def failed(self, video_id: str, failure: Optional[Dict[str, str]] = None):
+        """Record a failed attempt; permanent failures are not retried"""
+        state = self._entries.setdefault(video_id, {'failures': 0, 'next_at': 0.0,
+                                                    'failure': None, 'gave_up': False})
+        state['failures'] += 1
+        state['failure'] = failure
+        # The first failure is the initial pass, every later one used up a retry
+        if is_permanent(failure) or state['failures'] > self.max_retries:
+            state['gave_up'] = True
+            return
+        state['next_at'] = time.monotonic() + backoff_delay(
+            state['failures'], self.base_delay, self.max_delay, self.jitter)
+
+    def succeeded(self, video_id: str):
+        self._entries.pop(video_id, None)
+
+    def retries(self, video_id: str) -> int:
+        """Retries already spent on an entry"""
+        state = self._entries.get(video_id)
+        return max(0, state['failures'] - 1) if state else 0
+
+    def pending(self, video_ids: Iterable[str]) -> List[str]:
+        """The ids that will still be retried"""
+        return [video_id for video_id in video_ids
+                if video_id in self._entries and not self._entries[video_id]['gave_up']]
+
+    def due(self, video_ids: Iterable[str], window: float = 0.0) -> List[str]:
+        """
+        The pending ids whose backoff has passed
+
+        Ids that become due within window seconds are included too, so one
+        retry run can take several items instead of one run per item.
+        """
+        limit = time.monotonic() + window
+        return [video_id for video_id in self.pending(video_ids)
+                if self._entries[video_id]['next_at'] <= limit]
+
+    def wait_time(self, video_ids: Iterable[str]) -> float:
+        """Seconds until the first pending id is due (0 if one is due already)"""
+        times = [self._entries[video_id]['next_at'] for video_id in self.pending(video_ids)]
+        if not times:
+            return 0.0
+        return max(0.0, min(times) - time.monotonic())
+
+    def gave_up(self) -> List[str]:
+        """Ids that are not retried any more (permanent error or no retries left)"""
+        return [video_id for video_id, state in self._entries.items() if state['gave_up']]
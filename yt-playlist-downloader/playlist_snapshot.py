@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Playlist Snapshot Cache
+Hasil enumerasi flat sebuah playlist disimpan di memori (per proses) dan
+dipakai ulang oleh Get Info, download (sharded) dan verifikasi, jadi satu
+siklus info -> download -> verify cukup sekali enumerasi selama snapshot
+masih segar.
+"""
+
+import threading
+import time
+from typing import Optional, Dict, Any
+from urllib.parse import urlparse, parse_qs
+
+# Default freshness window of a snapshot (seconds)
+DEFAULT_SNAPSHOT_TTL = 15 * 60
+
+
+def snapshot_key(playlist_url: str) -> str:
+    """Cache key of a playlist URL: its list= id, else the URL without scheme/www"""
+    parsed = urlparse(playlist_url.strip())
+    values = parse_qs(parsed.query).get('list')
+    if values:
+        return f"playlist:{values[0]}"
+    host = parsed.netloc.lower()
+    if host.startswith('www.') or host.startswith('m.'):
+        host = host.split('.', 1)[1]
+    return f"url:{host}{parsed.path.rstrip('/')}"
+
+
+class PlaylistSnapshotCache:
+    """Process-wide, thread-safe store of complete flat playlist listings"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> (stored at, playlist info)
+        self._snapshots: Dict[str, tuple] = {}
+
+    def get(self, playlist_url: str, max_age: float = DEFAULT_SNAPSHOT_TTL) -> Optional[Dict[str, Any]]:
+        """Snapshot of a playlist if one is younger than max_age seconds"""
+        with self._lock:
+            item = self._snapshots.get(snapshot_key(playlist_url))
+        if item is None or time.time() - item[0] > max_age:
+            return None
+        return item[1]
+
+    def age(self, playlist_url: str) -> Optional[float]:
+        """Seconds since the snapshot of a playlist was taken (None = no snapshot)"""
+        with self._lock:
+            item = self._snapshots.get(snapshot_key(playlist_url))
+        return time.time() - item[0] if item else None
+
+    def put(self, playlist_url: str, info: Dict[str, Any]):
+        """Store a listing (under the URL and, if known, the playlist id)"""
+        item = (time.time(), info)
+        with self._lock:
+            self._snapshots[snapshot_key(playlist_url)] = item
+            if info.get('playlist_id'):
+                self._snapshots[f"playlist:{info['playlist_id']}"] = item
+
+    def invalidate(self, playlist_url: Optional[str] = None):
+        """Drop the snapshot of one playlist, or every snapshot"""
+        with self._lock:
+            if playlist_url is None:
+                self._snapshots.clear()
+                return
+            item = self._snapshots.pop(snapshot_key(playlist_url), None)
+            if item and item[1].get('playlist_id'):
+                self._snapshots.pop(f"playlist:{item[1]['playlist_id']}", None)
+
+
+# Shared by every PlaylistDownloader (and its shard jobs) of the process
+snapshots = PlaylistSnapshotCache()
@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+# The modules are imported the way the tools import them: this folder and the
+# shared helpers of yt-batch-downloader on sys.path
+TOOL_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(TOOL_DIR.parent / "yt-batch-downloader"))
+sys.path.insert(0, str(TOOL_DIR))
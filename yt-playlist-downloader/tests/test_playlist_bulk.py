@@ -0,0 +1,54 @@
+import os
+
+from playlist_bulk import (HARDLINK, dedupe_playlists, link_file, link_name,
+                           playlist_folder_name, safe_name, write_m3u8)
+
+
+def test_dedupe_playlists_first_playlist_owns_video():
+    listings = [
+        {'entries': [{'id': 'a'}, {'id': 'b'}, {'id': None}]},
+        {'entries': [{'id': 'b'}, {'id': 'c'}]},
+        {'entries': [{'id': 'c'}, {'id': 'a'}, {'id': 'd'}]},
+    ]
+    result = dedupe_playlists(listings)
+    assert result['owners'] == {'a': 0, 'b': 0, 'c': 1, 'd': 2}
+    assert result['total'] == 7
+    assert result['duplicates'] == 3
+
+
+def test_link_name_uses_this_playlists_index():
+    entry = {'id': 'abc', 'index': 7, 'title': 'A/B: "live"'}
+    assert link_name(entry, "/x/03 - other.mp4", 3) == '007 - A_B_ _live_.mp4'
+    assert link_name(entry, "/x/other.mp4", 3, auto_numbering=False) == 'A_B_ _live_.mp4'
+    assert link_name({'id': 'abc', 'index': 2, 'title': ''}, "v.webm", 1) == '2 - abc.webm'
+
+
+def test_folder_name_falls_back_to_id_then_position():
+    assert playlist_folder_name({'title': 'Mix?'}, 1) == 'Mix_'
+    assert playlist_folder_name({'title': '...', 'playlist_id': 'PL1'}, 1) == 'PL1'
+    assert playlist_folder_name({}, 3) == 'playlist_3'
+    assert safe_name(None) == ''
+
+
+def test_link_file_hardlinks(tmp_path):
+    source = tmp_path / "a.mp4"
+    source.write_bytes(b"x")
+    target = tmp_path / "other" / "a.mp4"
+    target.parent.mkdir()
+    assert link_file(str(source), str(target), HARDLINK) == HARDLINK
+    assert os.path.samefile(source, target)
+
+
+def test_write_m3u8_relative_paths(tmp_path):
+    (tmp_path / "own").mkdir()
+    playlist = tmp_path / "own" / "list.m3u8"
+    write_m3u8(str(playlist), [
+        {'id': 'a', 'title': 'First', 'duration': 61.5, 'path': str(tmp_path / "other" / "a.mp4")},
+        {'id': 'b', 'path': str(tmp_path / "own" / "b.mp4")},
+    ])
+    assert playlist.read_text(encoding='utf-8') == (
+        "#EXTM3U\n"
+        "#EXTINF:61,First\n"
+        "../other/a.mp4\n"
+        "#EXTINF:-1,b\n"
+        "b.mp4\n")
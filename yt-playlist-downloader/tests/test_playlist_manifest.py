@@ -0,0 +1,68 @@
+from playlist_manifest import PlaylistManifest, entry_index, format_playlist_items, split_shards
+
+
+def test_format_playlist_items_collapses_runs():
+    assert format_playlist_items([9, 1, 2, 3, 7, 10, 2]) == "1-3,7,9-10"
+    assert format_playlist_items([5]) == "5"
+    assert format_playlist_items([]) == ""
+
+
+def test_entry_index_falls_back_to_position():
+    assert entry_index({'playlist_index': 12}, 3) == 12
+    assert entry_index({'playlist_index': None}, 3) == 3
+    assert entry_index({'playlist_index': 'NA'}, 3) == 3
+
+
+def make_file(folder, name):
+    path = folder / name
+    path.write_bytes(b"x")
+    return str(path)
+
+
+def test_missing_diffs_entries_against_existing_files(tmp_path):
+    manifest = PlaylistManifest(tmp_path / "manifest.jsonl")
+    manifest.record("PL1", "a", 1, make_file(tmp_path, "a.mp4"), "video:best")
+    manifest.record("PL1", "b", 2, str(tmp_path / "deleted.mp4"), "video:best")
+    manifest.record("PL1", "c", 3, make_file(tmp_path, "c.mp3"), "audio:mp3")
+    entries = [{'id': 'a'}, {'id': 'b'}, {'id': 'c'}, {'id': 'd', 'playlist_index': 7}]
+
+    missing = manifest.missing("PL1", entries, "video:best")
+
+    assert [(entry['id'], entry['index']) for entry in missing] == [('b', 2), ('c', 3), ('d', 7)]
+
+
+def test_records_survive_reload(tmp_path):
+    path = tmp_path / "manifest.jsonl"
+    PlaylistManifest(path).record("PL1", "a", 1, make_file(tmp_path, "a.mp4"), "video:best")
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"playlist_id": "PL1", "id": "torn')
+
+    assert PlaylistManifest(path).has_file("PL1", "a", "video:best")
+
+
+def test_import_records_keeps_single_videos(tmp_path):
+    record_file = tmp_path / "printed.txt"
+    record_file.write_text(
+        f"PL1\t1\ta\t{make_file(tmp_path, 'a.mp4')}\n"
+        f"NA\tNA\tsingle\t{make_file(tmp_path, 'single.mp4')}\n"
+        "NA\tNA\tNA\tNA\n", encoding='utf-8')
+    manifest = PlaylistManifest(tmp_path / "manifest.jsonl")
+
+    assert manifest.import_records(record_file, "video:best") == 2
+    # A single video URL is listed without a playlist id
+    assert manifest.missing("", [{'id': 'single'}], "video:best") == []
+
+
+def test_entry_found_under_other_playlist_id(tmp_path):
+    manifest = PlaylistManifest(tmp_path / "manifest.jsonl")
+    # Printed at download time with the uploads playlist id of a channel URL
+    manifest.record("UUxyz", "a", 1, make_file(tmp_path, "a.mp4"), "video:best")
+
+    assert manifest.missing("UCxyz", [{'id': 'a'}, {'id': 'b'}], "video:best") == [{'id': 'b', 'index': 2}]
+    assert manifest.get("UCxyz", "a")['playlist_id'] == "UUxyz"
+
+
+def test_split_shards_one_contiguous_shard_per_worker():
+    assert split_shards(list(range(1, 11)), 4) == [[1, 2, 3], [4, 5, 6], [7, 8, 9], [10]]
+    assert split_shards([3, 8], 4) == [[3], [8]]
+    assert split_shards([], 4) == []
@@ -0,0 +1,63 @@
+import pytest
+
+import playlist_retry
+from failure_classifier import PERMANENT, TRANSIENT
+from playlist_retry import RetryTracker
+
+NETWORK = {'category': TRANSIENT, 'reason': 'network'}
+PRIVATE = {'category': PERMANENT, 'reason': 'private'}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(playlist_retry.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_backoff_doubles_per_failure(clock):
+    tracker = RetryTracker(max_retries=3, base_delay=2, jitter=0)
+    tracker.failed('a', NETWORK)
+    assert tracker.wait_time(['a']) == 2
+    tracker.failed('a', NETWORK)
+    assert tracker.wait_time(['a']) == 4
+    assert tracker.retries('a') == 1
+
+
+def test_due_with_window(clock):
+    tracker = RetryTracker(base_delay=2, jitter=0)
+    tracker.failed('a', NETWORK)
+    tracker.failed('b', NETWORK)
+    tracker.failed('b', NETWORK)
+    assert tracker.due(['a', 'b', 'c']) == []
+    assert tracker.due(['a', 'b', 'c'], window=2) == ['a']
+    clock[0] += 4
+    assert tracker.due(['a', 'b', 'c']) == ['a', 'b']
+    assert tracker.wait_time(['a', 'b']) == 0
+
+
+def test_permanent_failures_are_not_retried(clock):
+    tracker = RetryTracker()
+    tracker.failed('a', PRIVATE)
+    assert tracker.pending(['a']) == []
+    assert tracker.gave_up() == ['a']
+
+
+def test_gives_up_after_max_retries(clock):
+    tracker = RetryTracker(max_retries=2, jitter=0)
+    # The first failure is the initial pass, then two retries
+    for _ in range(2):
+        tracker.failed('a', NETWORK)
+    assert tracker.pending(['a']) == ['a']
+    tracker.failed('a', NETWORK)
+    assert tracker.pending(['a']) == []
+    assert tracker.gave_up() == ['a']
+
+
+def test_success_forgets_entry(clock):
+    tracker = RetryTracker()
+    tracker.failed('a', NETWORK)
+    tracker.succeeded('a')
+    assert tracker.pending(['a']) == []
+    assert tracker.retries('a') == 0
+    assert tracker.wait_time(['a']) == 0
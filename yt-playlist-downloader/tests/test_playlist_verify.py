@@ -0,0 +1,44 @@
+from playlist_downloader import PlaylistDownloader
+
+PLAYLIST_URL = "https://www.youtube.com/playlist?list=PL1"
+
+
+def make_downloader(tmp_path, monkeypatch, entries):
+    downloader = PlaylistDownloader(use_archive=True)
+    downloader.set_download_folder(str(tmp_path))
+    downloader.retry_backoff = 0
+    info = {'total_videos': len(entries), 'entries': entries, 'playlist_id': "PL1", 'complete': True}
+    monkeypatch.setattr(downloader, 'get_playlist_info', lambda url: info)
+    runs = []
+    monkeypatch.setattr(downloader, 'download_video_playlist',
+                        lambda *args, **kwargs: runs.append(kwargs['playlist_items']))
+    return downloader, runs
+
+
+def verify(downloader):
+    return downloader._verify_and_retry_playlist(PLAYLIST_URL, "best", "%(title)s.%(ext)s", True,
+                                                 False, False, None, is_video=True)
+
+
+def test_archived_permanent_failure_is_not_retried(tmp_path, monkeypatch, capsys):
+    entries = [{'id': 'ok', 'playlist_index': 1}, {'id': 'gone', 'playlist_index': 2}]
+    downloader, runs = make_downloader(tmp_path, monkeypatch, entries)
+    video = tmp_path / "ok.mp4"
+    video.write_bytes(b"x")
+    downloader.manifest.record("PL1", "ok", 1, str(video), "video:best")
+    downloader.archive.record_failure("youtube", "gone", "permanent", "private", "Private video")
+
+    assert verify(downloader) is False
+    assert runs == []
+    out = capsys.readouterr().out
+    assert "gone: permanen: video private" in out
+    assert "retries)" not in out
+    downloader.archive.close()
+
+
+def test_transient_miss_is_retried(tmp_path, monkeypatch):
+    downloader, runs = make_downloader(tmp_path, monkeypatch, [{'id': 'slow', 'playlist_index': 4}])
+
+    assert verify(downloader) is False
+    assert runs == ["4", "4", "4"]
+    downloader.archive.close()